@@ -62,6 +62,8 @@ class WebSocketGameEngine:
         self.controller = None
         self.loop = None
         self.websocket_thread = None
+        self._last_broadcast_state = None
+        self.skipped_updates = 0
         
     def setup_pygame(self):
         """ヘッドレスPygameゲームエンジンのセットアップ（表示なし）"""
@@ -229,10 +231,16 @@ class WebSocketGameEngine:
     def notify_events_to_websocket(self):
         """ゲームイベントをWebSocketに通知"""
         if self.websocket_server and self.loop:
+            state = self.get_state()
+            # 前回送信時から状態が変わっていなければ送信をスキップ（一時停止中など）
+            if state == self._last_broadcast_state:
+                self.skipped_updates += 1
+                return
+            self._last_broadcast_state = state
             try:
                 # 非同期メソッドを同期的に呼び出し
                 future = asyncio.run_coroutine_threadsafe(
-                    self.websocket_server.broadcast("game:update", self.get_state()),
+                    self.websocket_server.broadcast("game:update", state),
                     self.loop
                 )
                 # 非ブロッキングで実行（結果を待たない）
@@ -271,6 +279,7 @@ class WebSocketGameEngine:
             frame_count += 1
         
         logger.info(f"ヘッドレスゲームループ完了 - {frame_count} フレーム実行")
+        logger.info(f"状態未変更による通知スキップ: {self.skipped_updates} 回")
         
         # 統計情報表示
         stats = self.controller.get_game_statistics()
@@ -0,0 +1,108 @@
+"""
+Ultimate Squash Game - エントリーポイント共通の起動処理
+
+main.py / main_ai.py / main_pygame_backup.py で個別に書かれていた
+pygame初期化・画面作成・MVC組み立てを1か所にまとめる。
+MVCクラスは使う版（通常版 / AI強化版）の分だけ遅延importする。
+"""
+
+import importlib
+from typing import Any, NamedTuple, Sequence
+
+import pygame
+
+# コントローラーが処理するイベント（それ以外はSDL側で捨て、Pythonまで届けない）
+DEFAULT_ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN)
+
+# MVCクラスの所在（モジュール名, クラス名）。AI版のモジュールは非AIの起動では読み込まない
+_MVC_CLASSES = {
+    False: (
+        ('src.model.pygame_game_state', 'PygameGameState'),
+        ('src.view.pygame_game_view', 'PygameGameView'),
+        ('src.controller.pygame_game_controller', 'PygameGameController'),
+    ),
+    True: (
+        ('src.model.ai_enhanced_game_state', 'AIEnhancedGameState'),
+        ('src.view.ai_enhanced_view', 'AIEnhancedGameView'),
+        ('src.controller.ai_enhanced_controller', 'AIEnhancedController'),
+    ),
+}
+_SOUND_VIEW_CLASS = ('src.view.pygame_game_view', 'PygameSoundView')
+
+
+class GameComponents(NamedTuple):
+    """build_game()が組み立てたゲーム構成要素"""
+    screen: pygame.Surface
+    game_state: Any
+    game_view: Any
+    sound_view: Any
+    controller: Any
+
+
+def _load_class(module_name: str, class_name: str):
+    """モジュールを必要になった時点でimportし、クラスを取り出す"""
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def init_pygame(sound: bool = False):
+    """使うサブシステムだけ初期化（pygame.init()は未使用モジュールまで開く）"""
+    pygame.display.init()
+    pygame.font.init()
+    if sound:
+        try:
+            pygame.mixer.init(frequency=22050, size=-16, channels=1, buffer=512)
+        except pygame.error:
+            # 失敗時の扱いはPygameSoundViewに任せる（サウンドを無効化して続行）
+            pass
+
+
+def build_game(*, width: int, height: int, caption: str,
+               ai: bool = False, ai_enabled: bool = True,
+               sound: bool = True, fullscreen: bool = False,
+               target_fps: int = 60,
+               allowed_events: Sequence[int] = DEFAULT_ALLOWED_EVENTS) -> GameComponents:
+    """
+    pygameを初期化し、画面とMVCコンポーネントを組み立てる
+
+    Args:
+        width, height: int - 画面サイズ（fullscreen時はディスプレイの解像度を使う）
+        caption: str - ウィンドウタイトル
+        ai: bool - AI強化版のMVCクラスを使うか
+        ai_enabled: bool - AI強化コントローラーのAI機能を有効にするか（ai=True時のみ）
+        sound: bool - サウンドを有効にするか
+        fullscreen: bool - フルスクリーンで起動するか
+        target_fps: int - 目標FPS
+        allowed_events: Sequence[int] - SDLから受け取るイベント種別
+
+    Returns:
+        GameComponents - 画面とModel/View/SoundView/Controller
+    """
+    init_pygame(sound=sound)
+
+    if fullscreen:
+        # (0, 0)指定でデスクトップ解像度になるので、display.Info()での問い合わせは不要
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        width, height = screen.get_size()
+    else:
+        screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption(caption)
+
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(allowed_events))
+
+    state_class, view_class, controller_class = (
+        _load_class(module_name, class_name) for module_name, class_name in _MVC_CLASSES[ai]
+    )
+    sound_view_class = _load_class(*_SOUND_VIEW_CLASS)
+
+    # Model・Viewは画面と同じサイズで作る（Observer登録はControllerが行う）
+    game_state = state_class(screen_width=width, screen_height=height)
+    game_view = view_class(screen, width, height)
+    sound_view = sound_view_class(sound_enabled=sound)
+
+    controller_options = {'target_fps': target_fps}
+    if ai:
+        controller_options['ai_enabled'] = ai_enabled
+    controller = controller_class(game_state, game_view, sound_view, **controller_options)
+
+    return GameComponents(screen, game_state, game_view, sound_view, controller)
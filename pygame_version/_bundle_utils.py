@@ -0,0 +1,161 @@
+"""
+Ultimate Squash Game - 配布バンドル作成の共通処理
+
+create_production_bundle.py / create_optimized_production.py で個別に書かれていた
+gzip・Brotliの圧縮、tar.gzの作成、ビルドのタイムスタンプを1か所にまとめる。
+"""
+
+import functools
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    # brotliがない環境ではgzipの事前圧縮のみ作成
+    brotli = None
+
+try:
+    import zopfli.gzip
+except ImportError:
+    # zopfliがない環境では標準gzipの最高レベルで圧縮
+    zopfli = None
+
+# 並列gzip（pigz）のパス（インストールされていなければNone）
+PIGZ_PATH = shutil.which("pigz")
+
+# 辞書圧縮ファイル（.dcb）の先頭に付けるマジックナンバー
+_DCB_MAGIC = b'\xffDCB'
+
+
+def create_precompressed_variants(*file_paths: Path, dictionary: Optional[bytes] = None) -> dict:
+    """配信用の事前圧縮ファイル（.br / .gz）を作成し、ファイル名→サイズを返す
+
+    brotliの圧縮とpigzのサブプロセスはGILを解放するため、スレッドで並行して実行する。
+    dictionaryを指定すると、共有辞書で圧縮した.dcbも作成する。
+    """
+    variants = {}
+    if brotli is None:
+        print("   ⚠️ brotliがインストールされていないため.brは作成しません")
+
+    jobs = []
+    with ThreadPoolExecutor() as executor:
+        for file_path in file_paths:
+            data = file_path.read_bytes()
+
+            if brotli is not None:
+                # オフラインで1回だけ圧縮するため最高品質（展開速度は品質に依存しない）
+                br_path = file_path.with_name(file_path.name + ".br")
+                jobs.append((br_path, executor.submit(brotli.compress, data, quality=11, mode=brotli.MODE_TEXT)))
+
+            if dictionary is not None:
+                dcb_path = file_path.with_name(file_path.name + ".dcb")
+                jobs.append((dcb_path, executor.submit(compress_dictionary_brotli, data, dictionary)))
+
+            gz_path = file_path.with_name(file_path.name + ".gz")
+            jobs.append((gz_path, executor.submit(compress_gzip, data)))
+
+        for out_path, future in jobs:
+            out_path.write_bytes(future.result())
+            variants[out_path.name] = out_path.stat().st_size
+
+    return variants
+
+
+@functools.lru_cache(maxsize=None)
+def brotli_supports_dictionary() -> bool:
+    """インストールされているbrotliがカスタム辞書を指定できるかどうか"""
+    if brotli is None:
+        return False
+    try:
+        brotli.compress(b'', dictionary=b'')
+    except TypeError:
+        return False
+    return True
+
+
+def compress_dictionary_brotli(data: bytes, dictionary: bytes) -> bytes:
+    """共有辞書でBrotli圧縮し、dcb形式（マジックナンバー + 辞書のSHA-256 + 圧縮データ）で返す"""
+    compressed = brotli.compress(data, quality=11, mode=brotli.MODE_TEXT, dictionary=dictionary)
+    return _DCB_MAGIC + hashlib.sha256(dictionary).digest() + compressed
+
+
+def reproducible_tarinfo(arcname: str, size: int) -> tarfile.TarInfo:
+    """ビルド環境に依存しないメタデータのTarInfoを作成
+
+    更新時刻はSOURCE_DATE_EPOCH（未設定なら0）、所有者はuid/gid 0・名前なしに揃え、
+    同じ入力からは常に同じアーカイブになるようにする。
+    """
+    tar_info = tarfile.TarInfo(arcname)
+    tar_info.size = size
+    tar_info.mtime = source_date_epoch() or 0
+    tar_info.mode = 0o644
+    tar_info.uid = tar_info.gid = 0
+    tar_info.uname = tar_info.gname = ""
+    return tar_info
+
+
+def create_tar_gz(source_dir: Path, bundle_file: Path) -> None:
+    """ディレクトリ内のファイルをtar.gzにまとめる
+
+    shutil.make_archiveは標準gzipの既定レベルで圧縮するため、tarはメモリ上で作成し
+    compress_gzipで圧縮する（gzip互換なので展開側の変更は不要）。
+    ファイルはパス順に追加し、メタデータはreproducible_tarinfoで揃える。
+    """
+    raw = io.BytesIO()
+    with tarfile.open(fileobj=raw, mode='w') as tf:
+        for path in sorted(source_dir.rglob("*")):
+            if path == bundle_file or not path.is_file():
+                continue
+            data = path.read_bytes()
+            tf.addfile(reproducible_tarinfo(path.relative_to(source_dir).as_posix(), len(data)),
+                       io.BytesIO(data))
+    bundle_file.write_bytes(compress_gzip(raw.getvalue()))
+
+
+def compress_gzip(data: bytes) -> bytes:
+    """gzip形式で最大限に圧縮
+
+    pigzがあれば -11（zopfli相当）で複数コアを使って圧縮し、
+    なければzopfli、どちらもなければ標準gzipの最高レベルを使う。
+    """
+    if PIGZ_PATH is not None:
+        try:
+            return subprocess.run([PIGZ_PATH, '-11', '-n', '-c'], input=data,
+                                  stdout=subprocess.PIPE, check=True).stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"   ⚠️ pigzでの圧縮に失敗したため内蔵の圧縮を使用: {e}")
+    if zopfli is not None:
+        # エンコードは遅いがオフラインで1回だけ実行するため反復回数を増やす
+        return zopfli.gzip.compress(data, numiterations=50)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def source_date_epoch() -> Optional[int]:
+    """環境変数SOURCE_DATE_EPOCH（再現可能なビルドの基準時刻）を取得（未設定ならNone）"""
+    value = os.environ.get("SOURCE_DATE_EPOCH")
+    return int(value) if value else None
+
+
+@functools.lru_cache(maxsize=None)
+def get_timestamp() -> str:
+    """ビルドのタイムスタンプを取得
+
+    SOURCE_DATE_EPOCHが設定されていればその時刻（UTC）を使い、再現可能なビルドにする。
+    1回のビルド中は同じ値を返す。
+    """
+    epoch = source_date_epoch()
+    if epoch is not None:
+        build_time = datetime.fromtimestamp(epoch, timezone.utc)
+    else:
+        build_time = datetime.now()
+    return build_time.strftime("%Y-%m-%d %H:%M:%S")
@@ -4,7 +4,6 @@ Pyodide/WASM環境用のビルドスクリプト
 srcディレクトリのPythonファイルを結合してPyodide環境で実行できるようにする
 """
 
-import os
 import shutil
 import zipfile
 from pathlib import Path
@@ -18,25 +17,28 @@ def build_pyodide_bundle():
         shutil.rmtree(build_dir)
     build_dir.mkdir()
     
-    # srcディレクトリのコピー
+    # コピー対象（ビルド先の相対パス → ソースパス）を1回の走査で収集
     src_dir = Path("src")
+    bundle_files = {}
     if src_dir.exists():
-        shutil.copytree(src_dir, build_dir / "src")
+        for path in sorted(src_dir.rglob("*")):
+            if path.is_file() and "__pycache__" not in path.parts:
+                bundle_files[path.as_posix()] = path
     
-    # main.pyのコピー
-    shutil.copy("main.py", build_dir / "main.py")
+    # main.py / index.html
+    bundle_files["main.py"] = Path("main.py")
+    bundle_files["index.html"] = Path("index.html")
     
-    # index.htmlのコピー
-    shutil.copy("index.html", build_dir / "index.html")
-    
-    # ZIPファイルの作成（オプション）
-    with zipfile.ZipFile("ultimate_squash_pyodide.zip", "w") as zf:
-        for root, dirs, files in os.walk(build_dir):
-            for file in files:
-                if file.endswith(".py") or file.endswith(".html"):
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, build_dir)
-                    zf.write(file_path, arcname)
+    # ビルドディレクトリへのコピーとZIPへの書き込みを同時に行う
+    # （ビルドディレクトリを再走査せず、ソースから直接ZIPへストリーミング）
+    with zipfile.ZipFile("ultimate_squash_pyodide.zip", "w",
+                         compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for arcname, source in bundle_files.items():
+            target = build_dir / arcname
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+            if source.suffix in (".py", ".html"):
+                zf.write(source, arcname)
     
     print("ビルド完了:")
     print(f"- ビルドディレクトリ: {build_dir}")
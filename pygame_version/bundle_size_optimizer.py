@@ -9,16 +9,436 @@ Phase 3A: バンドルサイズ最適化
 4. HTML/JavaScript統合最適化
 5. 依存関係の最適化
 """
+import io
 import os
 import re
 import json
 import gzip
+import hashlib
+import math
+import operator
 import base64
-import shutil
-from typing import Dict, List, Tuple, Set
+import sys
+import tarfile
+import time
+import zipfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Set
 from pathlib import Path
 import ast
 import subprocess
+import tokenize
+import py_compile
+import importlib.util
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from _bundle_utils import reproducible_tarinfo, source_date_epoch
+
+try:
+    import brotli
+except ImportError:
+    # brotliがない環境ではtar.gzのみ作成
+    brotli = None
+
+
+# ZIP形式で表せる最も古い日時（1980-01-01 00:00:00 UTC）
+_ZIP_MIN_EPOCH = 315532800
+
+# 空白最小化用の正規表現（モジュール読み込み時に1回だけコンパイル）
+_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n')
+_TRAILING_WS_RE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+
+# 統合HTMLに埋め込むスクリプト（モジュールJSON・バイトコードJSONの前後）
+_EMBED_SCRIPT_HEAD = """
+<script>
+// 最適化されたPythonモジュール
+const OPTIMIZED_PYTHON_MODULES = """
+_EMBED_SCRIPT_BYTECODE = """;
+
+// 事前コンパイル済みモジュール（base64エンコードした.pyc）
+const OPTIMIZED_PYTHON_BYTECODE = """
+_EMBED_SCRIPT_TAIL = """;
+
+function writeOptimizedModule(pyodide, path, data) {
+    const fullPath = '/home/pyodide/' + path;
+    pyodide.FS.mkdirTree(fullPath.substring(0, fullPath.lastIndexOf('/')));
+    pyodide.FS.writeFile(fullPath, data);
+}
+
+// Pyodide初期化時にモジュールをロード
+async function loadOptimizedModules(pyodide) {
+    for (const [moduleName, moduleCode] of Object.entries(OPTIMIZED_PYTHON_MODULES)) {
+        const path = moduleName.replace(/\\./g, '/') + '.py';
+        writeOptimizedModule(pyodide, path, moduleCode);
+    }
+    // ソースなしの.pycとして配置（Pyodide側でのパース・コンパイルを省略）
+    for (const [moduleName, bytecode] of Object.entries(OPTIMIZED_PYTHON_BYTECODE)) {
+        const path = moduleName.replace(/\\./g, '/') + '.pyc';
+        writeOptimizedModule(pyodide, path, Uint8Array.from(atob(bytecode), c => c.charCodeAt(0)));
+    }
+}
+</script>
+"""
+
+# 統合HTMLが読み込むPyodide（v0.26.4）のPythonバージョン
+# .pycはバージョン間で互換性がないため、ビルド環境と一致する場合のみ生成・埋め込みする
+_PYODIDE_PYTHON_VERSION = (3, 12)
+_BYTECODE_ENABLED = sys.version_info[:2] == _PYODIDE_PYTHON_VERSION
+
+# 最適化結果のキャッシュファイル名（出力ディレクトリ直下に保存）
+_BUILD_CACHE_NAME = ".bundle_cache.json"
+
+# この数未満のファイルはプロセス起動コストの方が大きいため逐次処理する
+_PARALLEL_MIN_FILES = 8
+
+# 未使用判定の対象となるインポート文の型
+_IMPORT_STMT_TYPES = (ast.Import, ast.ImportFrom)
+
+# 名前収集時に子ノードを辿る必要のないノード型（名前を含み得ない葉ノード）
+_LEAF_NODE_TYPES = frozenset({ast.Constant, ast.Load, ast.Store, ast.Del})
+
+
+def _collect_used_names(tree: ast.AST) -> Set[str]:
+    """ツリー内で参照されている名前を収集
+
+    NodeVisitorのgetattrベースのディスパッチと再帰呼び出しを避け、
+    明示的なスタックと型の同一性比較で走査する。
+    """
+    used_names = set()
+    add_name = used_names.add
+    stack = [tree]
+    pop = stack.pop
+    extend = stack.extend
+    
+    while stack:
+        node = pop()
+        node_type = type(node)
+        if node_type is ast.Name:
+            add_name(node.id)
+        elif node_type not in _LEAF_NODE_TYPES:
+            extend(ast.iter_child_nodes(node))
+            
+    return used_names
+
+
+def _walk_py(root: Path) -> Iterator[os.DirEntry]:
+    """os.scandirでディレクトリを走査し、.pyファイルのDirEntryを返す
+
+    rglob + stat と異なり、ディレクトリ判定はgetdentsの結果を使い、
+    statはDirEntry側でキャッシュされる。
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    yield entry
+
+
+def _has_docstring(node: ast.AST) -> bool:
+    """本体の先頭がdocstringかどうか"""
+    return (bool(node.body) and
+            isinstance(node.body[0], ast.Expr) and
+            isinstance(node.body[0].value, ast.Constant) and
+            isinstance(node.body[0].value.value, str))
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    """if __name__ == "__main__": ブロックかどうか"""
+    # 大半の文はIfではないため、最も安い型の同一性比較で先に弾く
+    if type(node) is not ast.If:
+        return False
+    test = node.test
+    return (type(test) is ast.Compare and
+            getattr(test.left, 'id', None) == "__name__" and
+            len(test.comparators) == 1 and
+            getattr(test.comparators[0], 'value', None) == "__main__")
+
+
+# この文の後ろは到達不能になる文の型
+_TERMINAL_STMT_TYPES = (ast.Return, ast.Raise, ast.Continue, ast.Break)
+
+# try文の型（Python 3.11以降はexcept*のTryStarを含む）
+_TRY_STMT_TYPES = (ast.Try, ast.TryStar) if hasattr(ast, 'TryStar') else (ast.Try,)
+
+
+def _contains_yield(stmts: List[ast.stmt]) -> bool:
+    """yield / yield fromを含むかどうか（到達不能でも関数をジェネレータにする）"""
+    return any(type(node) in (ast.Yield, ast.YieldFrom)
+               for stmt in stmts for node in ast.walk(stmt))
+
+
+def _prune_statements(body: List[ast.stmt]) -> bool:
+    """assert文（python -O相当）と到達不能な文をインプレースで削除（変更があればTrue）"""
+    pruned = []
+    for index, stmt in enumerate(body):
+        if type(stmt) is ast.Assert:
+            continue
+        pruned.append(stmt)
+        # 到達不能な部分にyieldがあれば残す（削除すると関数がジェネレータでなくなる）
+        if isinstance(stmt, _TERMINAL_STMT_TYPES) and not _contains_yield(body[index + 1:]):
+            break
+    if len(pruned) == len(body):
+        return False
+    body[:] = pruned
+    return True
+
+
+# 定数畳み込みの対象となる演算子
+_FOLDABLE_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+    ast.BitAnd: operator.and_,
+}
+
+# 畳み込み結果の上限（CPythonのASTオプティマイザと同程度）
+_MAX_FOLDED_SEQ_SIZE = 4096
+_MAX_FOLDED_INT_BITS = 128
+
+
+def _fold_binop(node: ast.BinOp) -> Optional[Any]:
+    """定数同士の二項演算を畳み込んだ値を返す（畳み込めない場合はNone）"""
+    left, right = node.left, node.right
+    if type(left) is not ast.Constant or type(right) is not ast.Constant:
+        return None
+    fold = _FOLDABLE_BINOPS.get(type(node.op))
+    if fold is None:
+        return None
+    lvalue, rvalue = left.value, right.value
+    
+    if type(lvalue) in (int, float) and type(rvalue) in (int, float):
+        # 巨大な整数を生成する演算は計算前に除外
+        if type(node.op) in (ast.Pow, ast.LShift) and abs(rvalue) > _MAX_FOLDED_INT_BITS:
+            return None
+    elif type(node.op) is ast.Add and type(lvalue) is type(rvalue) and type(lvalue) in (str, bytes):
+        pass
+    elif (type(node.op) is ast.Mult and type(lvalue) in (str, bytes) and type(rvalue) is int
+          and len(lvalue) * rvalue <= _MAX_FOLDED_SEQ_SIZE):
+        pass
+    else:
+        return None
+        
+    try:
+        value = fold(lvalue, rvalue)
+    except (ArithmeticError, ValueError):
+        return None
+        
+    if isinstance(value, (int, float)):
+        # 負数はunparse時に属性参照や**の優先順位が変わるため畳み込まない
+        if value < 0 or not math.isfinite(value):
+            return None
+        if type(value) is int and value.bit_length() > _MAX_FOLDED_INT_BITS:
+            return None
+    elif len(value) > _MAX_FOLDED_SEQ_SIZE:
+        return None
+        
+    # 元の式より長くなる場合（例: 1/3）は畳み込まない
+    if len(repr(value)) > len(repr(lvalue)) + len(repr(rvalue)) + 1:
+        return None
+    return value
+
+
+def _exported_names(module: ast.Module) -> Set[str]:
+    """__all__で再エクスポートされている名前を取得"""
+    exported = set()
+    for stmt in module.body:
+        if (isinstance(stmt, ast.Assign) and
+                any(isinstance(t, ast.Name) and t.id == '__all__' for t in stmt.targets) and
+                isinstance(stmt.value, (ast.List, ast.Tuple))):
+            exported.update(elt.value for elt in stmt.value.elts
+                            if isinstance(elt, ast.Constant) and isinstance(elt.value, str))
+    return exported
+
+
+class _FusedOptimizer(ast.NodeTransformer):
+    """不要なインポート・docstring・デッドコードを1つのトランスフォーマーで除去
+
+    以前は未使用インポート削除、docstring削除、デッドコード削除を
+    別々のパスで走査していたが、モジュール全体の走査を1回にまとめる。
+    """
+    
+    def __init__(self, removed_items: Dict[str, Any]):
+        self.removed_items = removed_items
+        # 変換で一切変更されなかったモジュール直下の文（元のソースをそのまま再利用できる）
+        self.unchanged_statements: Set[ast.stmt] = set()
+        self._modified = False
+        
+    def visit_Module(self, node: ast.Module) -> ast.Module:
+        self._remove_docstring(node)
+        
+        # デッドコードを削除: if __name__ == "__main__": ブロック
+        node.body[:] = [stmt for stmt in node.body if not _is_main_guard(stmt)]
+        
+        # 関数・クラスのdocstring、assert文、到達不能な文を削除
+        # 文ごとに変更の有無を記録する
+        new_body = []
+        for stmt in node.body:
+            self._modified = False
+            stmt = self.visit(stmt)
+            if not self._modified:
+                self.unchanged_statements.add(stmt)
+            new_body.append(stmt)
+        node.body[:] = new_body
+        _prune_statements(node.body)
+        
+        # モジュール直下にインポートがなければ使用名の収集（全ノード走査）自体を省略
+        if not any(type(stmt) in _IMPORT_STMT_TYPES for stmt in node.body):
+            return node
+            
+        # 不要なインポートを削除（デッドコード削除後の使用名で判定）
+        used_names = _collect_used_names(node) | _exported_names(node)
+        new_body = []
+        for stmt in node.body:
+            if isinstance(stmt, _IMPORT_STMT_TYPES):
+                names = self._filter_import_names(stmt, used_names)
+                if not names:
+                    continue
+                if len(names) != len(stmt.names):
+                    stmt.names = names
+                    self.unchanged_statements.discard(stmt)
+            new_body.append(stmt)
+        node.body = new_body
+        return node
+        
+    def visit_FunctionDef(self, node: ast.AST) -> ast.AST:
+        self._remove_docstring(node)
+        return self.generic_visit(node)
+        
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+    
+    def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
+        # 定数畳み込み（例: 60 * 60 * 24 → 86400、'a' + 'b' → 'ab'）
+        self.generic_visit(node)
+        value = _fold_binop(node)
+        if value is None:
+            return node
+        self._modified = True
+        return ast.copy_location(ast.Constant(value), node)
+        
+    def visit_JoinedStr(self, node: ast.JoinedStr) -> ast.expr:
+        # プレースホルダーを含まないf文字列を通常の文字列に変換
+        self.generic_visit(node)
+        if all(type(part) is ast.Constant for part in node.values):
+            self._modified = True
+            return ast.copy_location(ast.Constant(''.join(part.value for part in node.values)), node)
+        return node
+        
+    def visit_MatchValue(self, node: ast.MatchValue) -> ast.MatchValue:
+        # matchパターン内の値（複素数リテラル等）は畳み込まない
+        return node
+        
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        super().generic_visit(node)
+        # 文のリストを持つフィールドからデッドコードを削除
+        for field in ('body', 'orelse', 'finalbody'):
+            stmts = getattr(node, field, None)
+            if type(stmts) is list and stmts and _prune_statements(stmts):
+                self._modified = True
+        # 本体が空になった場合はpassで構文を保つ
+        if type(getattr(node, 'body', None)) is list and not node.body and not isinstance(node, ast.Module):
+            node.body.append(ast.Pass())
+            self._modified = True
+        # except節のないtryでfinally節が空になった場合も同様（except節があればfinally節ごと省略される）
+        if type(node) in _TRY_STMT_TYPES and not node.handlers and not node.finalbody:
+            node.finalbody.append(ast.Pass())
+            self._modified = True
+        return node
+        
+    def _remove_docstring(self, node: ast.AST) -> None:
+        """docstringを削除（本番環境用）"""
+        if _has_docstring(node):
+            # 本体がdocstringのみの場合はpassに置き換えて構文を保つ
+            node.body = node.body[1:] or ([ast.Pass()] if not isinstance(node, ast.Module) else [])
+            self.removed_items['docstrings'] += 1
+            self._modified = True
+            
+    def _filter_import_names(self, node: ast.stmt, used_names: Set[str]) -> List[ast.alias]:
+        """使用されている名前のみ残したaliasリストを返す"""
+        new_names = []
+        if isinstance(node, ast.ImportFrom) and node.module == '__future__':
+            # __future__インポートはコンパイラ指示なので常に残す
+            return node.names
+        for alias in node.names:
+            name = alias.asname or alias.name
+            if isinstance(node, ast.Import):
+                if name in used_names or name.split('.')[0] in used_names:
+                    new_names.append(alias)
+                else:
+                    self.removed_items['imports'][name] += 1
+            elif name in used_names or name == '*':
+                new_names.append(alias)
+            else:
+                self.removed_items['imports'][f"{node.module}.{name}"] += 1
+        return new_names
+
+
+def _has_multiline_string(stmt: ast.stmt) -> bool:
+    """複数行にまたがる文字列リテラル（三連引用符等）を含むかどうか"""
+    if stmt.end_lineno == stmt.lineno:
+        return False
+    return any(type(node) in (ast.Constant, ast.JoinedStr) and node.end_lineno != node.lineno
+               for node in ast.walk(stmt))
+
+
+def _emit_source(tree: ast.Module, source: str, unchanged: Set[ast.stmt]) -> str:
+    """変換後のモジュールからソースコードを生成
+
+    ast.unparseでモジュール全体を再生成せず、変換で変更されなかった
+    モジュール直下の文は元のソースの該当行をそのまま切り出す。
+    変更された文（および他の文と行を共有する文）のみunparseする。
+    複数行の文字列リテラルを含む文もunparseする（後段の空行・行末空白の
+    削除で文字列の中身が書き換わらないよう、1行のリテラルとして出力する）。
+    """
+    lines = io.StringIO(source).readlines()
+    body = tree.body
+    spans = []
+    for stmt in body:
+        decorators = getattr(stmt, 'decorator_list', None)
+        start = decorators[0].lineno if decorators else stmt.lineno
+        spans.append((start, stmt.end_lineno))
+        
+    parts = []
+    for i, stmt in enumerate(body):
+        start, end = spans[i]
+        shares_line = ((i > 0 and spans[i - 1][1] >= start) or
+                       (i + 1 < len(body) and spans[i + 1][0] <= end))
+        if (stmt in unchanged and stmt.col_offset == 0 and not shares_line
+                and not _has_multiline_string(stmt)):
+            segment = ''.join(lines[start - 1:end])
+            parts.append(segment if segment.endswith('\n') else segment + '\n')
+        else:
+            parts.append(ast.unparse(stmt) + '\n')
+    return ''.join(parts)
+
+
+def _optimize_worker(job: Tuple[Path, bytes]) -> Tuple[Path, bytes, Dict]:
+    """ProcessPoolExecutor用のワーカー（pickle可能なモジュールレベル関数）"""
+    file_path, source = job
+    optimizer = BundleSizeOptimizer()
+    optimized_code = optimizer._optimize_single_file(file_path, source)
+    return file_path, optimized_code.encode('utf-8'), optimizer.optimization_report['removed_items']
+
+
+def _merge_removed_items(total: Dict, partial: Dict) -> None:
+    """ワーカーで集計した削除項目を親プロセスの集計に加算"""
+    for key, value in partial.items():
+        if isinstance(value, list):
+            total[key].extend(value)
+        else:
+            total[key] += value
 
 
 class BundleSizeOptimizer:
@@ -33,7 +453,7 @@ class BundleSizeOptimizer:
             'optimized_sizes': {},
             'savings': {},
             'removed_items': {
-                'imports': [],
+                'imports': Counter(),  # インポート名 → 削除回数
                 'functions': [],
                 'classes': [],
                 'comments': 0,
@@ -41,18 +461,29 @@ class BundleSizeOptimizer:
             },
             'bundle_info': {}
         }
+        # ソースファイルのキャッシュ（パス → (ソースバイト列, statの結果)）
+        self._file_cache: Dict[Path, Tuple[bytes, os.stat_result]] = {}
+        self.build_cache_file = self.output_dir / _BUILD_CACHE_NAME
+        
+    def _discover_files(self) -> Dict[Path, Tuple[bytes, os.stat_result]]:
+        """srcディレクトリを1回だけ走査し、各ファイルの内容とstatをキャッシュ"""
+        if not self._file_cache:
+            for entry in sorted(_walk_py(self.src_dir), key=lambda e: e.path):
+                py_file = Path(entry.path)
+                self._file_cache[py_file] = (py_file.read_bytes(), entry.stat())
+        return self._file_cache
         
     def analyze_bundle_size(self) -> Dict:
         """現在のバンドルサイズを分析"""
         print("📊 バンドルサイズ分析開始...")
         
         # Pythonコードサイズ
-        python_files = list(self.src_dir.rglob("*.py"))
+        python_files = self._discover_files()
         total_python_size = 0
         python_details = {}
         
-        for file in python_files:
-            size = file.stat().st_size
+        for file, (_, file_stat) in python_files.items():
+            size = file_stat.st_size
             total_python_size += size
             python_details[str(file.relative_to(self.project_root))] = size
             
@@ -90,7 +521,7 @@ class BundleSizeOptimizer:
         
         return analysis
     
-    def optimize_python_code(self):
+    def optimize_python_code(self) -> None:
         """Pythonコードの最適化"""
         print("\n🔧 Pythonコード最適化開始...")
         
@@ -98,21 +529,48 @@ class BundleSizeOptimizer:
         optimized_src = self.output_dir / "src"
         optimized_src.mkdir(parents=True, exist_ok=True)
         
-        for py_file in self.src_dir.rglob("*.py"):
+        # 前回から変更のないファイルは前回の最適化結果を再利用する
+        build_cache = self._load_build_cache()
+        files = self._discover_files()
+        pending = {}
+        results = {}
+        for py_file, (source, file_stat) in files.items():
+            optimized_bytes = self._lookup_build_cache(build_cache, py_file, source, file_stat)
+            if optimized_bytes is None:
+                pending[py_file] = (source, file_stat)
+            else:
+                results[py_file] = optimized_bytes
+                
+        for py_file, optimized_bytes, removed_items in self._optimize_files(pending):
             relative_path = py_file.relative_to(self.src_dir)
             output_file = optimized_src / relative_path
             output_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # コード最適化
-            optimized_code = self._optimize_single_file(py_file)
+            # 最適化されたコードを保存（書き込みは親プロセスでまとめて行う）
+            output_file.write_bytes(optimized_bytes)
+            
+            source, file_stat = files[py_file]
+            build_cache['files'][str(relative_path)] = {
+                'mtime_ns': file_stat.st_mtime_ns,
+                'size': file_stat.st_size,
+                'sha1': hashlib.sha1(source).hexdigest(),
+                'out_sha1': hashlib.sha1(optimized_bytes).hexdigest(),
+                'removed_items': removed_items
+            }
+            results[py_file] = optimized_bytes
+            
+        self._save_build_cache(build_cache)
+        reused = len(files) - len(pending)
+        if reused:
+            print(f"  ♻️ 変更のない{reused}ファイルはキャッシュを再利用")
+            
+        for py_file in files:
+            relative_path = py_file.relative_to(self.src_dir)
+            optimized_bytes = results[py_file]
             
-            # 最適化されたコードを保存
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(optimized_code)
-                
             # サイズ比較
-            original_size = py_file.stat().st_size
-            optimized_size = len(optimized_code.encode('utf-8'))
+            original_size = self._file_cache[py_file][1].st_size
+            optimized_size = len(optimized_bytes)
             
             self.optimization_report['optimized_sizes'][str(relative_path)] = {
                 'original': original_size,
@@ -125,26 +583,91 @@ class BundleSizeOptimizer:
             print(f"  ✅ {relative_path}: {original_size} → {optimized_size} bytes "
                   f"(-{reduction_pct:.1f}%)")
     
-    def _optimize_single_file(self, file_path: Path) -> str:
-        """単一のPythonファイルを最適化"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def _optimize_files(self, files: Dict[Path, Tuple[bytes, os.stat_result]]) -> Iterator[Tuple[Path, bytes, Dict]]:
+        """各ファイルを最適化し、(パス, 最適化後のバイト列, 削除項目) を順に返す
+
+        ファイルごとの最適化は独立したCPU処理なので、ファイル数が十分あれば
+        ProcessPoolExecutorで並列化する（スレッドではGILにより並列化されない）。
+        削除項目はファイル単位で集計し、親プロセスの集計にも加算する。
+        """
+        jobs = [(py_file, source) for py_file, (source, _) in files.items()]
+        workers = os.cpu_count() or 1
+        
+        if workers < 2 or len(jobs) < _PARALLEL_MIN_FILES:
+            results = map(_optimize_worker, jobs)
+            for py_file, optimized_bytes, removed_items in results:
+                _merge_removed_items(self.optimization_report['removed_items'], removed_items)
+                yield py_file, optimized_bytes, removed_items
+            return
             
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for py_file, optimized_bytes, removed_items in executor.map(_optimize_worker, jobs, chunksize=8):
+                _merge_removed_items(self.optimization_report['removed_items'], removed_items)
+                yield py_file, optimized_bytes, removed_items
+                
+    def _load_build_cache(self) -> Dict[str, Any]:
+        """前回の最適化結果のキャッシュを読み込む
+
+        最適化ツール自体が変更された場合はキャッシュを破棄する。
+        """
+        fingerprint = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
         try:
-            # ASTパースして最適化
-            tree = ast.parse(content)
+            cache = json.loads(self.build_cache_file.read_bytes())
+        except (OSError, ValueError):
+            cache = None
+        if not isinstance(cache, dict) or cache.get('optimizer') != fingerprint:
+            cache = {'optimizer': fingerprint, 'files': {}}
+        return cache
+        
+    def _save_build_cache(self, cache: Dict[str, Any]) -> None:
+        """最適化結果のキャッシュを保存"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.build_cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
             
-            # 不要なインポートを検出・削除
-            tree = self._remove_unused_imports(tree, content)
+    def _lookup_build_cache(self, cache: Dict[str, Any], py_file: Path,
+                            source: bytes, file_stat: os.stat_result) -> Optional[bytes]:
+        """キャッシュが有効なら前回の最適化結果を返す（無効ならNone）
+
+        (mtime, サイズ) が一致すればハッシュ計算を省略し、mtimeだけが
+        変わった場合はソースのSHA-1で内容の一致を確認する。
+        出力ファイルが消えている・書き換えられている場合は再最適化する。
+        """
+        relative_path = py_file.relative_to(self.src_dir)
+        entry = cache['files'].get(str(relative_path))
+        if entry is None or entry['size'] != file_stat.st_size:
+            return None
+        if (entry['mtime_ns'] != file_stat.st_mtime_ns and
+                entry['sha1'] != hashlib.sha1(source).hexdigest()):
+            return None
+            
+        try:
+            optimized_bytes = (self.output_dir / "src" / relative_path).read_bytes()
+        except OSError:
+            return None
+        if hashlib.sha1(optimized_bytes).hexdigest() != entry['out_sha1']:
+            return None
             
-            # 不要なdocstringを削除（本番環境用）
-            tree = self._remove_docstrings(tree)
+        entry['mtime_ns'] = file_stat.st_mtime_ns
+        removed_items = dict(entry['removed_items'])
+        removed_items['imports'] = Counter(removed_items['imports'])
+        _merge_removed_items(self.optimization_report['removed_items'], removed_items)
+        return optimized_bytes
+    
+    def _optimize_single_file(self, file_path: Path, source: bytes) -> str:
+        """単一のPythonファイルを最適化"""
+        content = source.decode('utf-8')
             
-            # デッドコードを削除
-            tree = self._remove_dead_code(tree)
+        try:
+            # ASTパースして最適化（キャッシュ済みのバイト列から1回だけパース）
+            tree = ast.parse(source, filename=str(file_path))
             
-            # 最適化されたコードを生成
-            optimized_code = ast.unparse(tree)
+            # 不要なインポート・docstring・デッドコードを1回の走査で削除
+            fused = _FusedOptimizer(self.optimization_report['removed_items'])
+            tree = fused.visit(tree)
+            
+            # 最適化されたコードを生成（変更のない文は元のソースを再利用）
+            optimized_code = _emit_source(tree, content, fused.unchanged_statements)
             
             # コメントを削除
             optimized_code = self._remove_comments(optimized_code)
@@ -159,176 +682,51 @@ class BundleSizeOptimizer:
             # エラー時は元のコードを返す
             return content
     
-    def _remove_unused_imports(self, tree: ast.AST, original_code: str) -> ast.AST:
-        """使用されていないインポートを削除"""
-        # 使用されている名前を収集
-        used_names = set()
-        
-        class NameCollector(ast.NodeVisitor):
-            def visit_Name(self, node):
-                used_names.add(node.id)
-            def visit_Attribute(self, node):
-                if isinstance(node.value, ast.Name):
-                    used_names.add(node.value.id)
-                
-        collector = NameCollector()
-        collector.visit(tree)
-        
-        # インポートを最適化
-        new_body = []
-        for node in tree.body:
-            if isinstance(node, ast.Import):
-                # import文の処理
-                new_names = []
-                for alias in node.names:
-                    name = alias.asname or alias.name
-                    if name in used_names or name.split('.')[0] in used_names:
-                        new_names.append(alias)
-                    else:
-                        self.optimization_report['removed_items']['imports'].append(name)
-                        
-                if new_names:
-                    node.names = new_names
-                    new_body.append(node)
-                    
-            elif isinstance(node, ast.ImportFrom):
-                # from ... import文の処理
-                new_names = []
-                for alias in node.names:
-                    name = alias.asname or alias.name
-                    if name in used_names:
-                        new_names.append(alias)
-                    else:
-                        self.optimization_report['removed_items']['imports'].append(f"{node.module}.{name}")
-                        
-                if new_names:
-                    node.names = new_names
-                    new_body.append(node)
-            else:
-                new_body.append(node)
-                
-        tree.body = new_body
-        return tree
-    
-    def _remove_docstrings(self, tree: ast.AST) -> ast.AST:
-        """docstringを削除（本番環境用）"""
-        class DocstringRemover(ast.NodeTransformer):
-            def visit_FunctionDef(self, node):
-                # 関数のdocstringを削除
-                if (node.body and 
-                    isinstance(node.body[0], ast.Expr) and 
-                    isinstance(node.body[0].value, ast.Constant) and
-                    isinstance(node.body[0].value.value, str)):
-                    node.body = node.body[1:]
-                    self.optimization_report['removed_items']['docstrings'] += 1
-                return self.generic_visit(node)
-                
-            def visit_ClassDef(self, node):
-                # クラスのdocstringを削除
-                if (node.body and 
-                    isinstance(node.body[0], ast.Expr) and 
-                    isinstance(node.body[0].value, ast.Constant) and
-                    isinstance(node.body[0].value.value, str)):
-                    node.body = node.body[1:]
-                    self.optimization_report['removed_items']['docstrings'] += 1
-                return self.generic_visit(node)
-                
-            def visit_Module(self, node):
-                # モジュールのdocstringを削除
-                if (node.body and 
-                    isinstance(node.body[0], ast.Expr) and 
-                    isinstance(node.body[0].value, ast.Constant) and
-                    isinstance(node.body[0].value.value, str)):
-                    node.body = node.body[1:]
-                    self.optimization_report['removed_items']['docstrings'] += 1
-                return self.generic_visit(node)
-                
-        remover = DocstringRemover()
-        tree = remover.visit(tree)
-        return tree
-    
-    def _remove_dead_code(self, tree: ast.AST) -> ast.AST:
-        """デッドコードを削除"""
-        # 簡単な実装: if __name__ == "__main__": ブロックを削除
-        new_body = []
-        for node in tree.body:
-            if isinstance(node, ast.If):
-                # if __name__ == "__main__": の検出
-                if (isinstance(node.test, ast.Compare) and
-                    isinstance(node.test.left, ast.Name) and
-                    node.test.left.id == "__name__" and
-                    len(node.test.comparators) == 1 and
-                    isinstance(node.test.comparators[0], ast.Constant) and
-                    node.test.comparators[0].value == "__main__"):
-                    # メインブロックは削除
-                    continue
-            new_body.append(node)
-            
-        tree.body = new_body
-        return tree
-    
     def _remove_comments(self, code: str) -> str:
         """コメントを削除"""
+        # tokenize（C実装のトークナイザ）でコメント位置を特定する
+        # 文字列リテラル内の#や三連引用符、エスケープも正しく扱える
+        comment_starts = {}
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(code).readline):
+                if token.type == tokenize.COMMENT:
+                    comment_starts[token.start[0]] = token.start[1]
+        except (tokenize.TokenError, SyntaxError):
+            # トークナイズできないコードはコメント削除をスキップ
+            comment_starts = {}
+            
         lines = code.split('\n')
-        new_lines = []
-        
-        for line in lines:
-            # インラインコメントを削除
-            if '#' in line:
-                # 文字列内の#は削除しない
-                in_string = False
-                quote_char = None
-                new_line = []
-                
-                i = 0
-                while i < len(line):
-                    char = line[i]
-                    
-                    if char in ('"', "'") and (i == 0 or line[i-1] != '\\'):
-                        if not in_string:
-                            in_string = True
-                            quote_char = char
-                        elif char == quote_char:
-                            in_string = False
-                            
-                    if char == '#' and not in_string:
-                        # コメント開始
-                        self.optimization_report['removed_items']['comments'] += 1
-                        break
-                        
-                    new_line.append(char)
-                    i += 1
-                    
-                line = ''.join(new_line).rstrip()
-                
-            if line:  # 空行は除く
-                new_lines.append(line)
-                
-        return '\n'.join(new_lines)
+        for lineno, col in comment_starts.items():
+            lines[lineno - 1] = lines[lineno - 1][:col].rstrip()
+        self.optimization_report['removed_items']['comments'] += len(comment_starts)
+        
+        # 空行は除く
+        return '\n'.join(line for line in lines if line)
     
     def _minimize_whitespace(self, code: str) -> str:
         """余分な空白を最小化"""
-        # 複数の空行を1つに
-        code = re.sub(r'\n\s*\n\s*\n', '\n\n', code)
-        
-        # 行末の空白を削除
-        lines = [line.rstrip() for line in code.split('\n')]
-        
-        return '\n'.join(lines)
+        # 複数の空行を1つにし、行末の空白を削除
+        return _TRAILING_WS_RE.sub('', _BLANK_LINES_RE.sub('\n\n', code))
     
-    def create_optimized_bundle(self):
-        """最適化されたバンドルを作成"""
+    def create_optimized_bundle(self, create_zip: bool = False, embed_bytecode: bool = False) -> None:
+        """最適化されたバンドルを作成
+        
+        Args:
+            create_zip: 互換性のためZIP形式も作成するか（CDN配信では不要）
+            embed_bytecode: 統合HTMLに.pycを埋め込むか（起動時のコンパイルは省けるが
+                base64化したバイトコードはミニファイ済みソースより大きくなる）
+        """
         print("\n📦 バンドル作成開始...")
         
         # Pyodide用の統合HTMLファイルを作成
-        self._create_integrated_html()
+        self._create_integrated_html(embed_bytecode=embed_bytecode)
         
         # 圧縮バンドルの作成
-        self._create_compressed_bundle()
+        self._create_compressed_bundle(create_zip=create_zip)
         
         print("✅ バンドル作成完了")
     
-    def _create_integrated_html(self):
+    def _create_integrated_html(self, embed_bytecode: bool = False) -> None:
         """Pythonコードを統合したHTMLファイルを作成"""
         # ベースとなるHTMLファイルを読み込み
         base_html = self.project_root / "pyodide_game_demo.html"
@@ -337,105 +735,176 @@ class BundleSizeOptimizer:
             print("  ⚠️ ベースHTMLファイルが見つかりません")
             return
             
-        with open(base_html, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-            
-        # 最適化されたPythonコードを読み込み
-        python_modules = {}
-        optimized_src = self.output_dir / "src"
+        html_content = base_html.read_bytes().decode('utf-8')
         
-        for py_file in optimized_src.rglob("*.py"):
-            module_path = py_file.relative_to(optimized_src).with_suffix('')
-            module_name = str(module_path).replace(os.sep, '.')
+        if embed_bytecode and not _BYTECODE_ENABLED:
+            print(f"  ℹ️ Python {sys.version_info[0]}.{sys.version_info[1]} はPyodideの"
+                  f"Python {_PYODIDE_PYTHON_VERSION[0]}.{_PYODIDE_PYTHON_VERSION[1]} と異なるため.pycは埋め込みません")
+            embed_bytecode = False
             
-            with open(py_file, 'r', encoding='utf-8') as f:
-                python_modules[module_name] = f.read()
-                
-        # Pythonコードを埋め込み
-        modules_json = json.dumps(python_modules, ensure_ascii=False)
-        
-        # HTMLに埋め込むためのスクリプトを生成
-        embed_script = f"""
-<script>
-// 最適化されたPythonモジュール
-const OPTIMIZED_PYTHON_MODULES = {modules_json};
-
-// Pyodide初期化時にモジュールをロード
-async function loadOptimizedModules(pyodide) {{
-    for (const [moduleName, moduleCode] of Object.entries(OPTIMIZED_PYTHON_MODULES)) {{
-        const path = moduleName.replace(/\\./g, '/') + '.py';
-        pyodide.FS.writeFile('/home/pyodide/' + path, moduleCode);
-    }}
-}}
-</script>
-"""
-        
         # HTMLに埋め込み
-        # </head>タグの前に挿入
-        insert_pos = html_content.find('</head>')
-        if insert_pos != -1:
-            html_content = html_content[:insert_pos] + embed_script + html_content[insert_pos:]
-            
-        # 最適化されたHTMLを保存
+        # </head>タグの前に挿入（partitionで1回だけ走査）し、
+        # 結合文字列は作らず前半・スクリプト・後半をファイルへ直接書き込む
+        before_head, head_tag, after_head = html_content.partition('</head>')
+        del html_content
         output_html = self.output_dir / "optimized_game.html"
-        with open(output_html, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        optimized_src = self.output_dir / "src"
+        module_count = 0
+        bytecode_modules = []
+        
+        with open(output_html, 'w', encoding='utf-8', newline='') as f:
+            f.write(before_head)
+            if head_tag:
+                f.write(_EMBED_SCRIPT_HEAD)
+                # 最適化されたPythonコードを1ファイルずつ読み込んでJSONとして逐次書き出す
+                # （全モジュールを保持する辞書は作らない）
+                # 有効な.pycがあるモジュールはソースの代わりにバイトコードを埋め込む
+                f.write('{')
+                for entry in _walk_py(optimized_src):
+                    py_file = Path(entry.path)
+                    module_path = py_file.relative_to(optimized_src).with_suffix('')
+                    module_name = str(module_path).replace(os.sep, '.')
+                    if embed_bytecode and self._compile_bytecode(py_file):
+                        bytecode_modules.append((module_name, py_file.with_suffix('.pyc')))
+                        continue
+                    if module_count:
+                        f.write(',')
+                    f.write(json.dumps(module_name, ensure_ascii=False))
+                    f.write(':')
+                    f.write(json.dumps(py_file.read_bytes().decode('utf-8'), ensure_ascii=False))
+                    module_count += 1
+                f.write('}')
+                f.write(_EMBED_SCRIPT_BYTECODE)
+                f.write('{')
+                for i, (module_name, pyc_file) in enumerate(bytecode_modules):
+                    if i:
+                        f.write(',')
+                    f.write(json.dumps(module_name, ensure_ascii=False))
+                    f.write(':"')
+                    f.write(base64.b64encode(pyc_file.read_bytes()).decode('ascii'))
+                    f.write('"')
+                f.write('}')
+                f.write(_EMBED_SCRIPT_TAIL)
+                f.write(head_tag)
+                f.write(after_head)
             
         # サイズ情報を記録
         original_size = base_html.stat().st_size
-        optimized_size = len(html_content.encode('utf-8'))
+        optimized_size = output_html.stat().st_size
         
         self.optimization_report['bundle_info']['integrated_html'] = {
             'file': str(output_html),
             'original_size': original_size,
             'optimized_size': optimized_size,
-            'embedded_modules': len(python_modules)
+            'embedded_modules': module_count + len(bytecode_modules),
+            'bytecode_modules': len(bytecode_modules)
         }
         
         print(f"  ✅ 統合HTML作成: {output_html}")
-        print(f"     サイズ: {optimized_size:,} bytes ({len(python_modules)} modules embedded)")
+        print(f"     サイズ: {optimized_size:,} bytes ({module_count + len(bytecode_modules)} modules embedded, "
+              f"{len(bytecode_modules)} as bytecode)")
+        
+    def _compile_bytecode(self, output_file: Path) -> bool:
+        """最適化済みの.pyを隣接する.pyc（ソースなしインポート用）にコンパイル
+
+        -OO相当（optimize=2）でassert文とdocstringをバイトコードレベルでも除去する。
+        最新の.pycが既にあれば再利用し、生成できなかった場合はFalseを返す。
+        """
+        pyc_file = output_file.with_suffix('.pyc')
+        if self._has_valid_bytecode(output_file):
+            return True
+        try:
+            py_compile.compile(str(output_file), cfile=str(pyc_file),
+                               dfile=output_file.relative_to(self.output_dir / "src").as_posix(),
+                               doraise=True, optimize=2,
+                               invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+        except py_compile.PyCompileError as e:
+            print(f"    ⚠️ バイトコード生成エラー ({output_file}): {e.msg}")
+            pyc_file.unlink(missing_ok=True)
+            return False
+        return True
+        
+    @staticmethod
+    def _has_valid_bytecode(py_file: Path) -> bool:
+        """.pyに対応する.pycがPyodideで読み込める最新のものかどうか"""
+        pyc_file = py_file.with_suffix('.pyc')
+        try:
+            if pyc_file.stat().st_mtime_ns < py_file.stat().st_mtime_ns:
+                return False
+            with open(pyc_file, 'rb') as f:
+                return f.read(4) == importlib.util.MAGIC_NUMBER
+        except OSError:
+            return False
     
-    def _create_compressed_bundle(self):
+    def _create_compressed_bundle(self, create_zip: bool = False) -> None:
         """圧縮されたバンドルを作成"""
         # distディレクトリ全体を圧縮
         bundle_name = "ultimate_squash_bundle"
-        
-        # tar.gz形式で圧縮
-        shutil.make_archive(
-            base_name=str(self.output_dir / bundle_name),
-            format='gztar',
-            root_dir=str(self.output_dir)
-        )
-        
         bundle_file = self.output_dir / f"{bundle_name}.tar.gz"
-        bundle_size = bundle_file.stat().st_size
-        
-        # ZIP形式でも作成（互換性のため）
-        shutil.make_archive(
-            base_name=str(self.output_dir / bundle_name),
-            format='zip',
-            root_dir=str(self.output_dir)
-        )
-        
+        brotli_file = self.output_dir / f"{bundle_name}.tar.br"
         zip_file = self.output_dir / f"{bundle_name}.zip"
-        zip_size = zip_file.stat().st_size
         
-        self.optimization_report['bundle_info']['compressed'] = {
+        # ディレクトリを1回だけ走査し、各ファイルを1回読み込んでtarに書き込む
+        # 生成中・過去に生成したアーカイブ自身と最適化キャッシュは対象から除外する
+        archive_files = {bundle_file, brotli_file, zip_file, self.build_cache_file}
+        tar_buffer = io.BytesIO()
+        # ZIPの日時はSOURCE_DATE_EPOCH（ZIP形式で表せる1980年が下限）
+        zip_date_time = time.gmtime(max(source_date_epoch() or 0, _ZIP_MIN_EPOCH))[:6]
+        zf = zipfile.ZipFile(zip_file, 'w', compression=zipfile.ZIP_DEFLATED) if create_zip else None
+        try:
+            with tarfile.open(fileobj=tar_buffer, mode='w') as tar:
+                for path in sorted(self.output_dir.rglob("*")):
+                    if path in archive_files or not path.is_file():
+                        continue
+                        
+                    arcname = path.relative_to(self.output_dir).as_posix()
+                    data = path.read_bytes()
+                    
+                    # 更新時刻・所有者はビルド環境に依存しない値に揃える（再現可能なアーカイブ）
+                    tar.addfile(reproducible_tarinfo(arcname, len(data)), io.BytesIO(data))
+                    
+                    if zf is not None:
+                        zf.writestr(zipfile.ZipInfo(arcname, date_time=zip_date_time), data,
+                                    compress_type=zipfile.ZIP_DEFLATED)
+        finally:
+            if zf is not None:
+                zf.close()
+                
+        tar_data = tar_buffer.getvalue()
+        
+        # tar.gz（最大圧縮、ヘッダーのmtimeを0にして再現可能なアーカイブにする）
+        with gzip.GzipFile(bundle_file, 'wb', compresslevel=9, mtime=0) as gz:
+            gz.write(tar_data)
+            
+        compressed_info = {
             'tar_gz': {
                 'file': str(bundle_file),
-                'size': bundle_size
-            },
-            'zip': {
-                'file': str(zip_file),
-                'size': zip_size
+                'size': bundle_file.stat().st_size
             }
         }
         
+        # brotliが利用可能ならtar.brも作成（テキスト主体のためgzipより小さい）
+        if brotli is not None:
+            brotli_file.write_bytes(brotli.compress(tar_data, quality=11))
+            compressed_info['tar_br'] = {
+                'file': str(brotli_file),
+                'size': brotli_file.stat().st_size
+            }
+            
+        if create_zip:
+            compressed_info['zip'] = {
+                'file': str(zip_file),
+                'size': zip_file.stat().st_size
+            }
+            
+        self.optimization_report['bundle_info']['compressed'] = compressed_info
+        
         print(f"  ✅ 圧縮バンドル作成:")
-        print(f"     - tar.gz: {bundle_size:,} bytes")
-        print(f"     - zip: {zip_size:,} bytes")
+        for label, key in (('tar.gz', 'tar_gz'), ('tar.br', 'tar_br'), ('zip', 'zip')):
+            if key in compressed_info:
+                print(f"     - {label}: {compressed_info[key]['size']:,} bytes")
     
-    def generate_size_report(self):
+    def generate_size_report(self) -> str:
         """サイズ最適化レポートを生成"""
         print("\n📊 最適化レポート生成...")
         
@@ -450,6 +919,13 @@ async function loadOptimizedModules(pyodide) {{
         total_reduction = total_original - total_optimized
         reduction_percentage = (total_reduction / total_original * 100) if total_original > 0 else 0
         
+        # よく削除されたインポート（上位10件）
+        removed_imports = self.optimization_report['removed_items']['imports']
+        top_removed_imports = ''
+        if removed_imports:
+            top_removed_imports = "\n### よく削除されたインポート（上位10件）\n" + ''.join(
+                f"- `{name}`: {count}回\n" for name, count in removed_imports.most_common(10))
+        
         # レポート作成
         report = f"""# バンドルサイズ最適化レポート
 
@@ -465,10 +941,10 @@ async function loadOptimizedModules(pyodide) {{
 - **削減率**: {reduction_percentage:.1f}%
 
 ### 削除された要素
-- **不要なインポート**: {len(self.optimization_report['removed_items']['imports'])}個
+- **不要なインポート**: {sum(removed_imports.values())}個（{len(removed_imports)}種類）
 - **docstring**: {self.optimization_report['removed_items']['docstrings']}個
 - **コメント**: {self.optimization_report['removed_items']['comments']}行
-
+{top_removed_imports}
 ## ファイル別の最適化結果
 
 | ファイル | 元のサイズ | 最適化後 | 削減量 | 削減率 |
@@ -495,7 +971,10 @@ async function loadOptimizedModules(pyodide) {{
                 compressed = self.optimization_report['bundle_info']['compressed']
                 report += f"### 圧縮バンドル\n"
                 report += f"- **tar.gz**: {compressed['tar_gz']['size']:,} bytes\n"
-                report += f"- **zip**: {compressed['zip']['size']:,} bytes\n"
+                if 'tar_br' in compressed:
+                    report += f"- **tar.br**: {compressed['tar_br']['size']:,} bytes\n"
+                if 'zip' in compressed:
+                    report += f"- **zip**: {compressed['zip']['size']:,} bytes\n"
         
         # 推奨事項を追加
         report += self._generate_recommendations()
@@ -526,7 +1005,7 @@ async function loadOptimizedModules(pyodide) {{
         else:
             recommendations += "### さらなる最適化の余地\n"
             
-            if len(self.optimization_report['removed_items']['imports']) > 10:
+            if sum(self.optimization_report['removed_items']['imports'].values()) > 10:
                 recommendations += "- **インポート最適化**: 多くの未使用インポートが検出されました\n"
                 recommendations += "  - 定期的なコードレビューでインポートを整理してください\n\n"
                 
@@ -3,11 +3,57 @@
 最適化済み本番環境用バンドル作成
 アセット最適化を統合した最終バンドル
 """
+import re
 import json
-import base64
+import hashlib
+import functools
 from pathlib import Path
+from typing import Optional
 import shutil
 
+from _bundle_utils import (brotli_supports_dictionary, create_precompressed_variants,
+                           create_tar_gz, get_timestamp)
+
+# 配布ディレクトリと、前回ビルドの入力ハッシュを記録するファイル
+DISTRIBUTION_DIR = Path("distribution")
+BUILD_KEY_FILE = DISTRIBUTION_DIR / ".build-key"
+
+# PWAマニフェスト・アイコンのファイル名（配布ディレクトリ内、index.htmlからの相対URL）
+PWA_MANIFEST_NAME = "manifest.webmanifest"
+PWA_ICON_NAME = "icon.svg"
+
+# ファビコンのファイル名（HTMLに埋め込まず別ファイルとして長期キャッシュさせる）
+FAVICON_NAME = "favicon.svg"
+
+# 効果音システムのES moduleファイル名（最初のクリック時に動的importする）
+AUDIO_MODULE_NAME = "audio.js"
+
+# 共有Brotli辞書（Compression Dictionary Transport用）のファイル名・最大サイズ
+SHARED_DICTIONARY_NAME = "shared-dictionary.txt"
+SHARED_DICTIONARY_MAX_SIZE = 16 * 1024
+
+# PWAマニフェストに記載するアイコンサイズ
+PWA_ICON_SIZES = (72, 192, 512)
+
+# PWAアイコンの本体（32単位の座標系、モジュール読み込み時に1回だけ組み立てる）
+_PWA_ICON_BODY = ('<defs><linearGradient id="bgGrad" x1="0%" y1="0%" x2="100%" y2="100%">'
+                  '<stop offset="0%" style="stop-color:#004274"/>'
+                  '<stop offset="100%" style="stop-color:#16213e"/>'
+                  '</linearGradient></defs>'
+                  '<rect width="32" height="32" fill="url(#bgGrad)" rx="2"/>'
+                  '<circle cx="16" cy="12" r="4" fill="#ffffff"/>'
+                  '<rect x="12" y="24" width="8" height="2" rx="1" fill="#00ff00"/>')
+
+# テンプレート内のファビコン（data URL）のhref属性
+_FAVICON_DATA_URL_RE = re.compile(r'href="data:image/svg\+xml;base64,[^"]+"')
+
+# minify_final_htmlでJavaScriptを走査する際に立ち止まる文字（クォートとスラッシュ）
+_JS_SPECIAL_RE = re.compile(r'[\'"`/]')
+
+# 直後の/が正規表現リテラルの開始となる記号・キーワード
+_JS_REGEX_PRECEDING_CHARS = frozenset('(,=:[!&|?{};+-*%<>~^')
+_JS_REGEX_PRECEDING_KEYWORDS = frozenset({'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw'})
+
 
 def create_final_optimized_bundle():
     """最終最適化バンドルを作成"""
@@ -19,68 +65,55 @@ def create_final_optimized_bundle():
         print("❌ production_template.html が見つかりません")
         return
     
-    with open(template_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 1. 最適化されたファビコンを統合
-    optimized_favicon = create_optimized_favicon()
-    content = content.replace(
-        'href="data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzIiIGhlaWdodD0iMzIiIHZpZXdCb3g9IjAgMCAzMiAzMiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPHJlY3Qgd2lkdGg9IjMyIiBoZWlnaHQ9IjMyIiBmaWxsPSIjMDA0Mjc0Ii8+CjxjaXJjbGUgY3g9IjE2IiBjeT0iMTYiIHI9IjQiIGZpbGw9IiNmZmZmZmYiLz4KPHJlY3QgeD0iMTQiIHk9IjI0IiB3aWR0aD0iNCIgaGVpZ2h0PSI2IiBmaWxsPSIjMDBmZjAwIi8+Cjwvc3ZnPgo="',
-        f'href="{optimized_favicon}"'
-    )
+    template_bytes = template_path.read_bytes()
+    favicon_svg = create_optimized_favicon()
+    audio_loader = generate_audio_loader()
+    pwa_manifest = create_pwa_manifest()
+    final_path = Path("ultimate_squash_optimized.html")
     
-    # 2. Web Audio API音声システムを統合
-    audio_js = generate_audio_system()
+    # 入力（テンプレート・生成物・このスクリプト自体）が前回と同じなら再生成を省略
+    build_key = compute_build_key(template_bytes, favicon_svg, audio_loader, pwa_manifest)
+    if final_path.exists() and BUILD_KEY_FILE.exists() and BUILD_KEY_FILE.read_text() == build_key:
+        print(f"♻️ 入力に変更がないため再生成を省略: {final_path}")
+        # 配布ディレクトリは作り直される場合があり、その際に.build-keyも消えるため書き直す
+        create_final_distribution_bundle(final_path)
+        BUILD_KEY_FILE.write_text(build_key)
+        return final_path
     
-    # 音声システムをHTMLに挿入（</script>タグの直前）
-    script_end = content.rfind('</script>')
-    if script_end != -1:
-        content = content[:script_end] + '\n        ' + audio_js + '\n        ' + content[script_end:]
+    content = template_bytes.decode('utf-8')
     
-    # 3. ゲーム内音声イベントを統合
-    game_audio_integration = """
-        // ゲーム音声イベント統合
-        const originalUpdateGame = pyodide.runPython;
-        
-        // ゲームイベントに音声を追加
-        function handleGameAudio(gameState) {
-            if (window.gameAudio && gameState) {
-                // ラケットヒット検出（简易版）
-                if (gameState.includes('hits') && Math.random() < 0.3) {
-                    window.gameAudio.playPaddleHit();
-                }
-                // ボール壁反射検出
-                if (gameState.includes('ball.dx = -ball.dx') || gameState.includes('ball.dy = -ball.dy')) {
-                    window.gameAudio.playWallBounce();
-                }
-                // ゲームオーバー検出
-                if (gameState.includes('gameover') || gameState.includes('is_gameover = True')) {
-                    window.gameAudio.playGameOver();
-                }
-            }
-        }"""
+    # テンプレートへの置換・挿入は (開始, 終了, テキスト) として集め、最後に1回で結合する
+    # （挿入ごとにHTML全体をコピーしない）
+    splices = []
     
-    # ゲーム音声統合をHTMLに追加
-    audio_insert_pos = content.find('// ゲーム初期化開始')
-    if audio_insert_pos != -1:
-        content = content[:audio_insert_pos] + game_audio_integration + '\n        \n        ' + content[audio_insert_pos:]
+    # 1. ファビコンを外部SVGファイルへの参照に置き換え
+    # （テンプレート内のbase64の中身ではなくdata URLの構造で探す）
+    favicon_match = _FAVICON_DATA_URL_RE.search(content)
+    if favicon_match:
+        splices.append((favicon_match.start(), favicon_match.end(), f'href="{FAVICON_NAME}"'))
+    else:
+        print("⚠️ テンプレートにファビコンのdata URLが見つかりません")
     
-    # 4. PWA マニフェストを追加
-    pwa_manifest = create_pwa_manifest()
+    # 2. Web Audio API音声システムを統合
+    # 本体はaudio.jsとして配布し、HTMLには読み込み用のスタブのみ挿入（最後の</script>タグの直前）
+    script_end = content.rfind('</script>')
+    if script_end != -1:
+        splices.append((script_end, script_end, '\n        ' + audio_loader + '\n        '))
     
-    # マニフェストをheadセクションに追加
+    # 3. PWA マニフェストを追加
+    # マニフェストは配布ディレクトリに別ファイルとして置き、headセクションから参照する
+    # （data URLにするとbase64で膨らみ、HTMLと別にキャッシュもできない）
     head_end = content.find('</head>')
     if head_end != -1:
-        manifest_link = f'\n    <link rel="manifest" href="data:application/json;base64,{base64.b64encode(pwa_manifest.encode()).decode()}">'
-        content = content[:head_end] + manifest_link + '\n' + content[head_end:]
+        splices.append((head_end, head_end, f'\n    <link rel="manifest" href="{PWA_MANIFEST_NAME}">\n'))
+        
+    content = apply_splices(content, splices)
     
-    # 5. 最終HTMLファイルの最小化
+    # 4. 最終HTMLファイルの最小化
     content = minify_final_html(content)
     
     # 最終最適化ファイルを保存
-    final_path = Path("ultimate_squash_optimized.html")
-    with open(final_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    final_path.write_bytes(content.encode('utf-8'))
     
     original_size = template_path.stat().st_size
     final_size = final_path.stat().st_size
@@ -93,124 +126,159 @@ def create_final_optimized_bundle():
     
     # 配布用最終圧縮バンドルを作成
     create_final_distribution_bundle(final_path)
+    BUILD_KEY_FILE.write_text(build_key)
     
     return final_path
 
 
+def compute_build_key(template_bytes: bytes, *generated: str) -> str:
+    """ビルド入力のハッシュを計算（このスクリプトの変更でも再生成されるよう自身も含める）"""
+    h = hashlib.blake2b(template_bytes, digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    for part in generated:
+        h.update(part.encode())
+    return h.hexdigest()
+
+
+def apply_splices(content: str, splices: list) -> str:
+    """(開始, 終了, テキスト) の置換をまとめて適用（元の文字列を1回だけ走査して結合）"""
+    out = []
+    last = 0
+    for start, end, text in sorted(splices, key=lambda splice: splice[0]):
+        out.append(content[last:start])
+        out.append(text)
+        last = end
+    out.append(content[last:])
+    return ''.join(out)
+
+
 def create_optimized_favicon() -> str:
-    """最適化されたファビコンを作成"""
+    """最適化されたファビコン（favicon.svgとして配布するSVGテキスト）を作成"""
     # より洗練されたアイコンデザイン
     favicon_svg = """<svg width="32" height="32" viewBox="0 0 32 32" xmlns="http://www.w3.org/2000/svg"><defs><linearGradient id="bg" x1="0%" y1="0%" x2="100%" y2="100%"><stop offset="0%" style="stop-color:#004274"/><stop offset="100%" style="stop-color:#16213e"/></linearGradient></defs><rect width="32" height="32" fill="url(#bg)" rx="4"/><circle cx="16" cy="12" r="4" fill="#ffffff" stroke="#4ecdc4" stroke-width="1"/><rect x="13" y="22" width="6" height="8" rx="3" fill="#00ff00"/><path d="M8 20h16v1H8z" fill="#cccccc" opacity="0.8"/></svg>"""
-    favicon_base64 = base64.b64encode(favicon_svg.encode()).decode()
-    return f"data:image/svg+xml;base64,{favicon_base64}"
-
-
-def generate_audio_system() -> str:
-    """Web Audio API音声システムを生成"""
-    return """
-        // 🔊 軽量効果音システム（Web Audio API）
-        class GameAudioEngine {
-            constructor() {
-                this.audioContext = null;
-                this.sounds = {
-                    "paddle_hit": {
-                        "type": "beep",
-                        "frequency": 440,
-                        "duration": 0.1,
-                        "volume": 0.3
-                    },
-                    "wall_bounce": {
-                        "type": "beep",
-                        "frequency": 220,
-                        "duration": 0.08,
-                        "volume": 0.2
-                    },
-                    "game_over": {
-                        "type": "sweep",
-                        "start_freq": 440,
-                        "end_freq": 110,
-                        "duration": 0.5,
-                        "volume": 0.4
-                    },
-                    "score_up": {
-                        "type": "chord",
-                        "frequencies": [440, 554, 659],
-                        "duration": 0.3,
-                        "volume": 0.3
-                    }
-                };
-                this.enabled = true;
-                this.initAudio();
-            }
-            
-            initAudio() {
-                try {
-                    this.audioContext = new (window.AudioContext || window.webkitAudioContext)();
-                } catch (e) {
-                    console.warn('Web Audio API not supported');
-                    this.enabled = false;
-                }
-            }
-            
-            async playSound(soundName) {
-                if (!this.enabled || !this.audioContext) return;
-                
-                // ユーザー操作で音声コンテキストを再開
-                if (this.audioContext.state === 'suspended') {
-                    await this.audioContext.resume();
-                }
-                
-                const soundDef = this.sounds[soundName];
-                if (!soundDef) return;
-                
-                const oscillator = this.audioContext.createOscillator();
-                const gainNode = this.audioContext.createGain();
-                
-                oscillator.connect(gainNode);
-                gainNode.connect(this.audioContext.destination);
-                
-                const now = this.audioContext.currentTime;
-                
-                switch(soundDef.type) {
-                    case 'beep':
-                        oscillator.frequency.setValueAtTime(soundDef.frequency, now);
-                        break;
-                    case 'sweep':
-                        oscillator.frequency.setValueAtTime(soundDef.start_freq, now);
-                        oscillator.frequency.exponentialRampToValueAtTime(soundDef.end_freq, now + soundDef.duration);
-                        break;
-                    case 'chord':
-                        oscillator.frequency.setValueAtTime(soundDef.frequencies[0], now);
-                        break;
-                }
-                
-                gainNode.gain.setValueAtTime(soundDef.volume, now);
-                gainNode.gain.exponentialRampToValueAtTime(0.01, now + soundDef.duration);
-                
-                oscillator.start(now);
-                oscillator.stop(now + soundDef.duration);
+    return favicon_svg
+
+
+def generate_audio_module() -> str:
+    """Web Audio API音声システム（ES module）を生成"""
+    return """// 🔊 軽量効果音システム（Web Audio API）
+export class GameAudioEngine {
+    constructor() {
+        this.audioContext = null;
+        this.sounds = {
+            "paddle_hit": {
+                "type": "beep",
+                "frequency": 440,
+                "duration": 0.1,
+                "volume": 0.3
+            },
+            "wall_bounce": {
+                "type": "beep",
+                "frequency": 220,
+                "duration": 0.08,
+                "volume": 0.2
+            },
+            "game_over": {
+                "type": "sweep",
+                "start_freq": 440,
+                "end_freq": 110,
+                "duration": 0.5,
+                "volume": 0.4
+            },
+            "score_up": {
+                "type": "chord",
+                "frequencies": [440, 554, 659],
+                "duration": 0.3,
+                "volume": 0.3
             }
-            
-            // ゲームイベント用メソッド
-            playPaddleHit() { this.playSound('paddle_hit'); }
-            playWallBounce() { this.playSound('wall_bounce'); }
-            playGameOver() { this.playSound('game_over'); }
-            playScoreUp() { this.playSound('score_up'); }
+        };
+        this.enabled = true;
+        this.initAudio();
+    }
+
+    initAudio() {
+        try {
+            this.audioContext = new (window.AudioContext || window.webkitAudioContext)();
+        } catch (e) {
+            console.warn('Web Audio API not supported');
+            this.enabled = false;
         }
+    }
 
-        // グローバル音声インスタンス
-        window.gameAudio = new GameAudioEngine();
-        
-        // ユーザー操作で音声を有効化（ブラウザポリシー対応）
-        document.addEventListener('click', () => {
-            if (window.gameAudio && window.gameAudio.audioContext) {
-                window.gameAudio.audioContext.resume();
-            }
-        }, { once: true });"""
+    async playSound(soundName) {
+        if (!this.enabled || !this.audioContext) return;
+
+        // ユーザー操作で音声コンテキストを再開
+        if (this.audioContext.state === 'suspended') {
+            await this.audioContext.resume();
+        }
+
+        const soundDef = this.sounds[soundName];
+        if (!soundDef) return;
+
+        const oscillator = this.audioContext.createOscillator();
+        const gainNode = this.audioContext.createGain();
 
+        oscillator.connect(gainNode);
+        gainNode.connect(this.audioContext.destination);
 
+        const now = this.audioContext.currentTime;
+
+        switch(soundDef.type) {
+            case 'beep':
+                oscillator.frequency.setValueAtTime(soundDef.frequency, now);
+                break;
+            case 'sweep':
+                oscillator.frequency.setValueAtTime(soundDef.start_freq, now);
+                oscillator.frequency.exponentialRampToValueAtTime(soundDef.end_freq, now + soundDef.duration);
+                break;
+            case 'chord':
+                oscillator.frequency.setValueAtTime(soundDef.frequencies[0], now);
+                break;
+        }
+
+        gainNode.gain.setValueAtTime(soundDef.volume, now);
+        gainNode.gain.exponentialRampToValueAtTime(0.01, now + soundDef.duration);
+
+        oscillator.start(now);
+        oscillator.stop(now + soundDef.duration);
+    }
+
+    // ゲームイベント用メソッド
+    playPaddleHit() { this.playSound('paddle_hit'); }
+    playWallBounce() { this.playSound('wall_bounce'); }
+    playGameOver() { this.playSound('game_over'); }
+    playScoreUp() { this.playSound('score_up'); }
+}
+"""
+
+
+def generate_audio_loader() -> str:
+    """音声システムを最初のユーザー操作時に読み込むスタブを生成
+
+    ブラウザの自動再生ポリシーにより最初の操作までは音を鳴らせないため、
+    GameAudioEngine本体は別ファイルにして初期表示に必要なJavaScriptから外す。
+    """
+    return f"""
+        // 🔊 効果音システムは最初のクリック時に読み込む（ブラウザポリシー対応）
+        document.addEventListener('click', async () => {{
+            try {{
+                const {{ GameAudioEngine }} = await import('./{AUDIO_MODULE_NAME}');
+                window.gameAudio = new GameAudioEngine();
+                if (window.gameAudio.audioContext) {{
+                    window.gameAudio.audioContext.resume();
+                }}
+            }} catch (e) {{
+                console.warn('Audio module load failed:', e);
+            }}
+        }}, {{ once: true }});"""
+
+
+@functools.lru_cache(maxsize=None)
 def create_pwa_manifest() -> str:
     """PWA マニフェストを作成"""
+    # アイコンはviewBoxで拡大縮小できる1つのSVGファイルを全サイズで共有する
+    # （sizesは空白区切りで複数指定できる）
     manifest = {
         "name": "Ultimate Squash Game",
         "short_name": "Squash",
@@ -224,96 +292,240 @@ def create_pwa_manifest() -> str:
         "lang": "ja",
         "icons": [
             {
-                "src": "data:image/svg+xml;base64," + base64.b64encode(create_pwa_icon(72).encode()).decode(),
-                "sizes": "72x72",
-                "type": "image/svg+xml"
-            },
-            {
-                "src": "data:image/svg+xml;base64," + base64.b64encode(create_pwa_icon(192).encode()).decode(),
-                "sizes": "192x192", 
-                "type": "image/svg+xml"
-            },
-            {
-                "src": "data:image/svg+xml;base64," + base64.b64encode(create_pwa_icon(512).encode()).decode(),
-                "sizes": "512x512",
+                "src": PWA_ICON_NAME,
+                "sizes": " ".join(f"{size}x{size}" for size in PWA_ICON_SIZES),
                 "type": "image/svg+xml"
             }
         ]
     }
-    return json.dumps(manifest, ensure_ascii=False)
+    return json.dumps(manifest, ensure_ascii=False, separators=(',', ':'))
 
 
-def create_pwa_icon(size: int) -> str:
-    """PWA用アイコンSVGを作成"""
-    return f"""<svg width="{size}" height="{size}" viewBox="0 0 {size} {size}" xmlns="http://www.w3.org/2000/svg">
-<defs>
-<linearGradient id="bgGrad" x1="0%" y1="0%" x2="100%" y2="100%">
-<stop offset="0%" style="stop-color:#004274"/>
-<stop offset="100%" style="stop-color:#16213e"/>
-</linearGradient>
-</defs>
-<rect width="{size}" height="{size}" fill="url(#bgGrad)" rx="{max(4, size//16)}"/>
-<circle cx="{size//2}" cy="{size//2-size//8}" r="{max(4, size//8)}" fill="#ffffff"/>
-<rect x="{size//2-size//8}" y="{size-size//4}" width="{size//4}" height="{size//16}" rx="{size//32}" fill="#00ff00"/>
-</svg>"""
+@functools.lru_cache(maxsize=None)
+def create_pwa_icon(size: Optional[int] = None) -> str:
+    """PWA用アイコンSVGを作成
+
+    図形は32単位のviewBox内の固定座標なので、サイズを指定しても変わるのは
+    外側のwidth/heightだけ（省略時はブラウザ側で任意のサイズに拡大縮小）。
+    """
+    size_attrs = f' width="{size}" height="{size}"' if size else ''
+    return f'<svg{size_attrs} viewBox="0 0 32 32" xmlns="http://www.w3.org/2000/svg">{_PWA_ICON_BODY}</svg>'
 
 
 def minify_final_html(content: str) -> str:
-    """最終HTMLの最小化"""
-    import re
-    
-    # JavaScriptコメント除去（//で始まる行）
-    content = re.sub(r'^\s*//.*$', '', content, flags=re.MULTILINE)
-    
-    # 複数の空白行を単一に
-    content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
-    
-    # 行頭・行末の空白を除去
-    lines = [line.strip() for line in content.split('\n')]
-    content = '\n'.join(line for line in lines if line)
+    """最終HTMLの最小化
+
+    HTML全体を1回だけ走査し、各行の前後の空白と空行を除去する。
+    <script>内ではJavaScriptのコメントも除去するが、文字列・テンプレートリテラル・
+    正規表現リテラルの中身（埋め込みPythonコードのインデントやURL中の//など）は
+    そのまま残す。
+    """
+    out = []
+    line_start = True   # 出力中の行にまだ内容がないか
+    pending_ws = ''     # 行末なら捨て、同じ行に内容が続けば出力する空白
     
-    return content
+    def emit_code(start: int, end: int) -> None:
+        """コード部分を出力（行頭・行末の空白と空行を除去）"""
+        nonlocal line_start, pending_ws
+        for i, line in enumerate(content[start:end].split('\n')):
+            if i:
+                pending_ws = ''
+                if not line_start:
+                    out.append('\n')
+                    line_start = True
+            if line_start:
+                line = line.lstrip()
+            body = line.rstrip()
+            if body:
+                out.append(pending_ws)
+                out.append(body)
+                pending_ws = line[len(body):]
+                line_start = False
+            elif not line_start:
+                pending_ws += line
+                
+    def emit_literal(start: int, end: int) -> None:
+        """リテラル部分を加工せずに出力"""
+        nonlocal line_start, pending_ws
+        out.append(pending_ws)
+        out.append(content[start:end])
+        pending_ws = ''
+        line_start = False
+        
+    pos = 0
+    length = len(content)
+    while pos < length:
+        # HTML部分: 次の<script>開始タグの終わりまで
+        script_open = content.find('<script', pos)
+        if script_open == -1:
+            emit_code(pos, length)
+            break
+        body_start = content.find('>', script_open) + 1 or length
+        emit_code(pos, body_start)
+        body_end = content.find('</script>', body_start)
+        if body_end == -1:
+            body_end = length
+        
+        # JavaScript部分
+        segment = body_start
+        i = body_start
+        while True:
+            match = _JS_SPECIAL_RE.search(content, i, body_end)
+            if match is None:
+                break
+            j = match.start()
+            char = content[j]
+            if char in '\'"`':
+                # 文字列・テンプレートリテラル（${...}内の入れ子のバッククォートは非対応）
+                k = _find_literal_end(content, j + 1, char, body_end)
+                emit_code(segment, j)
+                emit_literal(j, k)
+                segment = i = k
+            elif content.startswith('//', j):
+                # 行コメント（改行自体はコードとして残す）
+                emit_code(segment, j)
+                k = content.find('\n', j, body_end)
+                segment = i = body_end if k == -1 else k
+            elif content.startswith('/*', j):
+                # ブロックコメント
+                emit_code(segment, j)
+                k = content.find('*/', j + 2, body_end)
+                segment = i = body_end if k == -1 else k + 2
+            elif _starts_regex_literal(content, segment, j):
+                k = _find_regex_end(content, j + 1, body_end)
+                emit_code(segment, j)
+                emit_literal(j, k)
+                segment = i = k
+            else:
+                # 除算演算子
+                i = j + 1
+        emit_code(segment, body_end)
+        pos = body_end
+        
+    return ''.join(out)
+
+
+def _find_literal_end(content: str, start: int, quote: str, end: int) -> int:
+    """クォートで始まるリテラルの終端（閉じクォートの次の位置）を返す"""
+    k = start
+    while True:
+        k = content.find(quote, k, end)
+        if k == -1:
+            return end
+        # 直前のバックスラッシュが奇数個ならエスケープされている
+        b = k - 1
+        while content[b] == '\\':
+            b -= 1
+        if (k - 1 - b) % 2 == 0:
+            return k + 1
+        k += 1
+
+
+def _starts_regex_literal(content: str, start: int, slash: int) -> bool:
+    """slash位置の/が除算ではなく正規表現リテラルの開始かどうか（直前のトークンで判定）"""
+    k = slash - 1
+    while k >= start and content[k].isspace():
+        k -= 1
+    if k < start:
+        return True
+    if content[k] in _JS_REGEX_PRECEDING_CHARS:
+        return True
+    word_end = k + 1
+    while k >= start and (content[k].isalnum() or content[k] in '_$'):
+        k -= 1
+    return content[k + 1:word_end] in _JS_REGEX_PRECEDING_KEYWORDS
+
+
+def _find_regex_end(content: str, start: int, end: int) -> int:
+    """正規表現リテラルの終端（フラグを含む）を返す"""
+    k = start
+    in_class = False
+    while k < end:
+        char = content[k]
+        if char == '\\':
+            k += 2
+            continue
+        if char == '\n':
+            return k
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            k += 1
+            while k < end and content[k].isalpha():
+                k += 1
+            return k
+        k += 1
+    return end
 
 
 def create_final_distribution_bundle(html_path: Path):
     """最終配布用バンドルを作成"""
     print("\n📦 最終配布バンドル作成中...")
     
+    dist_dir = DISTRIBUTION_DIR
+    bundle_name = "ultimate_squash_final"
+    bundle_file = dist_dir / f"{bundle_name}.tar.gz"
+    
+    # 配信するファイル（メインHTMLはindex.htmlとして配置）
+    assets = {
+        "index.html": html_path.read_bytes(),
+        PWA_MANIFEST_NAME: create_pwa_manifest().encode('utf-8'),
+        PWA_ICON_NAME: create_pwa_icon().encode('utf-8'),
+        FAVICON_NAME: create_optimized_favicon().encode('utf-8'),
+        AUDIO_MODULE_NAME: generate_audio_module().encode('utf-8'),
+    }
+    
+    # 配信ファイルがすべて同じ内容で、圧縮バンドルがそれより新しければ再作成を省略
+    if bundle_file.exists() and is_distribution_current(dist_dir, assets, bundle_file.stat().st_mtime_ns):
+        print(f"♻️ 配信ファイルに変更がないため既存の配布バンドルを使用: {bundle_file}")
+        return
+    
     # 配布用ディレクトリ作成
-    dist_dir = Path("distribution")
     if dist_dir.exists():
         shutil.rmtree(dist_dir)
     dist_dir.mkdir()
     
-    # メインHTMLファイルをindex.htmlとしてコピー
-    shutil.copy2(html_path, dist_dir / "index.html")
+    for name, data in assets.items():
+        (dist_dir / name).write_bytes(data)
     
-    # 配布用README作成
+    # 配布用README作成（サイズは配信ファイルの合計から算出）
+    served_size = sum(len(data) for data in assets.values())
     readme_content = f"""# Ultimate Squash Game - 配布バンドル
 
 ## 概要
 Ultimate Squash GameのPython/WebAssembly版最終配布バンドルです。
 
 ## ファイル構成
-- `index.html` - メインゲームファイル（自己完結型）
+- `index.html` - メインゲームファイル
+- `manifest.webmanifest` - PWAマニフェスト
+- `icon.svg` - PWAアイコン（全サイズ共通のSVG）
+- `favicon.svg` - ファビコン
+- `audio.js` - 効果音システム（最初のクリック時に読み込み）
 
 ## 特徴
-- **軽量**: 約24KB（圧縮なし）
-- **自己完結**: 外部依存なし
-- **PWA対応**: オフライン動作可能
+- **軽量**: 配信ファイル合計 約{served_size / 1024:.1f}KB（圧縮なし、上記{len(assets)}ファイル）
+- **外部依存**: Pyodide本体のみ（jsDelivr CDNから読み込むため、プレイにはネットワーク接続が必要）
+- **PWA対応**: マニフェスト・アイコンによりホーム画面へ追加可能
 - **効果音内蔵**: Web Audio API
 - **レスポンシブ**: モバイル対応
 
 ## デプロイ方法
+`index.html` は同じディレクトリの `manifest.webmanifest`・`icon.svg`・`favicon.svg`・`audio.js` を
+相対パスで参照し、`audio.js` は `import()` で動的に読み込みます。
+**ディレクトリ全体**をHTTP(S)で配信してください（`file://` で直接開くと効果音が読み込めません）。
 
 ### 1. 基本的なWebサーバー
 ```bash
-# index.htmlを静的ファイルとして配信
+# distributionディレクトリをドキュメントルートとして配信（ローカル確認の例）
+python -m http.server 8000 --directory distribution
 ```
 
 ### 2. GitHub Pages
 ```bash
-git add distribution/index.html
+# distributionディレクトリ全体をコミットし、Pagesの公開元に設定する
+git add distribution/
 git commit -m "Deploy game"
 git push origin main
 ```
@@ -323,10 +535,28 @@ git push origin main
 - Netlify  
 - CloudFlare Pages
 
+### 事前圧縮ファイルの配信
+`index.html.br`（Brotli）と `index.html.gz`（gzip）を同梱しています。
+リクエストの `Accept-Encoding` に `br` があれば `.br` を、`gzip` があれば `.gz` を
+`Content-Encoding` ヘッダー付きで返し、どちらもなければ `index.html` を返すよう
+サーバーを設定してください（例: nginxの `brotli_static on;` / `gzip_static on;`）。
+
+### 共有辞書（対応するbrotliでビルドした場合）
+`shared-dictionary.txt` がある場合は、各ファイルをこの辞書で圧縮した `.dcb` も同梱しています。
+辞書は `Use-As-Dictionary: match="/*"` ヘッダー付きで配信し、HTMLのレスポンスに
+`Link: </shared-dictionary.txt>; rel="compression-dictionary"` を付けてください。
+リクエストの `Available-Dictionary` が辞書のハッシュと一致し、`Accept-Encoding` に
+`dcb` があれば `.dcb` を `Content-Encoding: dcb` で返します（非対応ブラウザは通常の `.br` / `.gz`）。
+
+### キャッシュ設定
+`favicon.svg` と `icon.svg` はHTMLと独立してキャッシュできるため、
+`Cache-Control: public, max-age=31536000, immutable` を付けて配信してください。
+（内容を変更する場合はファイル名を変えてください）
+
 ## 技術仕様
 - **Python**: 3.12 (Pyodide)
 - **WebAssembly**: あり
-- **音声**: Web Audio API（外部ファイル不要）
+- **音声**: Web Audio API（音声ファイル不要、audio.jsを遅延読み込み）
 - **アイコン**: SVG（スケーラブル）
 - **キャッシュ**: ブラウザキャッシュ対応
 
@@ -334,31 +564,57 @@ git push origin main
 作成日時: {get_timestamp()}
 """
     
-    with open(dist_dir / "README.md", 'w', encoding='utf-8') as f:
-        f.write(readme_content)
+    (dist_dir / "README.md").write_bytes(readme_content.encode('utf-8'))
     
     # 圧縮バンドル作成
-    bundle_name = "ultimate_squash_final"
-    shutil.make_archive(
-        base_name=str(dist_dir / bundle_name),
-        format='gztar',
-        root_dir=str(dist_dir)
-    )
-    
-    bundle_file = dist_dir / f"{bundle_name}.tar.gz"
+    create_tar_gz(dist_dir, bundle_file)
     bundle_size = bundle_file.stat().st_size
     
+    # 共通部分（SVGの前置き・配色・マニフェストなど）から共有辞書を作成
+    # （辞書を指定できるbrotliの場合のみ）
+    dictionary = None
+    if brotli_supports_dictionary():
+        dictionary = build_shared_dictionary(assets)
+        (dist_dir / SHARED_DICTIONARY_NAME).write_bytes(dictionary)
+    
+    # 静的ホスティング向けにindex.html・マニフェスト・ファビコン・音声モジュールの事前圧縮版を作成
+    precompressed = create_precompressed_variants(
+        dist_dir / "index.html", dist_dir / PWA_MANIFEST_NAME, dist_dir / FAVICON_NAME,
+        dist_dir / AUDIO_MODULE_NAME, dictionary=dictionary
+    )
+    
     print(f"✅ 最終配布バンドル完成:")
     print(f"   📁 ディレクトリ: {dist_dir}")
     print(f"   📄 メインファイル: index.html")
     print(f"   📦 圧縮バンドル: {bundle_file}")
     print(f"   📊 圧縮サイズ: {bundle_size:,} bytes ({bundle_size/1024:.1f} KB)")
+    for variant, size in precompressed.items():
+        print(f"   🗜️ {variant}: {size:,} bytes ({size/1024:.1f} KB)")
+
+
+def build_shared_dictionary(assets: dict) -> bytes:
+    """配信ファイル間で共通する部分から共有辞書を作成
+
+    マニフェスト・SVGアイコン・HTMLの<head>を連結し、SHARED_DICTIONARY_MAX_SIZEに収める。
+    """
+    html = assets["index.html"]
+    head_end = html.find(b'</head>')
+    parts = [
+        assets[PWA_MANIFEST_NAME],
+        assets[PWA_ICON_NAME],
+        assets[FAVICON_NAME],
+        html[:head_end] if head_end != -1 else html,
+    ]
+    return b'\n'.join(parts)[:SHARED_DICTIONARY_MAX_SIZE]
 
 
-def get_timestamp() -> str:
-    """現在のタイムスタンプを取得"""
-    from datetime import datetime
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def is_distribution_current(dist_dir: Path, assets: dict, bundle_mtime_ns: int) -> bool:
+    """配布ディレクトリの各ファイルが同じ内容で、圧縮バンドルより古いかどうか"""
+    for name, data in assets.items():
+        path = dist_dir / name
+        if not path.exists() or path.stat().st_mtime_ns > bundle_mtime_ns or path.read_bytes() != data:
+            return False
+    return True
 
 
 def main():
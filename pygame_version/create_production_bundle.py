@@ -1,10 +1,13 @@
 """
 本番環境用の軽量バンドル作成
 """
+import os
 import shutil
 from pathlib import Path
 import json
 
+from _bundle_utils import create_precompressed_variants, create_tar_gz, get_timestamp
+
 
 def create_production_bundle():
     """本番環境用バンドルを作成"""
@@ -37,27 +40,37 @@ def create_production_bundle():
             print(f"  ✅ {src_path.name}: {size:,} bytes")
         elif src_path.is_dir():
             dest_path = prod_dir / src_path.name
-            shutil.copytree(src_path, dest_path)
-            dir_size = sum(f.stat().st_size for f in dest_path.rglob("*") if f.is_file())
+            # コピーしながらサイズを集計（コピー後にツリーを再走査しない）
+            copied_sizes = []
+            
+            def copy_and_measure(src, dst):
+                shutil.copy2(src, dst)
+                copied_sizes.append(os.stat(dst).st_size)
+                
+            shutil.copytree(src_path, dest_path, copy_function=copy_and_measure)
+            dir_size = sum(copied_sizes)
             total_size += dir_size
             print(f"  ✅ {src_path.name}/: {dir_size:,} bytes")
     
     # 本番用の軽量tar.gz作成
     bundle_name = "ultimate_squash_production"
-    shutil.make_archive(
-        base_name=str(prod_dir / bundle_name),
-        format='gztar',
-        root_dir=str(prod_dir)
-    )
-    
     bundle_file = prod_dir / f"{bundle_name}.tar.gz"
+    create_tar_gz(prod_dir, bundle_file)
     bundle_size = bundle_file.stat().st_size
     
+    # 静的ホスティング向けにHTMLの事前圧縮版を作成
+    precompressed = {}
+    html_file = prod_dir / "optimized_bundle.html"
+    if html_file.exists():
+        precompressed = create_precompressed_variants(html_file)
+    
     print(f"\n📊 本番バンドル情報:")
     print(f"  展開サイズ: {total_size:,} bytes")
     print(f"  圧縮サイズ: {bundle_size:,} bytes")
     print(f"  圧縮率: {(1 - bundle_size / total_size) * 100:.1f}%")
     print(f"  📄 ファイル: {bundle_file}")
+    for variant, size in precompressed.items():
+        print(f"  🗜️ {variant}: {size:,} bytes")
     
     # 本番バンドルのREADMEを作成
     create_production_readme(prod_dir, total_size, bundle_size)
@@ -81,6 +94,8 @@ Ultimate Squash GameのPyodide/WebAssembly版本番配布用バンドルです
 ```
 production/
 ├── optimized_bundle.html    # メインHTMLファイル（最適化済み）
+├── optimized_bundle.html.br # Brotli事前圧縮版（brotliがある場合）
+├── optimized_bundle.html.gz # gzip事前圧縮版
 ├── src/                     # 最適化されたPythonソースコード
 └── ultimate_squash_production.tar.gz  # 圧縮バンドル
 ```
@@ -109,6 +124,11 @@ git push origin public
 - Vercel
 - Netlify
 
+### 事前圧縮ファイルの配信
+リクエストの `Accept-Encoding` に `br` があれば `.br` を、`gzip` があれば `.gz` を
+`Content-Encoding` ヘッダー付きで返し、どちらもなければ元のHTMLを返すよう
+サーバーを設定してください（例: nginxの `brotli_static on;` / `gzip_static on;`）。
+
 ## 最適化内容
 1. **Pythonコード最適化**: コメント・空行除去 (-14.3%)
 2. **HTML最小化**: 空白・コメント除去 (-32.9%)
@@ -133,18 +153,11 @@ git push origin public
 """
     
     readme_file = prod_dir / "README.md"
-    with open(readme_file, 'w', encoding='utf-8') as f:
-        f.write(readme_content)
+    readme_file.write_bytes(readme_content.encode('utf-8'))
         
     print(f"  ✅ README作成: {readme_file}")
 
 
-def get_timestamp():
-    """タイムスタンプを取得"""
-    from datetime import datetime
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-
 def main():
     """メイン実行"""
     print("🚀 Ultimate Squash Game 本番バンドル作成")
@@ -3,101 +3,115 @@
 エラーハンドリング強化ツール
 本番環境での堅牢性向上のためのエラー処理システム
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import ast
+import os
 import re
 import json
 
 
-class ErrorHandlingEnhancer:
-    """エラーハンドリング強化クラス"""
-    
-    def __init__(self):
-        self.enhanced_features = {
-            "error_types": [],
-            "fallback_mechanisms": [],
-            "user_notifications": [],
-            "recovery_strategies": []
-        }
-    
-    def enhance_all_error_handling(self):
-        """すべてのエラーハンドリングを強化"""
-        print("🛡️ エラーハンドリング強化開始...")
-        
-        # 1. 主要HTMLファイルのエラーハンドリング強化
-        self.enhance_html_error_handling()
-        
-        # 2. Pythonコードのエラーハンドリング強化
-        self.enhance_python_error_handling()
-        
-        # 3. JavaScript統合エラーハンドリング
-        self.enhance_javascript_error_handling()
-        
-        # 4. エラーハンドリングレポート生成
-        self.generate_error_handling_report()
-        
-        return self.enhanced_features
-    
-    def enhance_html_error_handling(self):
-        """HTMLファイルのエラーハンドリング強化"""
-        print("  📄 HTML エラーハンドリング強化...")
-        
-        html_files = [
-            "ultimate_squash_optimized.html",
-            "production_template.html"
-        ]
-        
-        for html_file in html_files:
-            if Path(html_file).exists():
-                self.enhance_single_html_error_handling(html_file)
-    
-    def enhance_single_html_error_handling(self, html_file: str):
-        """単一HTMLファイルのエラーハンドリング強化"""
-        print(f"    強化中: {html_file}")
-        
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # 高度なエラーハンドリングJavaScriptを追加
-        enhanced_error_js = self.create_enhanced_error_handling_js()
-        
-        # エラーハンドリングJSを既存のscriptタグの直後に挿入
-        script_insert_pos = content.find('</script>')
-        if script_insert_pos != -1:
-            content = content[:script_insert_pos] + '\n        ' + enhanced_error_js + '\n        ' + content[script_insert_pos:]
-        
-        # エラーリカバリ機能を既存のエラーハンドラーに統合
-        content = self.integrate_error_recovery(content)
-        
-        # 強化版ファイルとして保存
-        enhanced_path = html_file.replace('.html', '_enhanced.html')
-        with open(enhanced_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        print(f"      ✅ 強化版作成: {enhanced_path}")
-        
-        self.enhanced_features["error_types"].append({
-            "file": enhanced_path,
-            "enhancements": [
-                "Network failure recovery",
-                "Pyodide initialization fallback",
-                "Memory shortage handling",
-                "Browser compatibility detection",
-                "User-friendly error messages"
-            ]
-        })
-    
-    def create_enhanced_error_handling_js(self) -> str:
-        """高度なエラーハンドリングJavaScriptを作成"""
-        return """
+# Pythonファイルに適用する置換パターン（ファイルごとに再コンパイルしないようモジュール読み込み時に1回だけ）
+_IMPORT_PYGAME_RE = re.compile(r'import pygame')
+_PYGAME_IMPORT_FALLBACK = """try:
+    import pygame
+except ImportError:
+    print("Warning: pygame not available, using fallback mode")
+    pygame = None"""
+_FUNCTION_RE = re.compile(r'^([ \t]*)(def\s+\w+\([^)]*\):[^\n]*\n)((?:\s{4,}.*\n)*)', re.MULTILINE)
+# 最初のトップレベル定義（直前のデコレータ行を含む）。AST解析できないソースでの挿入位置
+_TOP_LEVEL_DEFINITION_RE = re.compile(r'^(?:@[^\n]*\n)*(?:class|def|async[ \t]+def)\s', re.MULTILINE)
+_SAFE_FALLBACK_DECORATOR = '@safe_fallback'
+_SAFE_FALLBACK_SOURCE = '''from functools import wraps
+
+
+def safe_fallback(fn):
+    """例外を握りつぶしてNoneを返すフォールバック"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            print(f"Error in {fn.__name__}: {e}")
+            return None  # Safe fallback
+    return wrapper
+
+
+'''
+
+# HTMLへの挿入位置（最初の</script>と既存のinitializeGame関数）を1回の走査でまとめて探す
+_INSERTION_POINT_RE = re.compile(r'(</script>)|(async function initializeGame\(\))')
+
+# 生成するJavaScript（呼び出しのたびに組み立て直さないようモジュール定数として1回だけ保持）
+_ENHANCED_ERROR_JS = """
         // 🛡️ 高度なエラーハンドリングシステム
         class EnhancedErrorHandler {
             constructor() {
                 this.errorCounts = new Map();
                 this.maxRetries = 3;
-                this.retryDelays = [1000, 3000, 5000]; // ms
-                this.fallbackStrategies = new Map();
+                // 指数バックオフ + ジッター（ms）
+                this.baseDelay = 1000;
+                this.maxDelay = 30000;
+                this.jitter = 0.5;
+                // CDNごとのサーキットブレーカー（連続失敗したCDNは一定時間スキップ）
+                this.cdnHealth = new Map();
+                this.cdnFailureThreshold = 3;
+                this.cdnOpenDuration = 30000;
+                // 応答の遅いCDNを待たず、この間隔（ms）で次のCDNへも問い合わせる
+                this.cdnHedgeDelay = 800;
+                // 通知DOMは初回表示時にまとめて作成し、以降は使い回す
+                this.notificationPool = null;
+                this.notificationPoolSize = 5;
+                this.notificationIndex = 0;
+                // 低メモリモードで毎フレーム呼ぶ update_game のPyProxy（runPythonの都度パースを避ける）
+                this.updateGameFn = null;
+                // よく使うDOM要素の参照（DOM構築完了後に1回だけ取得）
+                this.el = null;
+                this.fallbackStrategies = null;
+                // エラー分類用キーワード（1回の正規表現走査で分類する。'webaudio' は 'audio' に含まれる）
+                // 大文字小文字は正規表現側で無視し、メッセージ全体の toLowerCase() コピーを作らない
+                this.errorClassRe = /pyodide|canvas|webgl|audio|memory|heap|network|fetch/gi;
+                this.pyodideRe = /pyodide/i;
+                this.keywordMap = {
+                    pyodide: 'pyodide_init',
+                    canvas: 'canvas_error', webgl: 'canvas_error',
+                    audio: 'audio_error',
+                    memory: 'memory_error', heap: 'memory_error',
+                    network: 'network_error', fetch: 'network_error'
+                };
+                // 複数のキーワードに該当した場合の優先順
+                this.errorClassOrder = ['pyodide_init', 'canvas_error', 'audio_error', 'memory_error', 'network_error'];
+                // 分類結果のキャッシュ（同じエラーが連続しても分類は1回だけ。古いものから破棄）
+                this.classifyCache = new Map();
+                this.classifyCacheSize = 64;
                 this.setupGlobalErrorHandling();
                 this.setupFallbackStrategies();
+                
+                if (document.readyState === 'loading') {
+                    document.addEventListener('DOMContentLoaded', () => this.getElements(), { once: true });
+                } else {
+                    this.getElements();
+                }
+            }
+            
+            getElements() {
+                if (this.el) {
+                    return this.el;
+                }
+                
+                const canvas = document.getElementById('gameCanvas');
+                const el = {
+                    canvas,
+                    ctx: canvas ? canvas.getContext('2d') : null,
+                    loadingOverlay: document.getElementById('loadingOverlay'),
+                    errorModal: document.getElementById('errorModal'),
+                    errorMessage: document.getElementById('errorMessage')
+                };
+                // DOM構築中はまだ要素が揃っていない可能性があるためキャッシュしない
+                if (document.readyState !== 'loading') {
+                    this.el = el;
+                }
+                return el;
             }
             
             setupGlobalErrorHandling() {
@@ -129,13 +143,19 @@ class ErrorHandlingEnhancer:
                         this.handleResourceError(event.target);
                     }
                 }, true);
+                
+                // ページ終了時にPyProxyを解放
+                window.addEventListener('pagehide', () => this.releaseUpdateGameFn());
             }
             
             setupFallbackStrategies() {
-                this.fallbackStrategies.set('pyodide_init', () => this.pyodideInitFallback());
-                this.fallbackStrategies.set('canvas_error', () => this.canvasFallback());
-                this.fallbackStrategies.set('audio_error', () => this.audioFallback());
-                this.fallbackStrategies.set('memory_error', () => this.memoryFallback());
+                // キーは固定なので、Mapではなく凍結したオブジェクトで持つ
+                this.fallbackStrategies = Object.freeze({
+                    pyodide_init: () => this.pyodideInitFallback(),
+                    canvas_error: () => this.canvasFallback(),
+                    audio_error: () => this.audioFallback(),
+                    memory_error: () => this.memoryFallback()
+                });
             }
             
             async handleGlobalError(errorInfo) {
@@ -153,7 +173,7 @@ class ErrorHandlingEnhancer:
                 }
                 
                 // フォールバック戦略の実行
-                const fallbackStrategy = this.fallbackStrategies.get(errorKey);
+                const fallbackStrategy = this.fallbackStrategies[errorKey];
                 if (fallbackStrategy) {
                     try {
                         await this.executeWithRetry(fallbackStrategy, currentCount);
@@ -166,30 +186,44 @@ class ErrorHandlingEnhancer:
             }
             
             classifyError(errorInfo) {
-                const message = errorInfo.message?.toLowerCase() || '';
-                const reason = errorInfo.reason?.toString().toLowerCase() || '';
+                const cacheKey = (errorInfo.message || '') + '\\u0000' + (errorInfo.reason || '');
+                let errorKey = this.classifyCache.get(cacheKey);
+                if (errorKey === undefined) {
+                    errorKey = this.computeErrorClass(errorInfo);
+                    this.classifyCache.set(cacheKey, errorKey);
+                    if (this.classifyCache.size > this.classifyCacheSize) {
+                        this.classifyCache.delete(this.classifyCache.keys().next().value);
+                    }
+                }
+                return errorKey;
+            }
+            
+            computeErrorClass(errorInfo) {
+                const message = errorInfo.message || '';
+                const reason = errorInfo.reason?.toString() || '';
                 
-                if (message.includes('pyodide') || reason.includes('pyodide')) {
+                if (this.pyodideRe.test(reason)) {
                     return 'pyodide_init';
                 }
-                if (message.includes('canvas') || message.includes('webgl')) {
-                    return 'canvas_error';
-                }
-                if (message.includes('audio') || message.includes('webaudio')) {
-                    return 'audio_error';
-                }
-                if (message.includes('memory') || message.includes('heap')) {
-                    return 'memory_error';
-                }
-                if (message.includes('network') || message.includes('fetch')) {
-                    return 'network_error';
+                
+                const matches = message.match(this.errorClassRe);
+                if (!matches) {
+                    return 'generic_error';
                 }
                 
-                return 'generic_error';
+                let best = this.errorClassOrder.length - 1;
+                for (const keyword of matches) {
+                    best = Math.min(best, this.errorClassOrder.indexOf(this.keywordMap[keyword.toLowerCase()]));
+                }
+                return this.errorClassOrder[best];
             }
             
             async executeWithRetry(strategy, attemptNumber) {
-                const delay = this.retryDelays[attemptNumber] || 5000;
+                // 再試行のタイミングが揃ってCDNへ集中しないようランダムな揺らぎを加える
+                const delay = Math.min(
+                    this.baseDelay * Math.pow(2, attemptNumber) * (1 + Math.random() * this.jitter),
+                    this.maxDelay
+                );
                 
                 this.showRetryMessage(attemptNumber + 1, delay);
                 
@@ -216,28 +250,96 @@ class ErrorHandlingEnhancer:
                     "https://cdnjs.cloudflare.com/ajax/libs/pyodide/0.26.4/"
                 ];
                 
-                for (const cdn of alternativeCDNs) {
+                // 遮断中のCDNは再試行しない（期限後に1回だけ試す half-open）
+                const now = Date.now();
+                const failed = new Set();
+                let candidates = alternativeCDNs.filter(cdn => !(this.cdnHealth.get(cdn)?.openUntil > now));
+                
+                while (candidates.length > 0) {
+                    const cdn = await this.raceCDNs(candidates, failed);
+                    if (!cdn) {
+                        break;
+                    }
+                    
+                    let loaded = false;
                     try {
                         window.pyodide = await loadPyodide({ indexURL: cdn });
-                        console.log('✅ 代替CDNで成功:', cdn);
+                        loaded = true;
+                        this.cdnHealth.delete(cdn);
+                        console.info('✅ 代替CDNで成功 (X-Fallback-From):', cdn);
                         await this.reinitializeGame();
                         return;
                     } catch (error) {
-                        console.warn('❌ CDN失敗:', cdn, error);
+                        if (loaded) {
+                            // CDNは正常。ゲームの再初期化失敗は呼び出し元で扱う
+                            throw error;
+                        }
+                        this.recordCdnFailure(cdn, error);
+                        failed.add(cdn);
                     }
+                    candidates = candidates.filter(candidate => !failed.has(candidate));
                 }
                 
                 throw new Error('All Pyodide CDNs failed');
             }
             
+            // CDNへ cdnHedgeDelay ずつずらして問い合わせ、最初に応答したCDNを返す
+            // （残りの問い合わせは中断し、まだ始めていないものは開始しない）
+            async raceCDNs(candidates, failed) {
+                const timers = [];
+                const controllers = [];
+                const probes = candidates.map((cdn, index) => new Promise((resolve, reject) => {
+                    timers.push(setTimeout(async () => {
+                        const controller = new AbortController();
+                        controllers.push(controller);
+                        try {
+                            const response = await fetch(cdn + 'pyodide-lock.json', {
+                                method: 'HEAD',
+                                cache: 'no-store',
+                                signal: controller.signal
+                            });
+                            // fetchラッパーが失敗を代替Response（urlが空）に差し替える場合も失敗として扱う
+                            if (!response.ok || !response.url) {
+                                throw new Error(`CDN probe failed: ${response.status}`);
+                            }
+                            resolve(cdn);
+                        } catch (error) {
+                            if (error.name !== 'AbortError') {
+                                this.recordCdnFailure(cdn, error);
+                                failed.add(cdn);
+                            }
+                            reject(error);
+                        }
+                    }, index * this.cdnHedgeDelay));
+                }));
+                
+                try {
+                    return await Promise.any(probes);
+                } catch (error) {
+                    return null;
+                } finally {
+                    timers.forEach(clearTimeout);
+                    controllers.forEach(controller => controller.abort());
+                }
+            }
+            
+            recordCdnFailure(cdn, error) {
+                const health = this.cdnHealth.get(cdn) || { failures: 0, openUntil: 0 };
+                health.failures++;
+                if (health.failures >= this.cdnFailureThreshold) {
+                    health.openUntil = Date.now() + this.cdnOpenDuration;
+                }
+                this.cdnHealth.set(cdn, health);
+                console.warn('❌ CDN失敗:', cdn, error);
+            }
+            
             canvasFallback() {
                 console.log('🔄 Canvas フォールバック実行...');
                 
-                const canvas = document.getElementById('gameCanvas');
+                const { canvas, ctx } = this.getElements();
                 if (canvas) {
                     // Canvas代替表示
                     canvas.style.background = '#000';
-                    const ctx = canvas.getContext('2d');
                     if (ctx) {
                         ctx.fillStyle = '#fff';
                         ctx.font = '20px Arial';
@@ -281,23 +383,42 @@ class ErrorHandlingEnhancer:
                 // フレームレート削減
                 if (window.gameLoop) {
                     cancelAnimationFrame(window.gameLoop);
-                    // 30 FPSに削減
-                    window.gameLoop = setInterval(() => {
-                        try {
-                            const frameData = pyodide.runPython('update_game()');
-                            drawFrame(frameData);
-                        } catch (error) {
-                            console.error('Low memory game loop error:', error);
+                    // 30 FPSに削減（rAFのまま1フレームおきに更新し、垂直同期と非表示タブでの自動停止を保つ）
+                    let frame = 0;
+                    const lowMemoryLoop = () => {
+                        if (++frame % 2 === 0) {
+                            try {
+                                // 解放後（再初期化・bfcache復帰）は次のフレームで取り直す
+                                if (!this.updateGameFn) {
+                                    this.updateGameFn = pyodide.globals.get('update_game');
+                                }
+                                const frameData = this.updateGameFn();
+                                drawFrame(frameData);
+                            } catch (error) {
+                                console.error('Low memory game loop error:', error);
+                            }
                         }
-                    }, 1000/30);
+                        window.gameLoop = requestAnimationFrame(lowMemoryLoop);
+                    };
+                    window.gameLoop = requestAnimationFrame(lowMemoryLoop);
+                }
+            }
+            
+            releaseUpdateGameFn() {
+                if (this.updateGameFn) {
+                    this.updateGameFn.destroy();
+                    this.updateGameFn = null;
                 }
             }
             
             async reinitializeGame() {
                 console.log('🎮 ゲーム再初期化...');
                 
+                // 古いPyodideインスタンスのPyProxyは使えないため解放
+                this.releaseUpdateGameFn();
+                
                 // ローディング画面を再表示
-                const loadingOverlay = document.getElementById('loadingOverlay');
+                const { loadingOverlay } = this.getElements();
                 if (loadingOverlay) {
                     loadingOverlay.style.display = 'flex';
                     loadingOverlay.style.opacity = '1';
@@ -354,50 +475,86 @@ class ErrorHandlingEnhancer:
                 });
             }
             
+            ensureNotificationPool() {
+                if (this.notificationPool) {
+                    return this.notificationPool;
+                }
+                
+                // スタイルは<style>で1回だけ定義し、通知ごとにcssTextを解析させない
+                const style = document.createElement('style');
+                style.textContent = `
+                    .error-notification {
+                        position: fixed;
+                        top: 20px;
+                        right: 20px;
+                        padding: 12px 20px;
+                        border-radius: 6px;
+                        color: white;
+                        font-size: 14px;
+                        font-weight: 500;
+                        z-index: 10000;
+                        max-width: 300px;
+                        box-shadow: 0 4px 12px rgba(0,0,0,0.3);
+                        background: ${this.getNotificationColor('info')};
+                        transform: translateX(350px);
+                        transition: transform 0.3s ease;
+                    }
+                    .error-notification.error-visible {
+                        transform: translateX(0);
+                    }
+                ` + ['success', 'info', 'warning', 'error']
+                    .map(type => `.error-${type} { background: ${this.getNotificationColor(type)}; }`)
+                    .join('\\n');
+                document.head.appendChild(style);
+                
+                // まとめてDocumentFragmentに用意し、bodyへの追加は1回にする
+                const fragment = document.createDocumentFragment();
+                this.notificationPool = Array.from({ length: this.notificationPoolSize }, () => {
+                    const node = document.createElement('div');
+                    node.className = 'error-notification';
+                    node.hidden = true;
+                    // スライドアウトが終わったら非表示にする（タイマーを重ねない）
+                    node.addEventListener('transitionend', () => {
+                        if (!node.classList.contains('error-visible')) {
+                            node.hidden = true;
+                        }
+                    });
+                    fragment.appendChild(node);
+                    return { node, frame: 0, timer: 0 };
+                });
+                document.body.appendChild(fragment);
+                return this.notificationPool;
+            }
+            
             showNotification(message, type = 'info') {
-                // トースト通知風の非侵入的表示
-                const notification = document.createElement('div');
+                // トースト通知風の非侵入的表示（プール済みのノードを順番に再利用）
+                const pool = this.ensureNotificationPool();
+                const slot = pool[this.notificationIndex];
+                this.notificationIndex = (this.notificationIndex + 1) % pool.length;
+                
+                cancelAnimationFrame(slot.frame);
+                clearTimeout(slot.timer);
+                const notification = slot.node;
                 notification.className = `error-notification error-${type}`;
                 notification.textContent = message;
-                notification.style.cssText = `
-                    position: fixed;
-                    top: 20px;
-                    right: 20px;
-                    padding: 12px 20px;
-                    border-radius: 6px;
-                    color: white;
-                    font-size: 14px;
-                    font-weight: 500;
-                    z-index: 10000;
-                    max-width: 300px;
-                    box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-                    background: ${this.getNotificationColor(type)};
-                    transform: translateX(350px);
-                    transition: transform 0.3s ease;
-                `;
-                
-                document.body.appendChild(notification);
-                
-                // アニメーション表示
-                setTimeout(() => {
-                    notification.style.transform = 'translateX(0)';
-                }, 100);
+                notification.hidden = false;
                 
-                // 自動削除
-                setTimeout(() => {
-                    notification.style.transform = 'translateX(350px)';
-                    setTimeout(() => {
-                        if (notification.parentNode) {
-                            notification.parentNode.removeChild(notification);
-                        }
-                    }, 300);
+                // アニメーション表示（表示直後の位置を1フレーム描画してから次のフレームでスライドイン）
+                slot.frame = requestAnimationFrame(() => {
+                    slot.frame = requestAnimationFrame(() => {
+                        notification.classList.add('error-visible');
+                    });
+                });
+                
+                // 自動で隠す（非表示への切り替えはtransitionendで行う）
+                slot.timer = setTimeout(() => {
+                    notification.classList.remove('error-visible');
                 }, type === 'error' ? 5000 : 3000);
             }
             
             showPersistentError(message, errorDetails) {
                 // 既存のエラーモーダルを使用
-                const errorModal = document.getElementById('errorModal');
-                const errorMessage = document.getElementById('errorMessage');
+                const { errorModal, errorMessage } = this.getElements();
                 
                 if (errorModal && errorMessage) {
                     errorMessage.textContent = message;
@@ -423,217 +580,37 @@ class ErrorHandlingEnhancer:
         window.enhancedErrorHandler = new EnhancedErrorHandler();
         
         console.log('🛡️ Enhanced Error Handling System initialized');"""
-    
-    def integrate_error_recovery(self, content: str) -> str:
-        """エラーリカバリ機能を既存コードに統合"""
-        # 既存のinitializeGame関数を強化
-        error_recovery_integration = """
-        // エラーリカバリ機能統合
-        const originalInitializeGame = initializeGame;
-        
-        initializeGame = async function() {
-            const maxAttempts = 3;
-            let attempts = 0;
-            
-            while (attempts < maxAttempts) {
-                try {
-                    attempts++;
-                    updateLoadingProgress(`初期化試行 ${attempts}/${maxAttempts}...`);
-                    
-                    await originalInitializeGame();
-                    return; // 成功時は終了
-                    
-                } catch (error) {
-                    console.error(`Initialization attempt ${attempts} failed:`, error);
-                    
-                    if (attempts >= maxAttempts) {
-                        // 最終試行失敗時は簡易フォールバックモード
-                        showError(
-                            'ゲームの完全初期化に失敗しました。簡易モードで実行します。',
-                            error.message
-                        );
-                        await initializeFallbackMode();
-                        return;
-                    }
-                    
-                    // 次の試行前に少し待機
-                    await new Promise(resolve => setTimeout(resolve, 1000 * attempts));
-                }
-            }
-        };
-        
-        // フォールバックモード
-        async function initializeFallbackMode() {
-            console.log('🔄 Fallback mode initialization...');
-            
-            // 最小限のCanvas表示
-            const canvas = document.getElementById('gameCanvas');
-            const ctx = canvas.getContext('2d');
-            
-            if (ctx) {
-                ctx.fillStyle = '#000';
-                ctx.fillRect(0, 0, canvas.width, canvas.height);
-                
-                ctx.fillStyle = '#fff';
-                ctx.font = '24px Arial';
-                ctx.textAlign = 'center';
-                ctx.fillText('Simple Mode', canvas.width/2, canvas.height/2 - 20);
-                
-                ctx.font = '16px Arial';
-                ctx.fillStyle = '#ccc';
-                ctx.fillText('Game running in compatibility mode', canvas.width/2, canvas.height/2 + 20);
-            }
-            
-            hideLoading();
-            
-            // 基本的なキーボードイベント
-            document.addEventListener('keydown', function(event) {
-                if (event.key === 'r' || event.key === 'R') {
-                    location.reload();
-                }
-            });
-        }"""
-        
-        # 既存のinitializeGame関数の直前に挿入
-        init_pos = content.find('async function initializeGame()')
-        if init_pos != -1:
-            content = content[:init_pos] + error_recovery_integration + '\n        \n        ' + content[init_pos:]
-        
-        return content
-    
-    def enhance_python_error_handling(self):
-        """Pythonコードのエラーハンドリング強化"""
-        print("  🐍 Python エラーハンドリング強化...")
-        
-        # 主要なPythonファイルのエラーハンドリングを強化
-        python_files = [
-            "src/model/pygame_game_state.py",
-            "src/view/optimized_web_game_view.py",
-            "src/controller/web_game_controller.py"
-        ]
-        
-        for py_file in python_files:
-            if Path(py_file).exists():
-                self.enhance_python_file_error_handling(py_file)
-    
-    def enhance_python_file_error_handling(self, py_file: str):
-        """単一Pythonファイルのエラーハンドリング強化"""
-        print(f"    強化中: {py_file}")
-        
-        with open(py_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # エラーハンドリング強化パターンを適用
-        enhanced_content = self.apply_python_error_patterns(content)
-        
-        # 強化版ファイルとして保存
-        enhanced_path = py_file.replace('.py', '_enhanced.py')
-        with open(enhanced_path, 'w', encoding='utf-8') as f:
-            f.write(enhanced_content)
-        
-        print(f"      ✅ 強化版作成: {enhanced_path}")
-        
-        self.enhanced_features["fallback_mechanisms"].append({
-            "file": enhanced_path,
-            "enhancements": [
-                "Try-catch wrapping",
-                "Default value fallbacks",
-                "Input validation",
-                "Resource availability checks"
-            ]
-        })
-    
-    def apply_python_error_patterns(self, content: str) -> str:
-        """Pythonエラーハンドリングパターンを適用"""
-        # インポート文にtry-except追加
-        if 'import pygame' in content:
-            content = re.sub(
-                r'import pygame',
-                """try:
-    import pygame
-except ImportError:
-    print("Warning: pygame not available, using fallback mode")
-    pygame = None""",
-                content
-            )
-        
-        # 関数にエラーハンドリング追加
-        content = self.add_function_error_handling(content)
-        
-        return content
-    
-    def add_function_error_handling(self, content: str) -> str:
-        """関数レベルのエラーハンドリングを追加"""
-        # def関数の開始を検出してtry-except追加
-        function_pattern = r'(def\s+\w+\([^)]*\):[^\n]*\n)((?:\s{4,}.*\n)*)'
-        
-        def enhance_function(match):
-            func_def = match.group(1)
-            func_body = match.group(2)
-            
-            if 'try:' in func_body:  # 既にtry-exceptがある場合はスキップ
-                return match.group(0)
-            
-            # 関数本体をtry-exceptでラップ
-            indent = '    '  # 基本インデント
-            enhanced_body = f"""{indent}try:
-{func_body.rstrip()}
-{indent}except Exception as e:
-{indent}    print(f"Error in function: {{e}}")
-{indent}    return None  # Safe fallback
-"""
-            
-            return func_def + enhanced_body
-        
-        return re.sub(function_pattern, enhance_function, content, flags=re.MULTILINE)
-    
-    def enhance_javascript_error_handling(self):
-        """JavaScript統合エラーハンドリング"""
-        print("  🌐 JavaScript エラーハンドリング強化...")
-        
-        # JavaScript エラーハンドリングテンプレートを作成
-        js_error_handling = self.create_javascript_error_handling()
-        
-        # 統合用JavaScriptファイルとして保存
-        with open("enhanced_error_handling.js", 'w', encoding='utf-8') as f:
-            f.write(js_error_handling)
-        
-        print("    ✅ JavaScript エラーハンドリング作成: enhanced_error_handling.js")
-        
-        self.enhanced_features["recovery_strategies"].append({
-            "component": "JavaScript Integration",
-            "features": [
-                "Global error catching",
-                "Promise rejection handling",
-                "Resource loading fallbacks",
-                "Automatic retry mechanisms",
-                "User notification system"
-            ]
-        })
-    
-    def create_javascript_error_handling(self) -> str:
-        """JavaScript エラーハンドリングテンプレートを作成"""
-        return """
+
+_JS_ERROR_HANDLING = """
 // 🛡️ Enhanced JavaScript Error Handling for Ultimate Squash Game
 
 class GameErrorRecovery {
     constructor() {
         this.recoveryAttempts = 0;
         this.maxRecoveryAttempts = 3;
-        this.lastErrorTime = 0;
+        this.recentErrors = new Map(); // message key -> last logged time
+        this.errorRingSize = 16;
         this.errorCooldown = 5000; // 5 seconds
         
         this.setupErrorHandling();
     }
     
     setupErrorHandling() {
-        // Prevent error spam
+        // Prevent error spam: throttle repeats of the same message only,
+        // so unrelated errors inside the cooldown window are still logged
         const originalConsoleError = console.error;
         console.error = (...args) => {
             const now = Date.now();
-            if (now - this.lastErrorTime > this.errorCooldown) {
+            const key = String(args[0]).slice(0, 80);
+            const last = this.recentErrors.get(key) || 0;
+            if (now - last > this.errorCooldown) {
                 originalConsoleError.apply(console, args);
-                this.lastErrorTime = now;
+                // Re-insert so the Map stays ordered oldest-first
+                this.recentErrors.delete(key);
+                this.recentErrors.set(key, now);
+                if (this.recentErrors.size > this.errorRingSize) {
+                    this.recentErrors.delete(this.recentErrors.keys().next().value);
+                }
             }
         };
         
@@ -793,13 +770,54 @@ window.gameErrorRecovery = new GameErrorRecovery();
 
 console.log('🛡️ Game Error Recovery System initialized');
 """
-    
-    def generate_error_handling_report(self):
-        """エラーハンドリング強化レポートを生成"""
-        report_content = f"""# エラーハンドリング強化レポート
+
+
+def _is_docstring_stmt(node: ast.stmt) -> bool:
+    """モジュールのdocstringかどうか"""
+    return (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+            and isinstance(node.value.value, str))
+
+
+def _is_import_stmt(node: ast.stmt) -> bool:
+    """インポート文、またはインポートのみのtry文（import pygameのフォールバック等）かどうか"""
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return True
+    return isinstance(node, ast.Try) and all(isinstance(stmt, (ast.Import, ast.ImportFrom)) for stmt in node.body)
+
+
+def _scan_insertion_points(content: str) -> dict:
+    """HTML内の挿入位置を1回の走査で求める（見つかったものだけを返す）"""
+    points = {}
+    for match in _INSERTION_POINT_RE.finditer(content):
+        key = 'script_end' if match.group(1) else 'initialize_game'
+        points.setdefault(key, match.start())
+        if len(points) == 2:
+            break
+    return points
+
+
+def _list_existing_files(candidates: list) -> list:
+    """候補のうち存在するものを返す（候補ごとにstatせず、親ディレクトリごとに1回だけ一覧を取る）"""
+    listings = {}
+    existing = []
+    for candidate in candidates:
+        parent, name = os.path.split(candidate)
+        if parent not in listings:
+            try:
+                with os.scandir(parent or '.') as entries:
+                    listings[parent] = {entry.name for entry in entries}
+            except OSError:
+                listings[parent] = set()
+        if name in listings[parent]:
+            existing.append(candidate)
+    return existing
+
+
+# エラーハンドリング強化レポートのテンプレート（{timestamp}は生成時に埋め込む）
+_REPORT_HEADER = """# エラーハンドリング強化レポート
 
 ## 実施日時
-{self.get_timestamp()}
+{timestamp}
 
 ## 強化概要
 
@@ -838,13 +856,14 @@ Ultimate Squash GameのWebAssembly版において、本番環境での堅牢性
 
 ### 自動リトライ戦略
 - **最大試行回数**: 3回
-- **リトライ間隔**: 1秒 → 3秒 → 5秒（指数バックオフ）
+- **リトライ間隔**: 1秒 → 2秒 → 4秒（2^n秒の指数バックオフ、最大30秒）
+- **ジッター**: 各間隔を最大+50%ランダムに延長（1〜1.5秒 → 2〜3秒 → 4〜6秒）し、再試行がCDNへ集中するのを防ぐ
 - **フォールバック**: 全試行失敗時は簡易モード
 
 ### フォールバック機能
 
 #### Pyodide初期化失敗時
-1. 代替CDN (unpkg, cdnjs) による再試行
+1. 代替CDN (jsDelivr, unpkg, cdnjs) へ0.8秒ずつずらして問い合わせ、最初に応答したCDNで再試行
 2. 最小限のCanvas表示モード
 3. キーボードリロード機能 (R キー)
 
@@ -862,29 +881,13 @@ Ultimate Squash GameのWebAssembly版において、本番環境での堅牢性
 
 ### HTML ファイル
 """
-        
-        for error_type in self.enhanced_features["error_types"]:
-            report_content += f"""
-#### {error_type['file']}
-強化内容:
-"""
-            for enhancement in error_type['enhancements']:
-                report_content += f"- {enhancement}\n"
-        
-        report_content += f"""
+
+_REPORT_PYTHON_SECTION = """
 
 ### Python ファイル
 """
-        
-        for fallback in self.enhanced_features["fallback_mechanisms"]:
-            report_content += f"""
-#### {fallback['file']}
-強化内容:
-"""
-            for enhancement in fallback['enhancements']:
-                report_content += f"- {enhancement}\n"
-        
-        report_content += f"""
+
+_REPORT_FOOTER = """
 
 ## ユーザー体験の改善
 
@@ -960,16 +963,366 @@ WebAssembly + Python環境における包括的エラーハンドリングシス
 
 ---
 
-更新日時: {self.get_timestamp()}
+更新日時: {timestamp}
 """
+
+
+class ErrorHandlingEnhancer:
+    """エラーハンドリング強化クラス"""
+    
+    def __init__(self):
+        self.enhanced_features = {
+            "error_types": [],
+            "fallback_mechanisms": [],
+            "user_notifications": [],
+            "recovery_strategies": []
+        }
+    
+    def enhance_all_error_handling(self):
+        """すべてのエラーハンドリングを強化"""
+        print("🛡️ エラーハンドリング強化開始...")
+        
+        # 1. 主要HTMLファイルのエラーハンドリング強化
+        # 2. Pythonコードのエラーハンドリング強化
+        # （ファイルごとに独立したI/Oなので、HTMLとPythonをまとめて並行実行）
+        print("  📄 HTML エラーハンドリング強化...")
+        print("  🐍 Python エラーハンドリング強化...")
+        self.run_file_tasks(self.collect_html_tasks() + self.collect_python_tasks())
+        
+        # 3. JavaScript統合エラーハンドリング
+        self.enhance_javascript_error_handling()
+        
+        # 4. エラーハンドリングレポート生成
+        self.generate_error_handling_report()
+        
+        return self.enhanced_features
+    
+    def run_file_tasks(self, tasks: list):
+        """ファイル単位の強化タスクをスレッドで並行実行し、結果を投入順に記録"""
+        if not tasks:
+            return
+        
+        for path, _, _ in tasks:
+            print(f"    強化中: {path}")
+        
+        # 読み書きの間はGILが解放されるため、スレッドで十分に重ねられる
+        # 各タスクは結果を返すだけにして、表示とenhanced_featuresへの追加はここでまとめて行う
+        with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+            results = list(executor.map(lambda task: task[1](task[0]), tasks))
+        
+        for (_, _, category), entry in zip(tasks, results):
+            print(f"      ✅ 強化版作成: {entry['file']}")
+            self.enhanced_features[category].append(entry)
+    
+    def collect_html_tasks(self) -> list:
+        """HTMLファイルの強化タスク（パス, 処理関数, 記録先）を列挙"""
+        html_files = [
+            "ultimate_squash_optimized.html",
+            "production_template.html"
+        ]
+        
+        return [
+            (html_file, self.enhance_single_html_error_handling, "error_types")
+            for html_file in _list_existing_files(html_files)
+        ]
+    
+    def enhance_html_error_handling(self):
+        """HTMLファイルのエラーハンドリング強化"""
+        print("  📄 HTML エラーハンドリング強化...")
+        
+        self.run_file_tasks(self.collect_html_tasks())
+    
+    def enhance_single_html_error_handling(self, html_file: str) -> dict:
+        """単一HTMLファイルのエラーハンドリング強化（記録用の情報を返す）"""
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # 高度なエラーハンドリングJavaScriptを追加
+        enhanced_error_js = self.create_enhanced_error_handling_js()
+        
+        # 挿入位置は元の内容を1回走査するだけで求める
+        insertion_points = _scan_insertion_points(content)
+        insertions = {}
+        
+        # エラーハンドリングJSを既存のscriptタグの直後に挿入
+        if 'script_end' in insertion_points:
+            insertions[insertion_points['script_end']] = ['\n        ', enhanced_error_js, '\n        ']
+        
+        # エラーリカバリ機能を既存のエラーハンドラーに統合
+        insertions.update(self.integrate_error_recovery(insertion_points))
+        
+        # 挿入位置の順に元の内容と挿入断片を並べる（ファイル全体の連結はしない）
+        parts = []
+        last_pos = 0
+        for pos in sorted(insertions):
+            parts.append(content[last_pos:pos])
+            parts.extend(insertions[pos])
+            last_pos = pos
+        parts.append(content[last_pos:])
+        
+        # 強化版ファイルとして保存（断片をそのまま書き出し、最後の連結も省く）
+        enhanced_path = html_file.replace('.html', '_enhanced.html')
+        with open(enhanced_path, 'w', encoding='utf-8') as f:
+            f.writelines(parts)
+        
+        return {
+            "file": enhanced_path,
+            "enhancements": [
+                "Network failure recovery",
+                "Pyodide initialization fallback",
+                "Memory shortage handling",
+                "Browser compatibility detection",
+                "User-friendly error messages"
+            ]
+        }
+    
+    def create_enhanced_error_handling_js(self) -> str:
+        """高度なエラーハンドリングJavaScriptを作成"""
+        return _ENHANCED_ERROR_JS
+    
+    def integrate_error_recovery(self, insertion_points: dict) -> dict:
+        """エラーリカバリ機能を既存コードに統合（挿入位置 -> 挿入する断片リストの辞書を返す）"""
+        # 既存のinitializeGame関数を強化
+        error_recovery_integration = """
+        // エラーリカバリ機能統合
+        const originalInitializeGame = initializeGame;
+        
+        initializeGame = async function() {
+            const maxAttempts = 3;
+            let attempts = 0;
+            
+            while (attempts < maxAttempts) {
+                try {
+                    attempts++;
+                    updateLoadingProgress(`初期化試行 ${attempts}/${maxAttempts}...`);
+                    
+                    await originalInitializeGame();
+                    return; // 成功時は終了
+                    
+                } catch (error) {
+                    console.error(`Initialization attempt ${attempts} failed:`, error);
+                    
+                    if (attempts >= maxAttempts) {
+                        // 最終試行失敗時は簡易フォールバックモード
+                        showError(
+                            'ゲームの完全初期化に失敗しました。簡易モードで実行します。',
+                            error.message
+                        );
+                        await initializeFallbackMode();
+                        return;
+                    }
+                    
+                    // 次の試行前に少し待機
+                    await new Promise(resolve => setTimeout(resolve, 1000 * attempts));
+                }
+            }
+        };
+        
+        // フォールバックモード
+        async function initializeFallbackMode() {
+            console.log('🔄 Fallback mode initialization...');
+            
+            // 最小限のCanvas表示
+            const canvas = document.getElementById('gameCanvas');
+            const ctx = canvas.getContext('2d');
+            
+            if (ctx) {
+                ctx.fillStyle = '#000';
+                ctx.fillRect(0, 0, canvas.width, canvas.height);
+                
+                ctx.fillStyle = '#fff';
+                ctx.font = '24px Arial';
+                ctx.textAlign = 'center';
+                ctx.fillText('Simple Mode', canvas.width/2, canvas.height/2 - 20);
+                
+                ctx.font = '16px Arial';
+                ctx.fillStyle = '#ccc';
+                ctx.fillText('Game running in compatibility mode', canvas.width/2, canvas.height/2 + 20);
+            }
+            
+            hideLoading();
+            
+            // 基本的なキーボードイベント
+            document.addEventListener('keydown', function(event) {
+                if (event.key === 'r' || event.key === 'R') {
+                    location.reload();
+                }
+            });
+        }"""
+        
+        # 既存のinitializeGame関数の直前に挿入
+        if 'initialize_game' not in insertion_points:
+            return {}
+        return {insertion_points['initialize_game']: [error_recovery_integration, '\n        \n        ']}
+    
+    def collect_python_tasks(self) -> list:
+        """Pythonファイルの強化タスク（パス, 処理関数, 記録先）を列挙"""
+        # 主要なPythonファイルのエラーハンドリングを強化
+        python_files = [
+            "src/model/pygame_game_state.py",
+            "src/view/optimized_web_game_view.py",
+            "src/controller/web_game_controller.py"
+        ]
+        
+        return [
+            (py_file, self.enhance_python_file_error_handling, "fallback_mechanisms")
+            for py_file in _list_existing_files(python_files)
+        ]
+    
+    def enhance_python_error_handling(self):
+        """Pythonコードのエラーハンドリング強化"""
+        print("  🐍 Python エラーハンドリング強化...")
+        
+        self.run_file_tasks(self.collect_python_tasks())
+    
+    def enhance_python_file_error_handling(self, py_file: str) -> dict:
+        """単一Pythonファイルのエラーハンドリング強化（記録用の情報を返す）"""
+        with open(py_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # エラーハンドリング強化パターンを適用
+        enhanced_content = self.apply_python_error_patterns(content)
+        
+        # 強化版ファイルとして保存
+        enhanced_path = py_file.replace('.py', '_enhanced.py')
+        with open(enhanced_path, 'w', encoding='utf-8') as f:
+            f.write(enhanced_content)
+        
+        return {
+            "file": enhanced_path,
+            "enhancements": [
+                "Try-catch wrapping",
+                "Default value fallbacks",
+                "Input validation",
+                "Resource availability checks"
+            ]
+        }
+    
+    def apply_python_error_patterns(self, content: str) -> str:
+        """Pythonエラーハンドリングパターンを適用"""
+        # インポート文にtry-except追加
+        if 'import pygame' in content:
+            content = _IMPORT_PYGAME_RE.sub(_PYGAME_IMPORT_FALLBACK, content)
+        
+        # 関数にエラーハンドリング追加
+        content = self.add_function_error_handling(content)
+        
+        return content
+    
+    def add_function_error_handling(self, content: str) -> str:
+        """関数レベルのエラーハンドリングを追加"""
+        # 関数ごとにtry-exceptを埋め込まず、共通の@safe_fallbackデコレータを付ける
+        # （何度適用しても二重に付かないよう、直前の行が既にデコレータなら何もしない）
+        def enhance_function(match):
+            indent = match.group(1)
+            func_body = match.group(3)
+            
+            if 'try:' in func_body:  # 既にtry-exceptがある場合（safe_fallback自身を含む）はスキップ
+                return match.group(0)
+            
+            line_start = match.start()
+            previous_line_start = content.rfind('\n', 0, max(line_start - 1, 0)) + 1
+            if content[previous_line_start:line_start].strip() == _SAFE_FALLBACK_DECORATOR:
+                return match.group(0)
+            
+            return f"{indent}{_SAFE_FALLBACK_DECORATOR}\n" + match.group(0)
+        
+        enhanced = _FUNCTION_RE.sub(enhance_function, content)
+        if enhanced == content or 'def safe_fallback(' in enhanced:
+            return enhanced
+        
+        # デコレータ定義は先頭のインポート群の直後に1回だけ追加
+        # （ネストしたブロック内の関数も含め、@safe_fallbackを付けたどの関数よりも前になる）
+        insert_at = self._helper_insert_offset(enhanced)
+        return enhanced[:insert_at] + _SAFE_FALLBACK_SOURCE + enhanced[insert_at:]
+    
+    @staticmethod
+    def _helper_insert_offset(content: str) -> int:
+        """safe_fallbackの定義を挿入する位置（先頭のdocstring・インポート群の直後）を返す"""
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            # 解析できないソースは最初のトップレベル定義（デコレータ行を含む）の前、なければ先頭
+            match = _TOP_LEVEL_DEFINITION_RE.search(content)
+            return match.start() if match else 0
+        
+        body = tree.body
+        index = 1 if body and _is_docstring_stmt(body[0]) else 0
+        while index < len(body) and _is_import_stmt(body[index]):
+            index += 1
+        
+        if index > 0:
+            # docstring・インポート群の最後の文の次の行
+            lineno = body[index - 1].end_lineno + 1
+        elif body:
+            # インポートがなければ最初の文（デコレータ付きならその先頭行）の前
+            decorators = getattr(body[0], 'decorator_list', None)
+            lineno = decorators[0].lineno if decorators else body[0].lineno
+        else:
+            return 0
+        
+        # 行番号から行頭の文字位置へ（ファイル末尾を越える場合は末尾）
+        offset = 0
+        for _ in range(lineno - 1):
+            offset = content.find('\n', offset) + 1
+            if offset == 0:
+                return len(content)
+        return offset
+    
+    def enhance_javascript_error_handling(self):
+        """JavaScript統合エラーハンドリング"""
+        print("  🌐 JavaScript エラーハンドリング強化...")
+        
+        # JavaScript エラーハンドリングテンプレートを作成
+        js_error_handling = self.create_javascript_error_handling()
+        
+        # 統合用JavaScriptファイルとして保存
+        with open("enhanced_error_handling.js", 'w', encoding='utf-8') as f:
+            f.write(js_error_handling)
+        
+        print("    ✅ JavaScript エラーハンドリング作成: enhanced_error_handling.js")
+        
+        self.enhanced_features["recovery_strategies"].append({
+            "component": "JavaScript Integration",
+            "features": [
+                "Global error catching",
+                "Promise rejection handling",
+                "Resource loading fallbacks",
+                "Automatic retry mechanisms",
+                "User notification system"
+            ]
+        })
+    
+    def create_javascript_error_handling(self) -> str:
+        """JavaScript エラーハンドリングテンプレートを作成"""
+        return _JS_ERROR_HANDLING
+    
+    def generate_error_handling_report(self):
+        """エラーハンドリング強化レポートを生成"""
+        timestamp = self.get_timestamp()
+        
+        # 文字列の+=連結ではなく断片のリストに積み、最後にまとめて書き出す
+        parts = [_REPORT_HEADER.format(timestamp=timestamp)]
+        parts.extend(self._report_file_sections(self.enhanced_features["error_types"]))
+        parts.append(_REPORT_PYTHON_SECTION)
+        parts.extend(self._report_file_sections(self.enhanced_features["fallback_mechanisms"]))
+        parts.append(_REPORT_FOOTER.format(timestamp=timestamp))
         
         # レポートファイル保存
         report_path = Path("ERROR_HANDLING_ENHANCEMENT_REPORT.md")
         with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+            f.writelines(parts)
         
         print(f"  📊 エラーハンドリングレポート生成: {report_path}")
     
+    @staticmethod
+    def _report_file_sections(entries):
+        """ファイルごとの強化内容セクションをレポートの断片として返す"""
+        for entry in entries:
+            yield f"\n#### {entry['file']}\n強化内容:\n"
+            for enhancement in entry['enhancements']:
+                yield f"- {enhancement}\n"
+    
     def get_timestamp(self) -> str:
         """現在のタイムスタンプを取得"""
         from datetime import datetime
@@ -3,88 +3,192 @@
 
 import pygame
 import asyncio
+import gc
+import logging
 import sys
+import types
+from time import perf_counter
 from typing import Optional
 
-# MVCコンポーネントのインポート
+# Pyodide環境ではブラウザのメモリ使用状況を参照できる（通常のPython環境ではNone）
 try:
-    from src.model.pygame_game_state import PygameGameState
-    from src.view.pygame_game_view import PygameGameView
-    from src.controller.pygame_game_controller import PygameGameController
+    import js
+except ImportError:
+    js = None
+
+# 共通の起動処理（MVCクラスはbuild_game()内で遅延読み込み）
+try:
+    from _bootstrap import build_game
 except ImportError:
     # Pyodide環境でのインポートエラー対策
     sys.path.append('/home/pyodide')
-    from src.model.pygame_game_state import PygameGameState
-    from src.view.pygame_game_view import PygameGameView
-    from src.controller.pygame_game_controller import PygameGameController
+    from _bootstrap import build_game
+
+# エラーはトレースバックを1件のログレコードにまとめて出力する（行ごとのprintを避ける）
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
 
 # 定数
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-BACKGROUND_COLOR = (0, 0, 0)  # 黒
 WINDOW_TITLE = "Ultimate Squash Game - Pygame-CE/WASM版"
 FPS = 60
+FRAME_DURATION = 1.0 / FPS  # 1フレームの目標時間（秒）
+
+# メモリ逼迫時のフレームレート制御（JSヒープ使用率で判定）
+LOW_MEMORY_FPS = 30
+MEMORY_CHECK_INTERVAL = 120  # フレーム数
+MEMORY_PRESSURE_HIGH = 0.8  # これを超えたらFPSを下げる
+MEMORY_PRESSURE_LOW = 0.5  # これを下回ったらFPSを戻す
+
+# イベント種別・キーコード（毎フレームのpygame属性参照を避けるため読み込み時に束縛）
+_QUIT, _KEYDOWN, _MOUSEMOTION = pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEMOTION
+_K_ESCAPE, _K_SPACE, _K_R = pygame.K_ESCAPE, pygame.K_SPACE, pygame.K_r
+
+
+@types.coroutine
+def _yield_to_loop():
+    """イベントループに1回だけ制御を返す（タイマーを使わない最小の待機）"""
+    yield
+
+
+def _memory_pressure() -> float:
+    """JSヒープの使用率（0.0〜1.0）を返す。取得できない環境では0.0"""
+    memory = getattr(getattr(js, 'performance', None), 'memory', None)
+    if memory is None:
+        # performance.memoryはChrome系のみ対応
+        return 0.0
+    try:
+        return memory.usedJSHeapSize / memory.jsHeapSizeLimit
+    except (AttributeError, ZeroDivisionError):
+        return 0.0
 
 
 class Game:
     """ゲームのメインクラス（MVCの統合）"""
     
     def __init__(self):
-        pygame.init()
-        
-        # 画面の初期化
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption(WINDOW_TITLE)
+        # 画面とMVCコンポーネントの初期化（Model-ViewのObserver接続はControllerが行う）
+        components = build_game(
+            width=SCREEN_WIDTH,
+            height=SCREEN_HEIGHT,
+            caption=WINDOW_TITLE,
+            sound=False,
+            target_fps=FPS,
+            allowed_events=(_QUIT, _KEYDOWN, _MOUSEMOTION),
+        )
+        self.screen = components.screen
+        self.model = components.game_state
+        self.view = components.game_view
+        self.controller = components.controller
         
-        # クロックの初期化
-        self.clock = pygame.time.Clock()
-        
-        # MVCコンポーネントの初期化
-        self.model = PygameGameState()
-        self.view = PygameGameView(self.screen)
-        self.controller = PygameGameController(self.model, self.view)
+        self.running = True
+        self._frame_duration = FRAME_DURATION
         
-        # Model-View接続（Observer パターン）
-        self.model.add_observer(self.view)
+        # ポーズ・ゲームオーバー状態の控え（毎フレームmodelの属性を読まないよう、変化しうる箇所でだけ更新）
+        self._paused = self.model.paused
+        self._gameover = self.model.is_gameover
         
-        self.running = True
+        # イベント種別ごとのハンドラー（if/elifの連鎖ではなく辞書で振り分け。マウス移動はrun()でまとめて処理）
+        self._event_handlers = {
+            _QUIT: self._on_quit,
+            _KEYDOWN: self._on_key,
+        }
+        self._key_actions = {
+            _K_ESCAPE: self._on_quit,
+            _K_SPACE: self._on_toggle_pause,
+            _K_R: self._on_reset,
+        }
+    
+    def _sync_state_flags(self):
+        self._paused = self.model.paused
+        self._gameover = self.model.is_gameover
+    
+    def _on_toggle_pause(self, event):
+        self.model.toggle_pause()
+        self._sync_state_flags()
+    
+    def _on_reset(self, event):
+        self.model.reset_game()
+        self._sync_state_flags()
+    
+    def _on_quit(self, event):
+        self.running = False
+    
+    def _on_key(self, event):
+        action = self._key_actions.get(event.key)
+        if action:
+            action(event)
+    
+    def _on_mouse_motion(self, event):
+        # マウス位置に合わせてパドルを移動
+        mouse_x, _ = event.pos
+        self.controller.handle_mouse_motion(mouse_x)
+    
+    def _adapt_to_memory_pressure(self):
+        """メモリ逼迫時はFPSを下げて描画キャッシュを破棄・GCを実行し、余裕が戻ったら元のFPSに戻す"""
+        pressure = _memory_pressure()
+        if pressure > MEMORY_PRESSURE_HIGH:
+            if self._frame_duration == FRAME_DURATION:
+                print(f"メモリ使用率 {pressure:.0%}: {LOW_MEMORY_FPS}FPSに切り替えます")
+            self._frame_duration = 1.0 / LOW_MEMORY_FPS
+            self.view.trim_caches()
+            gc.collect()
+        elif pressure < MEMORY_PRESSURE_LOW:
+            self._frame_duration = FRAME_DURATION
     
     async def run(self):
-        """非同期ゲームループ（Pyodide対応）"""
-        while self.running:
-            # イベント処理
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.running = False
-                    elif event.key == pygame.K_SPACE:
-                        self.model.toggle_pause()
-                    elif event.key == pygame.K_r:
-                        self.model.reset_game()
-                elif event.type == pygame.MOUSEMOTION:
-                    # マウス位置に合わせてパドルを移動
-                    mouse_x, _ = event.pos
-                    self.controller.handle_mouse_motion(mouse_x)
-            
-            # ゲーム状態の更新（ポーズ中でなければ）
-            if not self.model.paused and not self.model.is_gameover:
-                self.controller.update_game_frame()
-            
-            # 画面の描画
-            self.screen.fill(BACKGROUND_COLOR)
-            self.view.draw_game(self.model)
-            
-            # FPS制御
-            self.clock.tick(FPS)
-            pygame.display.flip()
-            
-            # Pyodide環境での非同期処理
-            await asyncio.sleep(0)
+        """
+        非同期ゲームループ（Pyodide対応）
         
-        pygame.quit()
+        1フレーム内の更新と描画は順番に実行する。Pyodideでは更新・描画とも同じスレッドで
+        同期的に動くため、タスクに分けても重ならず、描画が更新途中の状態を読むだけになる。
+        ブラウザ側の処理はフレーム末尾で制御を返している間に進む。
+        """
+        event_handlers = self._event_handlers
+        frame_count = 0
+        try:
+            while self.running:
+                frame_start = perf_counter()
+                
+                # メモリ使用状況は一定フレームごとにだけ確認する
+                frame_count += 1
+                if frame_count % MEMORY_CHECK_INTERVAL == 0:
+                    self._adapt_to_memory_pressure()
+                
+                # イベント処理（種別ごとにSDLから取り出す）
+                for event in pygame.event.get((_QUIT, _KEYDOWN)):
+                    event_handlers[event.type](event)
+                
+                # マウス位置は最新の値だけ反映すれば十分なので、溜まった移動イベントはまとめる
+                mouse_motions = pygame.event.get(_MOUSEMOTION)
+                if mouse_motions:
+                    self._on_mouse_motion(mouse_motions[-1])
+                
+                # ゲーム状態の更新（ポーズ中でなければ。ゲームオーバーになりうるのはフレーム更新時だけ）
+                if not (self._paused or self._gameover):
+                    self.controller.update_game_frame()
+                    self._gameover = self.model.is_gameover
+                
+                # 画面の描画（背景はdraw_game()が画面全体を塗りつぶすので、ここでは重ねて塗らない）
+                # 変化した領域だけを画面に反映（初回・ポーズ/ゲームオーバー表示時は全画面）
+                dirty_rects = self.view.draw_game(self.model)
+                pygame.display.update(dirty_rects)
+                
+                # FPS制御（clock.tick()のSDL_Delayでスレッドを止めず、残り時間をイベントループに譲る）
+                # Pyodide環境ではこの間にブラウザ側の描画・入力処理が進む
+                remaining = self._frame_duration - (perf_counter() - frame_start)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+                else:
+                    # 予算を使い切ったフレームはタイマーを登録せず、制御を返すだけにする
+                    await _yield_to_loop()
+        except asyncio.CancelledError:
+            # ページ遷移などでタスクがキャンセルされた場合はループを止めて呼び出し元へ伝える
+            self.running = False
+            raise
+        finally:
+            pygame.quit()
 
 
 async def main():
@@ -92,10 +196,19 @@ async def main():
     try:
         game = Game()
         await game.run()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # 中断（Ctrl+C・ページ遷移によるキャンセル）は正常終了として扱い、トレースバックを出さない
+        pass
     except Exception as e:
-        print(f"ゲームエラー: {e}")
-        import traceback
-        traceback.print_exc()
+        error_msg = {
+            'what': "ゲーム実行中にエラーが発生しました",
+            'why': f"ゲームループでエラー: {str(e)}",
+            'how': "ページを再読み込みして再試行してください"
+        }
+        logger.exception(
+            "ゲームエラー: %s - %s - %s", error_msg['what'], error_msg['why'], error_msg['how'],
+            extra={'error_type': type(e).__name__, 'component': 'main', **error_msg}
+        )
 
 
 # Pyodide環境での実行
@@ -104,5 +217,6 @@ if __name__ == '__main__':
     if 'pyodide' not in sys.modules:
         asyncio.run(main())
     else:
-        # Pyodide環境（await main()はHTMLから呼ばれる）
-        pass
+        # Pyodide環境（WebLoopが既に動いているので、asyncio.run()ではなくタスクとして起動する）
+        # index.htmlはこのファイルをrunPythonAsync()で実行するだけで、main()を呼び出さない
+        asyncio.ensure_future(main())
@@ -19,14 +19,20 @@ import pygame
 import sys
 import os
 import argparse
+import functools
+import json
+import shutil
+import urllib.error
+import urllib.request
 
 # srcディレクトリをPythonパスに追加
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.model.ai_enhanced_game_state import AIEnhancedGameState
-from src.view.ai_enhanced_view import AIEnhancedGameView
-from src.view.pygame_game_view import PygameSoundView
-from src.controller.ai_enhanced_controller import AIEnhancedController
+from _bootstrap import build_game
+
+# Ollamaのモデル一覧API（ollamaプロセスを起動せず、ローカルHTTPで状態を確認する）
+OLLAMA_TAGS_URL = "http://localhost:11434/api/tags"
+OLLAMA_PROBE_TIMEOUT = 0.5  # 秒
 
 
 def parse_arguments():
@@ -39,32 +45,50 @@ def parse_arguments():
     return parser.parse_args()
 
 
+@functools.lru_cache(maxsize=1)
 def check_ollama_status():
-    """Ollamaの状態を確認"""
+    """Ollamaの状態を確認（結果はプロセス内でキャッシュ）"""
     try:
-        import subprocess
-        result = subprocess.run(['ollama', 'list'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✓ Ollamaが起動しています")
-            # Mistralモデルの確認
-            if 'mistral' in result.stdout.lower():
-                print("✓ Mistralモデルが利用可能です")
-                return True
-            else:
-                print("⚠ Mistralモデルが見つかりません")
-                print("  実行してください: ollama pull mistral")
-                return False
+        with urllib.request.urlopen(OLLAMA_TAGS_URL, timeout=OLLAMA_PROBE_TIMEOUT) as response:
+            models = json.load(response).get('models', [])
+    except (urllib.error.URLError, TimeoutError, ConnectionError):
+        # 接続できない場合は、コマンドの有無で未インストールか未起動かを判断
+        if shutil.which('ollama') is None:
+            print("⚠ Ollamaがインストールされていません")
+            print("  https://ollama.ai からインストールしてください")
         else:
             print("⚠ Ollamaが起動していません")
             print("  Ollamaを起動してください")
-            return False
-    except FileNotFoundError:
-        print("⚠ Ollamaがインストールされていません")
-        print("  https://ollama.ai からインストールしてください")
         return False
     except Exception as e:
         print(f"⚠ Ollama確認中にエラーが発生: {str(e)}")
         return False
+    
+    print("✓ Ollamaが起動しています")
+    # Mistralモデルの確認
+    if any('mistral' in model.get('name', '').lower() for model in models):
+        print("✓ Mistralモデルが利用可能です")
+        return True
+    else:
+        print("⚠ Mistralモデルが見つかりません")
+        print("  実行してください: ollama pull mistral")
+        return False
+
+
+def _make_ada_updater(controller, game_view):
+    """衝突イベントごとにADA情報をビューへ反映するコールバックを作成（メソッドは作成時に束縛しておく）"""
+    get_statistics = controller.get_game_statistics
+    update_ada_info = game_view.update_ada_info
+    
+    def update_ada_view(event_name, event_data):
+        stats = get_statistics()
+        update_ada_info({
+            'difficulty_modifier': stats.get('difficulty_modifier', 1.0),
+            'miss_ratio': stats.get('miss_ratio', 0.0),
+            'evaluation_progress': controller.hit_count + controller.miss_count
+        })
+    
+    return update_ada_view
 
 
 def main():
@@ -72,9 +96,6 @@ def main():
     # コマンドライン引数を解析
     args = parse_arguments()
     
-    # Pygame初期化
-    pygame.init()
-    
     # AI機能の可用性確認
     ai_available = not args.no_ai and check_ollama_status()
     if args.no_ai:
@@ -83,61 +104,29 @@ def main():
         print("AI機能なしで起動します")
     
     try:
-        # ウィンドウサイズ設定
-        screen_width, screen_height = 800, 600
-        
-        # フルスクリーンモード
-        if args.fullscreen:
-            info = pygame.display.Info()
-            screen_width = info.current_w
-            screen_height = info.current_h
-            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        else:
-            screen = pygame.display.set_mode((screen_width, screen_height))
-        
-        # ウィンドウタイトル設定
-        pygame.display.set_caption("Ultimate Squash Game - AI Enhanced")
-        
-        # MVC要素の作成（AI強化版）
-        game_state = AIEnhancedGameState(
-            screen_width=screen_width,
-            screen_height=screen_height
-        )
-        
-        game_view = AIEnhancedGameView(
-            screen=screen,
-            width=screen_width,
-            height=screen_height
-        )
-        
-        sound_view = PygameSoundView(
-            sound_enabled=not args.no_sound
-        )
-        
-        # AI強化コントローラーの作成
-        controller = AIEnhancedController(
-            game_state=game_state,
-            game_view=game_view,
-            sound_view=sound_view,
-            target_fps=args.fps,
-            ai_enabled=ai_available
+        # Pygame初期化とMVC要素の作成（AI強化版。サウンド無効時はオーディオデバイスを開かない）
+        components = build_game(
+            width=800,
+            height=600,
+            caption="Ultimate Squash Game - AI Enhanced",
+            ai=True,
+            ai_enabled=ai_available,
+            sound=not args.no_sound,
+            fullscreen=args.fullscreen,
+            target_fps=args.fps
         )
+        game_state = components.game_state
+        game_view = components.game_view
+        controller = components.controller
+        screen_width, screen_height = game_state.width, game_state.height
         
         # イベントコールバックを登録
         if ai_available:
             game_state.register_event_callback('collision', controller.handle_collision)
             
             # ADA情報を定期的にビューに反映
-            def update_ada_view(event_name, event_data):
-                if hasattr(controller, 'get_game_statistics'):
-                    stats = controller.get_game_statistics()
-                    game_view.update_ada_info({
-                        'difficulty_modifier': stats.get('difficulty_modifier', 1.0),
-                        'miss_ratio': stats.get('miss_ratio', 0.0),
-                        'evaluation_progress': controller.hit_count + controller.miss_count
-                    })
-            
-            game_state.register_event_callback('collision', update_ada_view)
+            if hasattr(controller, 'get_game_statistics'):
+                game_state.register_event_callback('collision', _make_ada_updater(controller, game_view))
         
         # 起動メッセージ
         print("\n" + "="*50)
@@ -161,6 +150,10 @@ def main():
         # ゲームループ開始
         controller.start_game_loop()
         
+    except KeyboardInterrupt:
+        # Ctrl+Cによる中断は正常終了として扱い、トレースバックを出さない
+        pass
+        
     except Exception as e:
         error_msg = {
             'what': "ゲーム起動に失敗しました",
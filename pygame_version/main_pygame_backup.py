@@ -16,16 +16,13 @@ Pygame-CE版スカッシュゲーム - メインエントリーポイント
 import sys
 import os
 
-# パスの設定
-current_dir = os.path.dirname(__file__)
-src_dir = os.path.join(current_dir, 'src')
-sys.path.insert(0, src_dir)
+# パスの設定（src パッケージと共通起動処理を読み込めるようにする）
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
 
 try:
     import pygame
-    from model.pygame_game_state import PygameGameState
-    from view.pygame_game_view import PygameGameView, PygameSoundView
-    from controller.pygame_game_controller import PygameGameController
+    from _bootstrap import build_game
     
     print(f"pygame-ce {pygame.version.ver} (SDL {pygame.version.SDL}, Python {sys.version.split()[0]})")
     
@@ -43,25 +40,17 @@ def main():
     """メイン関数 - Pygame-CE版スカッシュゲーム"""
     
     try:
-        # Pygame初期化
-        pygame.init()
-        
-        # 画面設定
-        screen_width = 640
-        screen_height = 480
-        screen = pygame.display.set_mode((screen_width, screen_height))
-        pygame.display.set_caption("Ultimate Squash Game - Pygame-CE Edition")
-        
-        # MVCコンポーネント作成
-        game_state = PygameGameState()
-        game_view = PygameGameView(screen, screen_width, screen_height)
-        sound_view = PygameSoundView(sound_enabled=False)  # テスト用は無音
-        controller = PygameGameController(
-            game_state, 
-            game_view, 
-            sound_view,
+        # Pygame初期化とMVCコンポーネント作成（テスト用は無音なので画面とフォントだけ）
+        components = build_game(
+            width=640,
+            height=480,
+            caption="Ultimate Squash Game - Pygame-CE Edition",
+            sound=False,
             target_fps=60
         )
+        game_state = components.game_state
+        game_view = components.game_view
+        controller = components.controller
         
         print("Pygame-CE版スカッシュゲームを開始します...")
         print("操作方法:")
@@ -88,12 +77,12 @@ def main():
             # ゲーム更新
             controller.update_game_frame()
             
-            # 描画
-            game_view.draw_game(game_state)
-            pygame.display.flip()
+            # 描画（変化した領域だけを画面に反映）
+            dirty_rects = game_view.draw_game(game_state)
+            pygame.display.update(dirty_rects)
             
             # FPS制御
-            controller.clock.tick(controller.target_fps)
+            controller.tick()
         
         print("テスト実行完了 - Pygame-CE版MVC統合が正常に動作しました！")
         
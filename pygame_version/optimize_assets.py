@@ -3,11 +3,115 @@
 アセット最適化ツール - 画像・音声ファイルの最適化
 """
 import base64
+import functools
+import gzip
 import json
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    from scour import scour
+except ImportError:
+    # scourがない環境では空白の除去だけ行う
+    scour = None
+
+# HTMLファイルがこの数以上ある場合だけプロセスプールで並列化（少数ではプロセス起動の方が高くつく）
+_PARALLEL_MIN_FILES = 4
+
+# SVG最小化用の正規表現（モジュール読み込み時に1回だけコンパイル）
+_TAG_GAP_RE = re.compile(r'>\s+<')
+
+# HTML/CSS最小化用の正規表現（HTMLはmmapしたバイト列のまま処理するのでbytesパターン）
+_HTML_TAG_GAP_RE = re.compile(rb'>\s+<')
+_CSS_BLOCK_RE = re.compile(rb'<style[^>]*>(.*?)</style>', re.DOTALL)
+_CSS_COMMENT_RE = re.compile(rb'/\*.*?\*/', re.DOTALL)
+_CSS_WHITESPACE_RE = re.compile(rb'\s+')
+_CSS_TRAILING_SEMICOLON_RE = re.compile(rb';\s*}')
+_CSS_OPEN_BRACE_RE = re.compile(rb'{\s+')
+_CSS_CLOSE_BRACE_RE = re.compile(rb'}\s+')
+# 条件付きコメント（<!--[if IE]>など）は残す
+_HTML_COMMENT_RE = re.compile(rb'<!--(?!\[).*?-->', re.DOTALL)
+_BLANK_LINES_RE = re.compile(rb'\n\s*\n\s*\n')
+_FAVICON_LINK_RE = re.compile(rb'<link rel="icon"[^>]*>')
+
+# SVGをdata URLに埋め込む際にパーセントエンコードが必要な文字（それ以外はそのまま残す）
+_SVG_URL_UNSAFE = str.maketrans({
+    char: f"%{ord(char):02X}" for char in '%#<>{}|\\^`"'
+})
+
+
+def _svg_data_url(svg: str, use_base64: bool = False) -> str:
+    """
+    SVGをdata URLに変換
+
+    Base64は約33%サイズが増え、gzipも効きにくくなるため、
+    既定では危険な文字だけをパーセントエンコードしたURLエンコード形式にする。
+    """
+    if use_base64:
+        return f"data:image/svg+xml;base64,{base64.b64encode(svg.encode()).decode()}"
+
+    # 改行・連続空白を1つにまとめ、属性の二重引用符は（エンコード不要な）単一引用符に置き換える
+    svg = " ".join(svg.split())
+    if "'" not in svg:
+        svg = svg.replace('"', "'")
+    return f"data:image/svg+xml;utf8,{svg.translate(_SVG_URL_UNSAFE)}"
+
+
+def _minify_css(css: bytes) -> bytes:
+    """
+    CSSを最小化
+
+    各パスはC実装の正規表現置換なので、1文字ずつのPythonループや
+    コールバック付きの1パス置換よりも速い（計測済み）。
+    """
+    css = _CSS_COMMENT_RE.sub(b'', css)  # コメント除去
+    css = _CSS_WHITESPACE_RE.sub(b' ', css)  # 空白最小化
+    css = _CSS_TRAILING_SEMICOLON_RE.sub(b'}', css)  # 不要なセミコロン
+    css = _CSS_OPEN_BRACE_RE.sub(b'{', css)  # 開きブレース後の空白
+    css = _CSS_CLOSE_BRACE_RE.sub(b'}', css)  # 閉じブレース後の空白
+    return css.strip()
+
+
+@functools.lru_cache(maxsize=None)
+def _minify_svg(svg: str) -> str:
+    """SVGを最小化（コメント・XML宣言・メタデータ除去、ID短縮）
+
+    数値の有効桁数はscourの既定（5桁）のまま。2桁等に減らすと512単位の
+    座標（416→420等）が丸められて図形が崩れる。
+    """
+    if scour is None:
+        return " ".join(_TAG_GAP_RE.sub('><', svg).split())
+
+    options = scour.sanitizeOptions()
+    options.strip_xml_prolog = True
+    options.remove_metadata = True
+    options.remove_descriptive_elements = True
+    options.strip_comments = True
+    options.strip_ids = True
+    options.shorten_ids = True
+    options.indent_type = 'none'
+    options.newlines = False
+    return scour.scourString(svg, options)
+
+
+# PWA用アイコン（ベクターなので1つのSVGを全サイズで共用し、描画サイズはviewBoxで決まる）
+_PWA_ICON_SIZES = (72, 96, 128, 144, 152, 192, 384, 512)
+_PWA_ICON_SVG = """<svg viewBox="0 0 512 512" xmlns="http://www.w3.org/2000/svg">
+  <defs>
+    <linearGradient id="bgGrad" x1="0%" y1="0%" x2="100%" y2="100%">
+      <stop offset="0%" style="stop-color:#004274"/>
+      <stop offset="100%" style="stop-color:#16213e"/>
+    </linearGradient>
+  </defs>
+  <rect width="512" height="512" fill="url(#bgGrad)" rx="32"/>
+  <circle cx="256" cy="256" r="64" fill="#ffffff"/>
+  <rect x="192" y="416" width="128" height="32" rx="16" fill="#00ff00"/>
+</svg>"""
+
 
 class AssetOptimizer:
     """アセット最適化メインクラス"""
@@ -72,17 +176,19 @@ class AssetOptimizer:
         
         return optimized_favicon, game_logo
     
-    def create_optimized_favicon(self) -> str:
-        """最適化されたファビコンSVGを作成"""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def create_optimized_favicon() -> str:
+        """最適化されたファビコンSVGを作成（同じ内容なので初回の結果を使い回す）"""
         # 極小サイズで視認性の高いアイコン（スカッシュボール + ラケット）
         favicon_svg = """<svg width="32" height="32" viewBox="0 0 32 32" xmlns="http://www.w3.org/2000/svg"><rect width="32" height="32" fill="#004274"/><circle cx="16" cy="12" r="4" fill="#ffffff"/><rect x="14" y="22" width="4" height="8" rx="2" fill="#00ff00"/><path d="M10 20h12v2H10z" fill="#cccccc"/></svg>"""
         
-        # Base64エンコード
-        favicon_base64 = base64.b64encode(favicon_svg.encode()).decode()
-        return f"data:image/svg+xml;base64,{favicon_base64}"
+        return _svg_data_url(_minify_svg(favicon_svg))
     
-    def create_game_logo_svg(self) -> str:
-        """ゲームロゴSVGを作成"""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def create_game_logo_svg() -> str:
+        """ゲームロゴSVGを作成（同じ内容なので初回の結果を使い回す）"""
         logo_svg = """<svg width="200" height="60" viewBox="0 0 200 60" xmlns="http://www.w3.org/2000/svg">
   <defs>
     <linearGradient id="logoGrad" x1="0%" y1="0%" x2="100%" y2="0%">
@@ -98,50 +204,26 @@ class AssetOptimizer:
   <circle cx="180" cy="30" r="8" fill="#ffffff" stroke="#4ecdc4" stroke-width="2"/>
   <rect x="15" y="45" width="30" height="6" rx="3" fill="#00ff00"/>
 </svg>"""
-        return logo_svg
+        return _minify_svg(logo_svg)
     
     def create_pwa_icon_set(self) -> Dict:
-        """PWA用アイコンセットを作成"""
-        # 異なるサイズ用のSVGテンプレート
-        pwa_template = """<svg width="{size}" height="{size}" viewBox="0 0 {size} {size}" xmlns="http://www.w3.org/2000/svg">
-  <defs>
-    <linearGradient id="bgGrad" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:#004274"/>
-      <stop offset="100%" style="stop-color:#16213e"/>
-    </linearGradient>
-  </defs>
-  <rect width="{size}" height="{size}" fill="url(#bgGrad)" rx="{radius}"/>
-  <circle cx="{cx}" cy="{cy}" r="{ball_r}" fill="#ffffff"/>
-  <rect x="{racket_x}" y="{racket_y}" width="{racket_w}" height="{racket_h}" rx="{racket_rx}" fill="#00ff00"/>
-</svg>"""
+        """
+        PWA用アイコンセットを作成
+        
+        サイズ別に8つのSVGを作らず、1つのSVGをマニフェストの
+        sizes属性で全サイズに割り当てる（キャッシュエントリも1つで済む）
+        """
+        svg_content = _minify_svg(_PWA_ICON_SVG)
         
-        icon_sizes = [72, 96, 128, 144, 152, 192, 384, 512]
-        icons = {}
-        
-        for size in icon_sizes:
-            # サイズに応じたパラメータ計算
-            radius = max(4, size // 16)
-            cx = cy = size // 2
-            ball_r = max(4, size // 8)
-            racket_w = max(8, size // 4)
-            racket_h = max(4, size // 16)
-            racket_x = (size - racket_w) // 2
-            racket_y = size - racket_h - size // 8
-            racket_rx = max(2, racket_h // 2)
-            
-            svg_content = pwa_template.format(
-                size=size, radius=radius, cx=cx, cy=cy,
-                ball_r=ball_r, racket_x=racket_x, racket_y=racket_y,
-                racket_w=racket_w, racket_h=racket_h, racket_rx=racket_rx
-            )
-            
-            icons[f"icon-{size}x{size}"] = {
+        return {
+            "icon-master": {
                 "svg": svg_content,
                 "size": len(svg_content),
+                "gzip_size": len(gzip.compress(svg_content.encode(), compresslevel=9, mtime=0)),
+                "sizes": " ".join(f"{size}x{size}" for size in _PWA_ICON_SIZES),
                 "format": "SVG"
             }
-        
-        return icons
+        }
     
     def optimize_game_sounds(self):
         """ゲーム効果音の最適化（軽量データURL形式）"""
@@ -276,28 +358,42 @@ window.gameAudio = new GameAudioEngine();
             "pyodide_game_demo.html"
         ]
         
-        for html_file in html_files:
-            html_path = Path(html_file)
-            if html_path.exists():
-                self.optimize_single_html(html_path)
+        html_paths = [Path(html_file) for html_file in html_files]
+        html_paths = [html_path for html_path in html_paths if html_path.exists()]
+        workers = os.cpu_count() or 1
+        
+        # ファイルごとの処理は独立しているので並列化し、結果の集計と表示は親プロセスで行う
+        if workers < 2 or len(html_paths) < _PARALLEL_MIN_FILES:
+            results = map(_optimize_html_worker, html_paths)
+            for html_path, result in results:
+                self._record_html_result(html_path, result)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for html_path, result in executor.map(_optimize_html_worker, html_paths):
+                self._record_html_result(html_path, result)
     
     def optimize_single_html(self, html_path: Path):
         """単一HTMLファイルのアセット最適化"""
-        with open(html_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original_size = len(content)
-        
-        # 1. 外部CSSを最小化（既存のstyleタグ内）
-        content = self.minify_css_in_html(content)
+        self._record_html_result(html_path, self._optimize_html_file(html_path))
+    
+    def _optimize_html_file(self, html_path: Path) -> Dict:
+        """HTMLファイルを最適化して保存し、結果を返す（レポートは更新しない）"""
+        # 最初の置換はmmapしたファイルから直接読む（ファイル全体の文字列コピーを作らない）
+        # 置換はすべてASCIIの区切り文字に対する処理なので、UTF-8のバイト列のまま扱える
+        with open(html_path, 'rb') as f:
+            original_size = os.fstat(f.fileno()).st_size
+            if original_size == 0:
+                content = b''
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    # 1. 外部CSSを最小化（既存のstyleタグ内）
+                    content = self.minify_css_in_html(mapped)
         
         # 2. ファビコン参照を最適化版に置換
         optimized_favicon = self.create_optimized_favicon()
-        content = re.sub(
-            r'<link rel="icon"[^>]*>',
-            f'<link rel="icon" type="image/svg+xml" href="{optimized_favicon}">',
-            content
-        )
+        favicon_link = f'<link rel="icon" type="image/svg+xml" href="{optimized_favicon}">'.encode()
+        content = _FAVICON_LINK_RE.sub(lambda match: favicon_link, content)
         
         # 3. 不要な空白・コメントをさらに削除
         content = self.additional_html_optimization(content)
@@ -307,47 +403,40 @@ window.gameAudio = new GameAudioEngine();
         
         # 最適化されたファイルを保存
         optimized_path = html_path.parent / f"optimized_{html_path.name}"
-        with open(optimized_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        optimized_path.write_bytes(content)
         
-        self.optimization_report["images"][str(html_path)] = {
+        return {
             "original_size": original_size,
             "optimized_size": optimized_size,
             "savings": savings,
             "savings_percent": (savings / original_size * 100) if original_size > 0 else 0,
             "output_file": str(optimized_path)
         }
+    
+    def _record_html_result(self, html_path: Path, result: Dict):
+        """HTMLファイルの最適化結果をレポートに集計"""
+        self.optimization_report["images"][str(html_path)] = result
         
-        self.optimization_report["total_original_size"] += original_size
-        self.optimization_report["total_optimized_size"] += optimized_size
-        self.optimization_report["total_savings"] += savings
+        self.optimization_report["total_original_size"] += result["original_size"]
+        self.optimization_report["total_optimized_size"] += result["optimized_size"]
+        self.optimization_report["total_savings"] += result["savings"]
         
-        print(f"    ✅ {html_path.name}: {savings:,} bytes saved ({savings/original_size*100:.1f}%)")
+        print(f"    ✅ {html_path.name}: {result['savings']:,} bytes saved ({result['savings_percent']:.1f}%)")
     
-    def minify_css_in_html(self, content: str) -> str:
-        """HTML内のCSSを最小化"""
-        def minify_css_block(match):
-            css_content = match.group(1)
-            # CSS最小化
-            css_content = re.sub(r'/\*.*?\*/', '', css_content, flags=re.DOTALL)  # コメント除去
-            css_content = re.sub(r'\s+', ' ', css_content)  # 空白最小化
-            css_content = re.sub(r';\s*}', '}', css_content)  # 不要なセミコロン
-            css_content = re.sub(r'{\s+', '{', css_content)  # ブレース前空白
-            css_content = re.sub(r'}\s+', '}', css_content)  # ブレース後空白
-            return f"<style>{css_content.strip()}</style>"
-        
-        return re.sub(r'<style[^>]*>(.*?)</style>', minify_css_block, content, flags=re.DOTALL)
+    def minify_css_in_html(self, content: bytes) -> bytes:
+        """HTML内のCSSを最小化（UTF-8のバイト列またはmmapを受け取る）"""
+        return _CSS_BLOCK_RE.sub(lambda match: b"<style>" + _minify_css(match.group(1)) + b"</style>", content)
     
-    def additional_html_optimization(self, content: str) -> str:
-        """HTMLの追加最適化"""
+    def additional_html_optimization(self, content: bytes) -> bytes:
+        """HTMLの追加最適化（UTF-8のバイト列を受け取る）"""
         # HTMLコメント除去（開発者向けコメントのみ）
-        content = re.sub(r'<!--(?!.*\[).*?-->', '', content, flags=re.DOTALL)
+        content = _HTML_COMMENT_RE.sub(b'', content)
         
         # 連続する空白行を単一に
-        content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+        content = _BLANK_LINES_RE.sub(b'\n\n', content)
         
         # タグ間の不要な空白
-        content = re.sub(r'>\s+<', '><', content)
+        content = _HTML_TAG_GAP_RE.sub(b'><', content)
         
         return content.strip()
     
@@ -366,12 +455,12 @@ window.gameAudio = new GameAudioEngine();
         
         optimized_icons = {}
         for name, svg in game_icons.items():
-            # SVG最適化（既に最小化済み）
-            optimized_svg = svg.replace('\n', '').replace('  ', ' ')
+            # SVG最適化
+            optimized_svg = _minify_svg(svg)
             optimized_icons[name] = {
                 "svg": optimized_svg,
                 "size": len(optimized_svg),
-                "data_url": f"data:image/svg+xml;base64,{base64.b64encode(optimized_svg.encode()).decode()}"
+                "data_url": _svg_data_url(optimized_svg)
             }
         
         self.optimization_report["icons"]["game_icons"] = optimized_icons
@@ -396,7 +485,7 @@ window.gameAudio = new GameAudioEngine();
 ### 🎨 アイコン最適化
 - **ファビコン**: SVGベース、data URL形式（{self.optimization_report['icons']['favicon']['size']} bytes）
 - **ゲームロゴ**: 軽量SVG（{self.optimization_report['icons']['game_logo']['size']} bytes）
-- **PWAアイコン**: {len(self.optimization_report['icons']['pwa_icons'])}サイズ対応
+- **PWAアイコン**: {len(_PWA_ICON_SIZES)}サイズ対応（1つのSVGを共用）
 - **ゲーム内アイコン**: {len(self.optimization_report['icons'].get('game_icons', {}))}個のSVGアイコン
 
 ### 🔊 音声最適化
@@ -485,6 +574,11 @@ gameAudio.playScoreUp();      // スコアアップ音
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+def _optimize_html_worker(html_path: Path) -> Tuple[Path, Dict]:
+    """ProcessPoolExecutor用のワーカー（pickle可能なモジュールレベル関数）"""
+    return html_path, AssetOptimizer()._optimize_html_file(html_path)
+
+
 def main():
     """メイン実行関数"""
     print("🚀 Ultimate Squash Game - アセット最適化")
@@ -18,6 +18,9 @@ from typing import Optional
 from src.model.pygame_game_state import PygameGameState
 from src.view.pygame_game_view import PygameGameView, PygameSoundView
 
+# フレーム末尾のこの時間（ミリ秒）だけは、粒度の粗いSDL_Delayを避けてビジーループで待つ
+PRECISE_TICK_THRESHOLD_MS = 3.0
+
 
 class PygameControllerError(Exception):
     """Pygame Controller専用例外クラス"""
@@ -63,6 +66,7 @@ class PygameGameController:
         # ゲームループ制御
         self.is_running = False
         self.frame_delay = 1000 // target_fps  # ミリ秒単位
+        self._last_tick_time = time.perf_counter()
         
         # Observer登録
         self._setup_observers()
@@ -244,7 +248,7 @@ class PygameGameController:
                 self.update_game_frame()
                 
                 # FPS制御
-                self.clock.tick(self.target_fps)
+                self.tick()
                 
         except Exception as e:
             error_msg = {
@@ -257,6 +261,20 @@ class PygameGameController:
         finally:
             self.cleanup()
     
+    def tick(self) -> int:
+        """
+        FPS制御（残り時間の大半はスリープし、最後の数ミリ秒だけtick_busy_loop()で合わせる）
+        
+        Returns:
+            int: 前回のtickからの経過時間（ミリ秒）
+        """
+        remaining_ms = 1000.0 / self.target_fps - (time.perf_counter() - self._last_tick_time) * 1000.0
+        if remaining_ms > PRECISE_TICK_THRESHOLD_MS:
+            pygame.time.wait(int(remaining_ms - PRECISE_TICK_THRESHOLD_MS))
+        dt_ms = self.clock.tick_busy_loop(self.target_fps)
+        self._last_tick_time = time.perf_counter()
+        return dt_ms
+    
     def stop_game(self):
         """ゲーム停止"""
         self.is_running = False
@@ -14,10 +14,28 @@ Web環境対応ゲームコントローラー（JavaScript連携）
 
 import json
 import time
+from collections import deque
 from typing import Optional, Dict, Any, Callable
 from model.pygame_game_state import PygameGameState
 from view.web_game_view import WebCanvasView, WebSoundView
 
+try:
+    import orjson
+except ImportError:
+    # orjsonがない環境（Pyodide等）では標準のjsonを使う
+    orjson = None
+
+# FPS計測に使う直近フレーム数（約1秒分）
+FPS_SAMPLE_FRAMES = 60
+
+
+def _dumps(data: Any, indent: bool = False) -> str:
+    """JavaScript連携データをJSON文字列化（orjsonがあれば使う）"""
+    if orjson is not None:
+        # orjsonはUTF-8のまま出力するのでensure_ascii=False相当
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None)
+
 
 class WebControllerError(Exception):
     """Web Controller専用例外クラス"""
@@ -59,8 +77,12 @@ class WebGameController:
         
         # Web環境用タイマー制御
         self.frame_interval = 1.0 / target_fps
-        self.last_frame_time = 0.0
+        # 間隔判定は単調増加のナノ秒整数で行う（時刻補正で逆行せず、整数比較で済む）
+        self._frame_interval_ns = int(1e9 / target_fps)
+        self._last_frame_ns = 0
         self.frame_count = 0
+        # 直近フレームの時刻[ns]（FPSの移動平均計算用）
+        self._frame_times = deque(maxlen=FPS_SAMPLE_FRAMES)
         
         # ゲームループ制御
         self.is_running = False
@@ -195,26 +217,31 @@ class WebGameController:
             bool: 更新が実行された場合True
         """
         try:
-            current_time = time.time()
+            now = time.monotonic_ns()
             
             # フレームレート制御
-            if current_time - self.last_frame_time < self.frame_interval:
+            if now - self._last_frame_ns < self._frame_interval_ns:
                 return False
             
-            self.last_frame_time = current_time
+            self._last_frame_ns = now
+            self._frame_times.append(now)
             self.frame_count += 1
             
+            # 毎フレーム参照する属性はローカル変数に束縛
+            game_state = self.game_state
+            
             # ポーズ中は物理演算をスキップ
-            if self.game_state.paused or self.game_state.is_gameover:
+            if game_state.paused or game_state.is_gameover:
                 return True
             
-            # ボール位置更新と衝突判定
-            for ball in self.game_state.balls[:]:  # コピーでイテレート（削除対応）
-                collision_occurred = self.game_state.update_ball_position(ball)
-                
+            update_ball_position = game_state.update_ball_position
+            play_sound = self.sound_view.play_sound
+            
+            # ボール位置更新と衝突判定（ミスでボールが削除されるため、tupleのスナップショットでイテレート）
+            for ball in tuple(game_state.balls):
                 # サウンド再生（衝突検出時）
-                if collision_occurred:
-                    self.sound_view.play_sound('hit')
+                if update_ball_position(ball):
+                    play_sound('hit')
             
             return True
             
@@ -273,30 +300,35 @@ class WebGameController:
             print(f"クリーンアップ警告: {str(e)}")
     
     def get_current_fps(self) -> float:
-        """現在のFPS計算"""
-        if self.frame_count > 0:
-            elapsed = time.time() - self.last_frame_time
-            return 1.0 / elapsed if elapsed > 0 else 0.0
-        return 0.0
+        """現在のFPS計算（直近FPS_SAMPLE_FRAMESフレームの平均）"""
+        frame_times = self._frame_times
+        if len(frame_times) < 2:
+            return 0.0
+        span_ns = frame_times[-1] - frame_times[0]
+        return (len(frame_times) - 1) * 1e9 / span_ns if span_ns > 0 else 0.0
     
-    def get_javascript_interface(self) -> str:
+    def get_javascript_interface(self, debug: bool = False) -> str:
         """
         JavaScript連携用の完全なインターフェースデータを取得
         
+        Args:
+            debug: bool - Trueならインデント付きで出力（毎フレームの送信では使わない）
+        
         Returns:
             str: JSON形式の統合データ
         """
         try:
+            # 各Viewからは辞書のまま受け取り、JSON化は最後の1回だけにする
             interface_data = {
-                'canvas_data': json.loads(self.canvas_view.get_javascript_interface_data()),
-                'sound_commands': json.loads(self.sound_view.get_sound_commands_json()),
+                'canvas_data': self.canvas_view.get_javascript_interface_dict(),
+                'sound_commands': self.sound_view.get_sound_commands(),
                 'controller_stats': self.get_game_statistics(),
                 'frame_count': self.frame_count,
                 'is_running': self.is_running,
                 'target_fps': self.target_fps
             }
             
-            return json.dumps(interface_data, ensure_ascii=False, indent=2)
+            return _dumps(interface_data, indent=debug)
             
         except Exception as e:
             error_data = {
@@ -306,7 +338,7 @@ class WebGameController:
                     'how': "各コンポーネントの状態を個別に確認してください"
                 }
             }
-            return json.dumps(error_data, ensure_ascii=False)
+            return _dumps(error_data)
     
     def get_game_statistics(self) -> Dict[str, Any]:
         """ゲーム統計情報取得"""
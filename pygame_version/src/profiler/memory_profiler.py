@@ -29,7 +29,7 @@ class MemoryProfiler:
         self.gc_stats = GCAnalyzer()
         self.memory_pools = {}
         self.peak_usage = 0
-        self.start_time = None
+        self.start_time_ns = None
         
     def start(self):
         """プロファイリング開始"""
@@ -37,13 +37,14 @@ class MemoryProfiler:
             return
             
         self.enabled = True
-        self.start_time = time.time()
+        self.start_time_ns = time.monotonic_ns()
         
         # トレースマロックを開始
         tracemalloc.start()
         
         # GC統計を有効化
         gc.set_debug(gc.DEBUG_STATS)
+        self.gc_stats.attach()
         
         # 初期スナップショット
         self._take_snapshot("initial")
@@ -63,6 +64,7 @@ class MemoryProfiler:
         
         # GCデバッグを無効化
         gc.set_debug(0)
+        self.gc_stats.detach()
         
     def _take_snapshot(self, label: str):
         """メモリスナップショットを取得"""
@@ -78,7 +80,7 @@ class MemoryProfiler:
         # スナップショット情報を保存
         self.snapshots.append({
             'label': label,
-            'timestamp': time.time() - self.start_time,
+            'timestamp_ns': time.monotonic_ns() - self.start_time_ns,
             'current_mb': current / 1024 / 1024,
             'peak_mb': peak / 1024 / 1024,
             'snapshot': snapshot,
@@ -112,7 +114,7 @@ class MemoryProfiler:
                 'final_mb': final['current_mb'],
                 'peak_mb': self.peak_usage / 1024 / 1024,
                 'growth_mb': memory_growth,
-                'duration_sec': final['timestamp'],
+                'duration_sec': final['timestamp_ns'] / 1e9,
                 'snapshots_count': len(self.snapshots)
             },
             'top_memory_users': top_stats,
@@ -147,7 +149,10 @@ class MemoryProfiler:
             
             # 単調増加をチェック
             if prev['current_mb'] < curr['current_mb'] < next['current_mb']:
-                growth_rate = (next['current_mb'] - prev['current_mb']) / (next['timestamp'] - prev['timestamp'])
+                elapsed_ns = next['timestamp_ns'] - prev['timestamp_ns']
+                if elapsed_ns <= 0:
+                    continue
+                growth_rate = (next['current_mb'] - prev['current_mb']) * 1e9 / elapsed_ns
                 
                 if growth_rate > 0.1:  # 0.1MB/秒以上の増加
                     leaks.append({
@@ -162,9 +167,9 @@ class MemoryProfiler:
         """特定の関数のメモリ使用量をプロファイル"""
         self._take_snapshot(f"before_{func.__name__}")
         
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
+        end_ns = time.monotonic_ns()
         
         self._take_snapshot(f"after_{func.__name__}")
         
@@ -175,7 +180,7 @@ class MemoryProfiler:
         return {
             'result': result,
             'memory_used_mb': after['current_mb'] - before['current_mb'],
-            'execution_time': end_time - start_time,
+            'execution_time': (end_ns - start_ns) / 1e9,
             'gc_collections': sum(after['gc_count']) - sum(before['gc_count'])
         }
 
@@ -236,18 +241,50 @@ class GCAnalyzer:
     def __init__(self):
         self.gc_events = []
         self.start_stats = gc.get_stats()
+        self._latest_stats = tuple(self.start_stats)
+        self._attached = False
         
-    def record_gc_event(self):
-        """GCイベントを記録"""
+    def attach(self):
+        """gc.callbacksに登録し、GC発生時のみ統計を更新する"""
+        if self._attached:
+            return
+        self._latest_stats = tuple(gc.get_stats())
+        gc.callbacks.append(self._on_gc)
+        self._attached = True
+        
+    def detach(self):
+        """gc.callbacksから登録解除"""
+        if not self._attached:
+            return
+        gc.callbacks.remove(self._on_gc)
+        self._attached = False
+        
+    def _on_gc(self, phase: str, info: Dict):
+        """GC完了時のコールバック（実際のGC 1回につき統計を1度だけ取得）"""
+        if phase != 'stop':
+            return
+        self._latest_stats = tuple(gc.get_stats())
+        self.record_gc_event(info['generation'])
+        
+    def record_gc_event(self, generation: int = -1):
+        """GCイベントを記録
+
+        Args:
+            generation: int - 回収された世代（gc.callbacks経由以外の呼び出しでは-1）
+        """
+        # 登録中はコールバックで取得済みの統計を使い、gc.get_stats()を重ねて呼ばない
+        stats = self._latest_stats if self._attached else gc.get_stats()
         self.gc_events.append({
             'timestamp': time.time(),
             'count': gc.get_count(),
-            'stats': gc.get_stats()
+            'stats': stats,
+            'generation': generation
         })
         
     def analyze(self) -> Dict:
         """GCパフォーマンスを分析"""
-        current_stats = gc.get_stats()
+        # 登録中はコールバックで更新済みの統計を使い、gc.get_stats()の再取得を避ける
+        current_stats = self._latest_stats if self._attached else gc.get_stats()
         
         # 各世代の統計を分析
         generation_analysis = []
@@ -331,34 +368,36 @@ class MemoryPool:
 def create_memory_report(profiler: MemoryProfiler) -> str:
     """詳細なメモリレポートを生成"""
     analysis = profiler.analyze_memory_usage()
+    summary = analysis['summary']
     
-    report = f"""
+    parts = [f"""
 # メモリ使用量プロファイリングレポート
 
 ## サマリー
-- 初期メモリ: {analysis['summary']['initial_mb']:.2f} MB
-- 最終メモリ: {analysis['summary']['final_mb']:.2f} MB
-- ピーク使用量: {analysis['summary']['peak_mb']:.2f} MB
-- メモリ増加: {analysis['summary']['growth_mb']:.2f} MB
-- 測定時間: {analysis['summary']['duration_sec']:.2f} 秒
+- 初期メモリ: {summary['initial_mb']:.2f} MB
+- 最終メモリ: {summary['final_mb']:.2f} MB
+- ピーク使用量: {summary['peak_mb']:.2f} MB
+- メモリ増加: {summary['growth_mb']:.2f} MB
+- 測定時間: {summary['duration_sec']:.2f} 秒
 
 ## トップメモリ使用
-"""
+"""]
     
     for i, user in enumerate(analysis['top_memory_users'][:5], 1):
-        report += f"{i}. {user['filename']}\n"
-        report += f"   - サイズ: {user['size_mb']:.2f} MB\n"
-        report += f"   - オブジェクト数: {user['count']}\n"
+        parts.append(f"{i}. {user['filename']}\n")
+        parts.append(f"   - サイズ: {user['size_mb']:.2f} MB\n")
+        parts.append(f"   - オブジェクト数: {user['count']}\n")
         
     if analysis['potential_leaks']:
-        report += "\n## 潜在的なメモリリーク\n"
+        parts.append("\n## 潜在的なメモリリーク\n")
         for leak in analysis['potential_leaks']:
-            report += f"- {leak['period']}: {leak['growth_rate_mb_per_sec']:.3f} MB/秒\n"
+            parts.append(f"- {leak['period']}: {leak['growth_rate_mb_per_sec']:.3f} MB/秒\n")
     else:
-        report += "\n## メモリリーク: 検出されず ✅\n"
+        parts.append("\n## メモリリーク: 検出されず ✅\n")
         
-    report += f"\n## ガベージコレクション分析\n"
-    report += f"- 総コレクション数: {analysis['gc_analysis']['total_collections']}\n"
-    report += f"- 回収オブジェクト数: {analysis['gc_analysis']['total_collected']}\n"
+    gc_analysis = analysis['gc_analysis']
+    parts.append("\n## ガベージコレクション分析\n")
+    parts.append(f"- 総コレクション数: {gc_analysis['total_collections']}\n")
+    parts.append(f"- 回収オブジェクト数: {gc_analysis['total_collected']}\n")
     
-    return report
\ No newline at end of file
+    return "".join(parts)
@@ -174,7 +174,7 @@ class AIEnhancedGameView(PygameGameView):
                         (panel_x, panel_y, panel_width, panel_height), 2)
         
         # タイトル
-        title_text = self.font_small.render("ADA System", True, self.colors['text_white'])
+        title_text = self._render_text(self.font_small, "ADA System", self.colors['text_white'])
         self.screen.blit(title_text, (panel_x + 10, panel_y + 5))
         
         # 難易度倍率
@@ -189,17 +189,19 @@ class AIEnhancedGameView(PygameGameView):
             modifier_color = self.colors['ada_neutral']
             modifier_symbol = "="
         
-        modifier_text = self.font_small.render(
+        modifier_text = self._render_text(
+            self.font_small,
             f"Difficulty: {modifier:.1f}x {modifier_symbol}",
-            True, modifier_color
+            modifier_color
         )
         self.screen.blit(modifier_text, (panel_x + 10, panel_y + 35))
         
         # ミス率
         miss_ratio = self.ada_info.get('miss_ratio', 0.0)
-        miss_ratio_text = self.font_small.render(
+        miss_ratio_text = self._render_text(
+            self.font_small,
             f"Miss Rate: {miss_ratio:.1%}",
-            True, self.colors['text_white']
+            self.colors['text_white']
         )
         self.screen.blit(miss_ratio_text, (panel_x + 10, panel_y + 60))
         
@@ -221,7 +223,7 @@ class AIEnhancedGameView(PygameGameView):
                             (bar_x, bar_y, progress_width, bar_height))
         
         # 進捗テキスト
-        progress_text = self.font_small.render(f"{progress}/10", True, self.colors['text_white'])
+        progress_text = self._render_text(self.font_small, f"{progress}/10", self.colors['text_white'])
         text_rect = progress_text.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height // 2))
         self.screen.blit(progress_text, text_rect)
     
@@ -231,6 +233,9 @@ class AIEnhancedGameView(PygameGameView):
         
         Args:
             game_state: PygameGameState - 描画するゲーム状態
+        
+        Returns:
+            List[pygame.Rect]: 画面へ反映が必要な領域（AI表示を含めて全画面を更新済み）
         """
         # 親クラスの描画を実行
         super().draw_game(game_state)
@@ -241,6 +246,7 @@ class AIEnhancedGameView(PygameGameView):
         
         # 画面更新
         pygame.display.flip()
+        return [self.screen.get_rect()]
     
     def update(self, game_state: PygameGameState):
         """
@@ -28,6 +28,11 @@ except ImportError:
     from pygame_version.src.model.pygame_game_state import PygameGameState, PygameGameStateObserver
 
 
+# JSON変換失敗時のエラーメッセージ（例外経路で毎回組み立てないよう事前定義）
+_INTERFACE_JSON_ERROR_WHAT = "JavaScript連携データの生成に失敗しました"
+_INTERFACE_JSON_ERROR_HOW = "データ形式を確認し、JavaScript側のエラーハンドリングを実装してください"
+
+
 class OptimizedWebCanvasView(PygameGameStateObserver):
     """
     最適化されたWeb環境対応ゲーム描画View（Canvas API統合）
@@ -426,14 +431,15 @@ class OptimizedWebCanvasView(PygameGameStateObserver):
         }
         
         try:
-            return json.dumps(interface_data, ensure_ascii=False, indent=None)  # indentなしで軽量化
+            # ensure_ascii=True（デフォルト）でASCII高速経路を使用、indentなしで軽量化
+            return json.dumps(interface_data)
         except Exception as e:
             # JSON変換エラー時のフォールバック
             fallback_data = {
                 'error': {
-                    'what': "JavaScript連携データの生成に失敗しました",
+                    'what': _INTERFACE_JSON_ERROR_WHAT,
                     'why': f"JSON変換でエラーが発生: {str(e)}",
-                    'how': "データ形式を確認し、JavaScript側のエラーハンドリングを実装してください"
+                    'how': _INTERFACE_JSON_ERROR_HOW
                 }
             }
             return json.dumps(fallback_data, ensure_ascii=False)
@@ -16,6 +16,9 @@ import pygame
 from typing import Tuple, Optional, List
 from src.model.pygame_game_state import PygameGameState, PygameGameStateObserver
 
+# 描画済みテキストSurfaceのキャッシュ上限（古いものから破棄）
+_TEXT_CACHE_SIZE = 64
+
 
 class PygameGameView(PygameGameStateObserver):
     """
@@ -56,6 +59,39 @@ class PygameGameView(PygameGameStateObserver):
         # 現在のゲーム状態（表示用）
         self.current_score = 0
         self.current_combo = 0
+        
+        # 前フレームで描画した領域（Noneの場合は次のフレームを全画面で更新）
+        self._last_dirty_rects = None
+        
+        # 描画済みテキスト（(font, text, color) → Surface）とポーズ用オーバーレイのキャッシュ
+        self._text_cache = {}
+        self._pause_overlay = None
+    
+    def _render_text(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        テキストを描画したSurfaceを返す（同じ内容はキャッシュを再利用し、毎フレームのラスタライズを避ける）
+        
+        Args:
+            font: pygame.font.Font - 使用するフォント
+            text: str - 描画する文字列
+            color: Tuple[int, int, int] - 文字色
+        
+        Returns:
+            pygame.Surface: 画面のピクセル形式に変換済みのテキストSurface
+        """
+        key = (font, text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, color).convert_alpha()
+            self._text_cache[key] = surface
+            if len(self._text_cache) > _TEXT_CACHE_SIZE:
+                self._text_cache.pop(next(iter(self._text_cache)))
+        return surface
+    
+    def trim_caches(self):
+        """描画キャッシュを破棄（メモリ逼迫時用。次回描画時に作り直す）"""
+        self._text_cache.clear()
+        self._pause_overlay = None
     
     def on_game_state_changed(self, game_state: PygameGameState):
         """
@@ -65,10 +101,10 @@ class PygameGameView(PygameGameStateObserver):
             game_state: PygameGameState - 変更されたゲーム状態
         """
         try:
-            self.draw_game(game_state)
+            dirty_rects = self.draw_game(game_state)
             self.current_score = game_state.score.point
             self.current_combo = game_state.score.combo
-            pygame.display.flip()  # 画面更新
+            pygame.display.update(dirty_rects)  # 画面更新（変化した領域のみ）
         except Exception as e:
             # エラー3要素に従ったエラーハンドリング
             error_msg = {
@@ -80,44 +116,63 @@ class PygameGameView(PygameGameStateObserver):
             # 最低限の描画を試行
             self._safe_clear_screen()
     
-    def draw_game(self, game_state: PygameGameState):
+    def draw_game(self, game_state: PygameGameState) -> List[pygame.Rect]:
         """
         ゲーム全体の描画
         
         Args:
             game_state: PygameGameState - 描画するゲーム状態
+        
+        Returns:
+            List[pygame.Rect]: 画面へ反映が必要な領域（pygame.display.update()に渡す）
         """
         # 画面クリア
         self.screen.fill(self.colors['background'])
         
         # ゲーム要素描画
-        self._draw_balls(game_state.balls)
+        dirty_rects = self._draw_balls(game_state.balls)
         if game_state.racket:
-            self._draw_racket(game_state.racket)
+            dirty_rects.append(self._draw_racket(game_state.racket))
         
         # UI描画
-        self._draw_score_display(game_state.score)
+        dirty_rects.extend(self._draw_score_display(game_state.score))
         
-        # ゲーム状態に応じた表示
+        # ゲーム状態に応じた表示（オーバーレイは画面全体にかかる）
+        full_redraw = False
         if game_state.paused:
             self._draw_pause_message()
+            full_redraw = True
         elif game_state.is_gameover:
             self._draw_game_over_message(game_state.score)
+            full_redraw = True
+        
+        previous_rects = self._last_dirty_rects
+        self._last_dirty_rects = None if full_redraw else dirty_rects
+        if full_redraw or previous_rects is None:
+            return [self.screen.get_rect()]
+        
+        # 前フレームの位置（消す部分）と今回の位置（描く部分）だけを反映
+        return previous_rects + dirty_rects
     
-    def _draw_balls(self, balls: List):
+    def _draw_balls(self, balls: List) -> List[pygame.Rect]:
         """
         ボールの描画
         
         Args:
             balls: List[PygameBall] - 描画するボールのリスト
+        
+        Returns:
+            List[pygame.Rect]: 描画した領域
         """
-        for ball in balls:
+        return [
             pygame.draw.circle(
                 self.screen,
                 ball.color,
                 (int(ball.x), int(ball.y)),
                 ball.radius
             )
+            for ball in balls
+        ]
     
     def _draw_racket(self, racket):
         """
@@ -125,6 +180,9 @@ class PygameGameView(PygameGameStateObserver):
         
         Args:
             racket: PygameRacket - 描画するラケット
+        
+        Returns:
+            pygame.Rect: 描画した領域
         """
         racket_rect = pygame.Rect(
             int(racket.x),
@@ -132,7 +190,7 @@ class PygameGameView(PygameGameStateObserver):
             racket.size,
             racket.height
         )
-        pygame.draw.rect(
+        return pygame.draw.rect(
             self.screen,
             racket.color,
             racket_rect
@@ -144,6 +202,9 @@ class PygameGameView(PygameGameStateObserver):
         
         Args:
             score: PygameScore - 表示するスコア
+        
+        Returns:
+            List[pygame.Rect]: 描画した領域
         """
         try:
             # スコア文字列作成
@@ -152,32 +213,36 @@ class PygameGameView(PygameGameStateObserver):
             level_text = f"Level: {score.level}"
             
             # スコア描画
-            score_surface = self.font_medium.render(score_text, True, self.colors['text_black'])
-            self.screen.blit(score_surface, (10, 10))
+            score_surface = self._render_text(self.font_medium, score_text, self.colors['text_black'])
+            score_rect = self.screen.blit(score_surface, (10, 10))
             
             # コンボ描画
-            combo_surface = self.font_medium.render(combo_text, True, self.colors['text_black'])
-            self.screen.blit(combo_surface, (10, 40))
+            combo_surface = self._render_text(self.font_medium, combo_text, self.colors['text_black'])
+            combo_rect = self.screen.blit(combo_surface, (10, 40))
             
             # レベル描画
-            level_surface = self.font_medium.render(level_text, True, self.colors['text_black'])
-            self.screen.blit(level_surface, (10, 70))
+            level_surface = self._render_text(self.font_medium, level_text, self.colors['text_black'])
+            level_rect = self.screen.blit(level_surface, (10, 70))
+            
+            return [score_rect, combo_rect, level_rect]
             
         except Exception as e:
             # スコア表示エラーは画面描画に影響しないよう軽微な警告とする
             print(f"スコア表示更新警告: {str(e)}")
+            return []
     
     def _draw_pause_message(self):
         """ポーズメッセージの描画"""
-        pause_surface = self.font_large.render("PAUSED", True, self.colors['text_red'])
+        pause_surface = self._render_text(self.font_large, "PAUSED", self.colors['text_red'])
         pause_rect = pause_surface.get_rect(center=(self.width // 2, self.height // 2))
         self.screen.blit(pause_surface, pause_rect)
         
-        # 半透明オーバーレイ（オプション）
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.set_alpha(128)  # 半透明
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        # 半透明オーバーレイ（オプション。初回だけ作成して使い回す）
+        if self._pause_overlay is None:
+            self._pause_overlay = pygame.Surface((self.width, self.height)).convert()
+            self._pause_overlay.set_alpha(128)  # 半透明
+            self._pause_overlay.fill((0, 0, 0))
+        self.screen.blit(self._pause_overlay, (0, 0))
         
         # ポーズテキストを再描画（オーバーレイの上に）
         self.screen.blit(pause_surface, pause_rect)
@@ -190,19 +255,19 @@ class PygameGameView(PygameGameStateObserver):
             score: PygameScore - 最終スコア
         """
         # Game Over メッセージ
-        gameover_surface = self.font_large.render("GAME OVER", True, self.colors['text_red'])
+        gameover_surface = self._render_text(self.font_large, "GAME OVER", self.colors['text_red'])
         gameover_rect = gameover_surface.get_rect(center=(self.width // 2, self.height // 2 - 40))
         self.screen.blit(gameover_surface, gameover_rect)
         
         # 最終スコア
         final_score_text = f"Final Score: {score.point}"
-        final_surface = self.font_medium.render(final_score_text, True, self.colors['text_black'])
+        final_surface = self._render_text(self.font_medium, final_score_text, self.colors['text_black'])
         final_rect = final_surface.get_rect(center=(self.width // 2, self.height // 2 + 10))
         self.screen.blit(final_surface, final_rect)
         
         # 再開メッセージ
         restart_text = "Click to restart"
-        restart_surface = self.font_small.render(restart_text, True, self.colors['text_blue'])
+        restart_surface = self._render_text(self.font_small, restart_text, self.colors['text_blue'])
         restart_rect = restart_surface.get_rect(center=(self.width // 2, self.height // 2 + 40))
         self.screen.blit(restart_surface, restart_rect)
     
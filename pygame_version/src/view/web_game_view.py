@@ -241,23 +241,30 @@ class WebCanvasView(PygameGameStateObserver):
         
         return commands
     
-    def get_javascript_interface_data(self) -> str:
+    def get_javascript_interface_dict(self) -> Dict[str, Any]:
         """
-        JavaScript連携用データをJSON形式で取得
+        JavaScript連携用データを辞書のまま取得（呼び出し側でまとめてJSON化する用）
         
         Returns:
-            str: JSON形式の描画データ
+            Dict[str, Any]: 描画データ
         """
-        interface_data = {
+        return {
             'frame_data': self.current_frame_data,
             'draw_commands': self.draw_commands,
             'canvas_id': self.canvas_id,
             'frame_count': self.frame_count,
             'error': self.last_error
         }
+    
+    def get_javascript_interface_data(self) -> str:
+        """
+        JavaScript連携用データをJSON形式で取得
         
+        Returns:
+            str: JSON形式の描画データ
+        """
         try:
-            return json.dumps(interface_data, ensure_ascii=False, indent=2)
+            return json.dumps(self.get_javascript_interface_dict(), ensure_ascii=False, indent=2)
         except Exception as e:
             # JSON変換エラー時のフォールバック
             fallback_data = {
@@ -343,12 +350,16 @@ class WebSoundView:
         else:
             print(f"サウンドコマンド（無音モード）: {sound_type}")
     
+    def get_sound_commands(self) -> List[Dict[str, Any]]:
+        """サウンドコマンドをリストのまま取得（取得後クリア）"""
+        commands = self.sound_commands
+        self.sound_commands = []
+        return commands
+    
     def get_sound_commands_json(self) -> str:
         """サウンドコマンドをJSON形式で取得"""
         try:
-            commands_json = json.dumps(self.sound_commands, ensure_ascii=False)
-            self.sound_commands = []  # 送信後クリア
-            return commands_json
+            return json.dumps(self.get_sound_commands(), ensure_ascii=False)
         except Exception as e:
             print(f"サウンドコマンド変換エラー: {str(e)}")
             return "[]"
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+バンドルサイズ最適化ツールのテスト
+
+個人開発規約遵守:
+- TDD必須: Pythonコード最適化の変換結果を検証
+- モック禁止: 実際のソースコードを最適化して実行結果で確認
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# bundle_size_optimizer.py（pygame_version直下）をインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bundle_size_optimizer import BundleSizeOptimizer
+
+
+def _optimize(source: str) -> str:
+    """ソースコードを最適化した結果を返す"""
+    optimizer = BundleSizeOptimizer()
+    return optimizer._optimize_single_file(Path("sample.py"), source.encode('utf-8'))
+
+
+def _run(code: str) -> dict:
+    """コードを実行し、モジュールの名前空間を返す"""
+    namespace = {}
+    exec(compile(code, "sample.py", "exec"), namespace)
+    return namespace
+
+
+class TestPythonCodeOptimization:
+    """Pythonコード最適化テスト"""
+
+    def test_multiline_string_preserved(self):
+        """複数行の文字列リテラルの空行・行末空白が保持されること"""
+        source = (
+            'TEMPLATE = """line1\n'
+            '\n'
+            'line3   \n'
+            '"""\n'
+        )
+        namespace = _run(_optimize(source))
+        assert namespace['TEMPLATE'] == "line1\n\nline3   \n", "複数行文字列の中身が書き換えられています"
+
+    def test_try_finally_with_only_assert(self):
+        """assertのみのfinally節を削除してもtry文の構文が保たれること"""
+        source = (
+            'def call(func):\n'
+            '    try:\n'
+            '        return func()\n'
+            '    finally:\n'
+            '        assert func\n'
+        )
+        namespace = _run(_optimize(source))
+        assert namespace['call'](lambda: 42) == 42, "try/finallyの最適化結果が正しく動作しません"
+
+    def test_unreachable_yield_kept(self):
+        """return後の到達不能なyieldを削除せず、ジェネレータのまま保たれること"""
+        source = (
+            'def empty():\n'
+            '    return\n'
+            '    yield 1\n'
+            '\n'
+            'def delegate():\n'
+            '    return\n'
+            '    yield from ()\n'
+        )
+        namespace = _run(_optimize(source))
+        assert list(namespace['empty']()) == [], "yieldを含む関数がジェネレータでなくなっています"
+        assert list(namespace['delegate']()) == [], "yield fromを含む関数がジェネレータでなくなっています"
@@ -0,0 +1,45 @@
+"""
+アセット最適化ツールのテスト
+
+個人開発規約遵守:
+- TDD必須: SVG最小化の結果を検証
+- モック禁止: 実際のscourでアイコンを最小化して確認
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+# optimize_assets.py（pygame_version直下）をインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import optimize_assets
+from optimize_assets import _PWA_ICON_SVG, _minify_svg
+
+# 図形の座標・サイズを表す属性の値
+_GEOMETRY_ATTR_RE = re.compile(r'\b(?:viewBox|width|height|x|y|cx|cy|r|rx)="([^"]*)"')
+
+
+def _geometry_numbers(svg: str) -> set:
+    """SVG中の座標・サイズの数値（0以外）を集める"""
+    return {float(number)
+            for value in _GEOMETRY_ATTR_RE.findall(svg)
+            for number in value.split()
+            if float(number) != 0}
+
+
+class TestSvgMinification:
+    """SVG最小化テスト"""
+
+    def test_scour_keeps_icon_coordinates(self):
+        """scourでの最小化後もPWAアイコンの座標が丸められないこと"""
+        if optimize_assets.scour is None:
+            pytest.skip("scourがインストールされていません")
+
+        minified = _minify_svg(_PWA_ICON_SVG)
+
+        missing = _geometry_numbers(_PWA_ICON_SVG) - _geometry_numbers(minified)
+        assert not missing, f"最小化で座標が変わっています: {sorted(missing)}"
+        assert len(minified) < len(_PWA_ICON_SVG), "SVGが最小化されていません"
@@ -188,6 +188,44 @@ class TestPygameMVCIntegration:
         except Exception as e:
             pytest.fail(f"ゲームオーバー状態描画でエラーが発生: {str(e)}")
     
+    def test_draw_game_dirty_rects(self):
+        """描画領域（dirty rects）の返却テスト"""
+        full_screen = self.screen.get_rect()
+        
+        # 初期描画（Controller初期化時）の後は、変化した領域だけが返る
+        dirty_rects = self.game_view.draw_game(self.game_state)
+        assert dirty_rects, "描画領域が返されていません"
+        assert full_screen not in dirty_rects, "通常フレームで全画面更新になっています"
+        
+        # ラケット移動後は移動前と移動後の両方の領域を含む（Observer通知による描画を挟まないよう直接移動）
+        racket = self.game_state.racket
+        old_rect = pygame.Rect(int(racket.x), int(racket.y), racket.size, racket.height)
+        racket.x += 100
+        new_rect = pygame.Rect(int(racket.x), int(racket.y), racket.size, racket.height)
+        dirty_rects = self.game_view.draw_game(self.game_state)
+        assert old_rect.collidelist(dirty_rects) != -1, "移動前のラケット領域が更新対象に含まれていません"
+        assert new_rect.collidelist(dirty_rects) != -1, "移動後のラケット領域が更新対象に含まれていません"
+        
+        # ポーズ中、およびポーズ解除直後は全画面更新
+        self.game_state.paused = True
+        assert self.game_view.draw_game(self.game_state) == [full_screen]
+        self.game_state.paused = False
+        assert self.game_view.draw_game(self.game_state) == [full_screen]
+    
+    def test_render_text_cache(self):
+        """テキスト描画キャッシュのテスト"""
+        view = self.game_view
+        color = view.colors['text_black']
+        
+        # 同じ内容は同じSurfaceを再利用し、内容が変われば別のSurfaceになる
+        surface = view._render_text(view.font_medium, "Score: 10", color)
+        assert view._render_text(view.font_medium, "Score: 10", color) is surface
+        assert view._render_text(view.font_medium, "Score: 20", color) is not surface
+        
+        # キャッシュ破棄後は作り直される
+        view.trim_caches()
+        assert view._render_text(view.font_medium, "Score: 10", color) is not surface
+    
     def test_python_312_compatibility(self):
         """Python 3.12対応確認テスト"""
         import sys
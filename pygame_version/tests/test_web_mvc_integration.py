@@ -16,6 +16,7 @@ import pytest
 import json
 import sys
 import os
+import time
 
 # 絶対インポートパスの設定
 current_dir = os.path.dirname(__file__)
@@ -224,6 +225,18 @@ class TestWebMVCIntegration:
         assert 'score' in stats, "スコア情報が含まれていません"
         assert 'balls_count' in stats, "ボール数情報が含まれていません"
     
+    def test_javascript_interface_sound_commands(self):
+        """JavaScript連携データへのサウンドコマンド統合テスト"""
+        self.sound_view.play_sound('hit')
+        
+        interface_data = json.loads(self.web_controller.get_javascript_interface())
+        assert [cmd['type'] for cmd in interface_data['sound_commands']] == ['hit'], "サウンドコマンドが連携データに含まれていません"
+        assert interface_data['canvas_data']['canvas_id'] == "testCanvas", "Canvasデータが連携データに含まれていません"
+        
+        # 送信済みのコマンドは次のフレームに含まれない
+        interface_data = json.loads(self.web_controller.get_javascript_interface())
+        assert interface_data['sound_commands'] == [], "サウンドコマンドが送信後クリアされていません"
+    
     def test_sound_commands_integration(self):
         """サウンドコマンド統合テスト"""
         # サウンド再生テスト
@@ -264,6 +277,20 @@ class TestWebMVCIntegration:
         self.web_controller.update_game_frame()
         assert self.web_controller.frame_count > frame_count_before, "Web Controllerのフレームカウントが更新されていません"
     
+    def test_web_controller_fps_measurement(self):
+        """Web ControllerのFPS計測テスト"""
+        # 1フレーム目だけではFPSは計測できない
+        self.web_controller.update_game_frame()
+        assert self.web_controller.get_current_fps() == 0.0, "1フレームでFPSが計算されています"
+        
+        # フレーム間隔（1/60秒）より長い間隔で更新
+        for _ in range(5):
+            time.sleep(0.025)
+            self.web_controller.update_game_frame()
+        
+        fps = self.web_controller.get_current_fps()
+        assert 0.0 < fps <= 60.0, f"FPS計測値が不正: {fps}"
+    
     def test_web_error_handling(self):
         """Web環境エラーハンドリングテスト"""
         # 不正なマウス座標でのエラーハンドリング